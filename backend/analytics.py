@@ -0,0 +1,146 @@
+"""
+Columnar attendee data for building insights rollups
+
+An org's attendees are loaded in one query into parallel numpy arrays
+(event position, ticket class code, customer id, revenue cents, checked in),
+with strings coded once. Customer ids are dense ids of normalized emails,
+the ones a CustomerIndex over emails starts with. Per-event totals, ticket
+types, customers and customer visits then come from vectorized group-bys
+(bincount/unique) instead of Python loops over every attendee.
+"""
+import numpy as np
+
+from customers import normalize_email
+
+NO_CUSTOMER = -1  # customer id for attendees without an email
+
+
+class AttendeeColumns:
+    """
+    One org's attendees as parallel arrays, grouped by event
+
+    Events are positioned as given (newest first) and each event's
+    attendees stay in insertion order, so first-seen orderings match the
+    store's. offsets[i]:offsets[i + 1] is event i's slice.
+    """
+
+    def __init__(self, events, rows, ticket_classes):
+        self.event_ids = [event['id'] for event in events]
+        position = {event_id: i for i, event_id in enumerate(self.event_ids)}
+        ticket_codes = {}  # ticket class name -> code
+        class_codes = {}  # (event_id, ticket_class_id) -> code of its name
+        customer_codes = {}  # normalized email -> customer id
+        email_codes = {}  # email as stored -> customer id
+
+        def ticket_code(key):
+            code = class_codes.get(key)
+            if code is None:
+                # Unnamed classes are 'Unknown', as in EventStore.event_summaries
+                name = ticket_classes.get(key, 'Unknown')
+                code = class_codes[key] = ticket_codes.setdefault(name, len(ticket_codes))
+            return code
+
+        def customer_code(email):
+            code = email_codes.get(email)
+            if code is None:
+                normalized = normalize_email(email)
+                code = customer_codes.setdefault(normalized, len(customer_codes)) if normalized else NO_CUSTOMER
+                email_codes[email] = code
+            return code
+
+        if rows:
+            event_col, class_col, email_col, cents_col, checked_col, rowid_col = zip(*rows)
+        else:
+            event_col = class_col = email_col = cents_col = checked_col = rowid_col = ()
+        count = len(event_col)
+
+        event_pos = np.fromiter((position[event_id] for event_id in event_col), dtype=np.int32, count=count)
+        order = np.lexsort((np.fromiter(rowid_col, dtype=np.int64, count=count), event_pos))
+
+        self.event_pos = event_pos[order]
+        self.ticket_code = np.fromiter(
+            (ticket_code(key) for key in zip(event_col, class_col)), dtype=np.int32, count=count
+        )[order]
+        customer_id = np.fromiter(
+            (customer_code(email) for email in email_col), dtype=np.int32, count=count
+        )[order]
+        # Renumbered by first appearance in event order, newest event first
+        known = customer_id != NO_CUSTOMER
+        codes, first = np.unique(customer_id[known], return_index=True)
+        by_first = codes[np.argsort(first)]
+        renumber = np.empty(len(customer_codes), dtype=np.int32)
+        renumber[by_first] = np.arange(len(by_first), dtype=np.int32)
+        customer_id[known] = renumber[customer_id[known]]
+        self.customer_id = customer_id
+        self.cents = np.fromiter(cents_col, dtype=np.int64, count=count)[order]
+        self.checked_in = np.fromiter(checked_col, dtype=np.int8, count=count)[order]
+
+        self.ticket_names = list(ticket_codes)
+        emails = list(customer_codes)
+        self.emails = [emails[code] for code in by_first.tolist()]
+        self.offsets = np.searchsorted(self.event_pos, np.arange(len(self.event_ids) + 1))
+
+    @classmethod
+    def from_store(cls, store, org_id, events):
+        """Load the attendees of an org's synced events"""
+        return cls(events, store.org_attendee_rows(org_id), store.org_ticket_classes(org_id))
+
+    def __len__(self):
+        return len(self.event_pos)
+
+    def event_totals(self):
+        """Per-event (attendees, checked_in, revenue_cents) arrays"""
+        size = len(self.event_ids)
+        return (
+            np.bincount(self.event_pos, minlength=size),
+            np.bincount(self.event_pos, weights=self.checked_in, minlength=size).astype(np.int64),
+            np.bincount(self.event_pos, weights=self.cents, minlength=size).astype(np.int64)
+        )
+
+    def _grouped(self, codes, cents, names):
+        """[(name, count, cents)] per code present, in first-seen order"""
+        present, first = np.unique(codes, return_index=True)
+        counts = np.bincount(codes, minlength=len(names))
+        totals = np.bincount(codes, weights=cents, minlength=len(names)).astype(np.int64)
+        return [
+            (names[code], int(counts[code]), int(totals[code]))
+            for code in present[np.argsort(first, kind='stable')]
+        ]
+
+    def ticket_types(self, counted):
+        """Ticket class rollup over the attendees of counted events (bool array by position)"""
+        rows = counted[self.event_pos]
+        return self._grouped(self.ticket_code[rows], self.cents[rows], self.ticket_names)
+
+    def customer_totals(self, counted):
+        """(tickets, revenue cents) arrays by customer id over the attendees of counted events"""
+        rows = counted[self.event_pos] & (self.customer_id != NO_CUSTOMER)
+        customers = self.customer_id[rows]
+        return (
+            np.bincount(customers, minlength=len(self.emails)),
+            np.bincount(customers, weights=self.cents[rows], minlength=len(self.emails)).astype(np.int64)
+        )
+
+    def customer_visits(self, counted, date_rank):
+        """
+        (customer ids, event positions, tickets) arrays, one entry per customer/event
+        pair, grouped by customer and in date order (date_rank by position) within each
+        """
+        rows = counted[self.event_pos] & (self.customer_id != NO_CUSTOMER)
+        size = len(self.event_ids)
+        keys = self.customer_id[rows].astype(np.int64) * size + date_rank[self.event_pos[rows]]
+        pairs, tickets = np.unique(keys, return_counts=True)
+        by_rank = np.argsort(date_rank)
+        return pairs // size, by_rank[pairs % size], tickets
+
+    def summary_rows(self, position):
+        """Event at position's attendees as (email, ticket_class_name, gross_cents, checked_in) rows"""
+        start, end = self.offsets[position], self.offsets[position + 1]
+        return [
+            (self.emails[customer] if customer != NO_CUSTOMER else '',
+             self.ticket_names[ticket], cents, checked_in)
+            for customer, ticket, cents, checked_in in zip(
+                self.customer_id[start:end].tolist(), self.ticket_code[start:end].tolist(),
+                self.cents[start:end].tolist(), self.checked_in[start:end].tolist()
+            )
+        ]
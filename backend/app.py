@@ -1,64 +1,324 @@
-from flask import Flask, jsonify, request
+from flask import Flask, g, jsonify, request
 from flask_cors import CORS
-import requests
+import hmac
+import math
 import os
-import time
-from datetime import datetime, timedelta
-from collections import defaultdict
+import queue
+import threading
+from datetime import datetime, time, timedelta, timezone
+from cache import TTLCache
+from rate_limiter import RateBudgetExhausted, RateLimiter, PRIORITY_INTERACTIVE
+from eventbrite_client import EventbriteClient, UpstreamFetchError, EVENTBRITE_API_BASE as DEFAULT_API_BASE
+from store import EventStore, DEFAULT_DB_PATH
+from sync import EventSync
+from scheduler import PrefetchScheduler, DEFAULT_PREFETCH_INTERVAL
+from resolver import OrgResolver, OrgResolutionError
+from insights import InsightsRegistry, DEFAULT_CUSTOMERS_PAGE
+from metrics import MetricsTable
+from versions import DataVersions
+from responses import EncodedBodies, DEFAULT_MAX_BODIES, coded_etag, dumps
+from forecast import ForecastService, DEFAULT_MONTHS_AHEAD, MAX_MONTHS_AHEAD
+from webhooks import WebhookReceiver, WebhookError
+from instrumentation import RequestMetrics, current_trace, end_trace, format_metric, phase, start_trace
+from weekly_report import get_week_start, generate_weekly_report_from_store, summarize_week
 
 app = Flask(__name__)
-CORS(app)
+CORS(app, expose_headers=['ETag', 'Last-Modified', 'Server-Timing', 'Retry-After'])
 
 # Eventbrite API configuration
-EVENTBRITE_API_BASE = "https://www.eventbriteapi.com/v3"
+EVENTBRITE_API_BASE = os.environ.get('EVENTBRITE_API_BASE', DEFAULT_API_BASE)
 EVENTBRITE_TOKEN = os.environ.get('EVENTBRITE_TOKEN', '')
 
-def get_headers():
-    return {
-        'Authorization': f'Bearer {EVENTBRITE_TOKEN}',
-        'Content-Type': 'application/json'
-    }
+# Cache TTLs (seconds) per resource type
+ORGANIZATIONS_TTL = 60 * 60
+LIVE_ATTENDEES_TTL = 5 * 60
 
-def make_api_request(url, params=None, max_retries=3):
-    """Make API request with rate limit handling"""
-    for attempt in range(max_retries):
-        try:
-            response = requests.get(url, headers=get_headers(), params=params)
-            
-            if response.status_code == 429:
-                # Rate limited - wait and retry
-                wait_time = min(2 ** attempt, 10)  # Exponential backoff, max 10 seconds
-                print(f"Rate limited, waiting {wait_time}s before retry...")
-                time.sleep(wait_time)
-                continue
-            
-            return response
-        except Exception as e:
-            if attempt == max_retries - 1:
-                raise
-            time.sleep(1)
+# Weeks per /api/weekly-sales/range response
+DEFAULT_REPORT_WEEKS = 13
+MAX_REPORT_WEEKS = 104
+
+# Opt-in per-request phase timers, upstream calls and cache lookups (Server-Timing, /api/metrics)
+request_metrics = RequestMetrics() if os.environ.get('INSTRUMENTATION_ENABLED', 'false').lower() == 'true' else None
+
+# Shared cache for every Eventbrite GET
+api_cache = TTLCache(max_entries=int(os.environ.get('API_CACHE_MAX_ENTRIES', 4096)), name='eventbrite')
+
+# Concurrency for per-event attendee fetches
+ATTENDEE_FETCH_WORKERS = int(os.environ.get('ATTENDEE_FETCH_WORKERS', 8))
+
+# One token bucket for every outbound Eventbrite call (~1000 requests/hour)
+rate_limiter = RateLimiter(
+    capacity=int(os.environ.get('EVENTBRITE_RATE_LIMIT', 1000)),
+    window=int(os.environ.get('EVENTBRITE_RATE_WINDOW', 3600)),
+    background_reserve=int(os.environ.get('RATE_LIMIT_BACKGROUND_RESERVE', 100))
+)
+# How long an interactive request may queue for a token before giving up
+RATE_LIMIT_MAX_WAIT = float(os.environ.get('RATE_LIMIT_MAX_WAIT', 30))
+
+# Pooled keep-alive client used for every Eventbrite call
+eventbrite = EventbriteClient(
+    EVENTBRITE_TOKEN,
+    rate_limiter,
+    cache=api_cache,
+    base_url=EVENTBRITE_API_BASE,
+    pool_size=int(os.environ.get('EVENTBRITE_POOL_SIZE', 16)),
+    connect_timeout=float(os.environ.get('EVENTBRITE_CONNECT_TIMEOUT', 5)),
+    read_timeout=float(os.environ.get('EVENTBRITE_READ_TIMEOUT', 30)),
+    max_wait=RATE_LIMIT_MAX_WAIT
+)
+
+def iter_attendees(event_id, ttl=LIVE_ATTENDEES_TTL, priority=PRIORITY_INTERACTIVE):
+    """Yield an event's attending attendees live from Eventbrite, page by page"""
+    return eventbrite.iter_paginated(
+        f"{EVENTBRITE_API_BASE}/events/{event_id}/attendees/",
+        'attendees',
+        params={'status': 'attending'},
+        ttl=ttl,
+        priority=priority
+    )
+
+# Local event/attendee store, kept current by incremental syncs
+store = EventStore(os.environ.get('EVENT_STORE_PATH', DEFAULT_DB_PATH))
+event_sync = EventSync(
+    store,
+    eventbrite,
+    workers=ATTENDEE_FETCH_WORKERS,
+    interval=int(os.environ.get('SYNC_INTERVAL', 300))
+)
+
+# Resolves each request's org (memoized, shared by concurrent requests)
+org_resolver = OrgResolver(eventbrite, event_sync, ttl=ORGANIZATIONS_TTL)
+
+# Incrementally maintained /api/insights rollups, one aggregator per org
+insights_registry = InsightsRegistry(store)
+
+# Per-event attendee metrics shared by performance and weekly sales
+metrics_table = MetricsTable(store)
+
+# Trend forecasts over the insights rollups, refitted only when they change
+forecast_service = ForecastService(insights_registry)
+
+# Per-org data versions behind the ETag/Last-Modified of store-backed routes
+data_versions = DataVersions(store)
+
+# Opt-in fast, compressed JSON for store-backed routes, bodies cached by ETag
+encoded_bodies = EncodedBodies(
+    max_entries=int(os.environ.get('RESPONSE_CACHE_MAX_ENTRIES', DEFAULT_MAX_BODIES))
+) if os.environ.get('FAST_RESPONSES', 'false').lower() == 'true' else None
+
+# Eventbrite webhooks patch the store per change; polling becomes a safety net
+WEBHOOKS_ENABLED = os.environ.get('WEBHOOKS_ENABLED', 'false').lower() == 'true'
+WEBHOOK_SECRET = os.environ.get('WEBHOOK_SECRET', '')
+webhook_receiver = WebhookReceiver(eventbrite, event_sync, cache=api_cache)
+
+# Keeps the store warm between visits; started with the dev server below
+prefetcher = PrefetchScheduler(
+    event_sync,
+    rate_limiter,
+    org_resolver,
+    org_ids=[org_id for org_id in os.environ.get('PREFETCH_ORG_IDS', '').split(',') if org_id],
+    interval=int(os.environ.get('PREFETCH_INTERVAL', DEFAULT_PREFETCH_INTERVAL)),
+    budget_share=float(os.environ.get('PREFETCH_BUDGET_SHARE', 0.5)),
+    # Without a secret every webhook is refused, so polling stays at full rate
+    webhooks=WEBHOOKS_ENABLED and bool(WEBHOOK_SECRET)
+)
+
+@app.before_request
+def start_request_trace():
+    # In ASGI mode the trace already started with the async prefetch
+    if request_metrics is not None and current_trace() is None:
+        g.trace_token = start_trace()
+
+@app.after_request
+def finish_request_trace(response):
+    trace = current_trace() if request_metrics is not None else None
+    if trace is not None:
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        elapsed = request_metrics.record(route, request.method, response.status_code, trace)
+        response.headers['Server-Timing'] = trace.server_timing(elapsed)
+    return response
+
+@app.teardown_request
+def end_request_trace(exc):
+    token = g.pop('trace_token', None)
+    if token is not None:
+        end_trace(token)
+
+@app.errorhandler(RateBudgetExhausted)
+def rate_budget_exhausted(e):
+    """
+    503 for a request that ran out of Eventbrite rate budget
+
+    Routes re-raise RateBudgetExhausted to get here. Retry-After is when
+    the limiter next has a token for an interactive call. The org's sync
+    status comes along, since an interrupted sync resumes in the background.
+    """
+    limit = rate_limiter.status()
+    retry_after = max(1, math.ceil(limit['next_token_in']))
+    org_id = request.args.get('org_id')
+    response = jsonify({
+        'error': str(e),
+        'retry_after': retry_after,
+        'sync': event_sync.status(org_id) if org_id else None
+    })
+    response.status_code = 503
+    response.headers['Retry-After'] = str(retry_after)
+    return response
+
+def date_range_args(args=None):
+    """
+    (start_from, start_before) for the start_date/end_date query params
+
+    Both are optional YYYY-MM-DD dates and end_date is inclusive. Raises
+    ValueError on a malformed date.
+    """
+    args = request.args if args is None else args
+    start_date = args.get('start_date')
+    end_date = args.get('end_date')
+    start_from = datetime.strptime(start_date, '%Y-%m-%d').date().isoformat() if start_date else None
+    start_before = (
+        datetime.strptime(end_date, '%Y-%m-%d').date() + timedelta(days=1)
+    ).isoformat() if end_date else None
+    return start_from, start_before
+
+def conditional_json(org_id, build, *etag_parts, changed_at=None):
+    """
+    JSON response for an org's store data, with a strong ETag and Last-Modified
+
+    A request whose If-None-Match (or, without one, If-Modified-Since) is
+    still current gets an empty 304 before build() runs, so it costs
+    neither the rebuild nor the serialization. etag_parts are inputs beyond
+    the URL (like the current week) and changed_at a time the response
+    changed without the data changing.
+    """
+    etag = data_versions.etag(org_id, request.full_path, *etag_parts)
+    _, last_modified = data_versions.version(org_id)
+    if changed_at is not None:
+        last_modified = max(last_modified, changed_at)
+    encoding = encoded_bodies.negotiate(request.accept_encodings) if encoded_bodies is not None else 'identity'
+    
+    # A compressed body's tag carries its coding; any coding of the current data is current
+    if request.if_none_match:
+        tags = encoded_bodies.etags(etag) if encoded_bodies is not None else [etag]
+        current = next((tag for tag in tags if request.if_none_match.contains(tag)), None)
+    else:
+        fresh = request.if_modified_since is not None and last_modified <= request.if_modified_since
+        current = coded_etag(etag, encoding) if fresh else None
     
-    return None
+    def timed_build():
+        with phase('build'):
+            return build()
+    
+    if current:
+        response = app.response_class(status=304)
+        if encoded_bodies is not None:
+            response.vary.add('Accept-Encoding')
+        etag = current
+    elif encoded_bodies is not None:
+        body, encoding = encoded_bodies.get(etag, encoding, timed_build)
+        response = app.response_class(body, mimetype='application/json')
+        if encoding != 'identity':
+            response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+        etag = coded_etag(etag, encoding)
+    else:
+        payload = timed_build()
+        with phase('encode'):
+            response = jsonify(payload)
+    response.set_etag(etag)
+    response.last_modified = last_modified
+    response.headers['Cache-Control'] = 'no-cache'  # Always revalidate, it's cheap
+    return response
+
+def status_args():
+    """Statuses from a comma-separated status query param, None for all"""
+    statuses = [s for s in request.args.get('status', '').split(',') if s]
+    return statuses or None
 
 @app.route('/api/health', methods=['GET'])
 def health():
     """Health check endpoint"""
     return jsonify({'status': 'ok', 'message': 'Nova Comedy Collective Dashboard API'})
 
+@app.route('/api/rate-limit', methods=['GET'])
+def get_rate_limit():
+    """Remaining Eventbrite request budget"""
+    return jsonify(rate_limiter.status())
+
+def process_metrics():
+    """Prometheus text for the rate limit budget and caches, always available"""
+    limit = rate_limiter.status()
+    caches = [('eventbrite', api_cache.stats())]
+    if encoded_bodies is not None:
+        caches.append(('bodies', encoded_bodies.stats()))
+    webhooks = []
+    if WEBHOOKS_ENABLED:
+        received = webhook_receiver.stats()
+        webhooks = [
+            format_metric('dashboard_webhooks_total', 'counter', 'Eventbrite webhooks by action and result', [
+                ({'action': action, 'result': result}, n)
+                for result, key in (('applied', 'received'), ('failed', 'failed'))
+                for action, n in sorted(received[key].items())
+            ]),
+            format_metric('dashboard_webhooks_queued', 'gauge', 'Webhooks waiting to be applied',
+                          [({}, received['queued'])])
+        ]
+    return ''.join([
+        format_metric('eventbrite_rate_limit_remaining', 'gauge', 'Eventbrite calls left in the token bucket',
+                      [({}, limit['remaining'])]),
+        format_metric('eventbrite_rate_limit_used', 'gauge', 'Eventbrite calls made in the rate limit window',
+                      [({}, limit['used_in_window'])]),
+        format_metric('eventbrite_rate_limit_waiting', 'gauge', 'Callers queued for a token',
+                      [({}, limit['waiting'])]),
+        format_metric('eventbrite_rate_limit_paused_seconds', 'gauge', 'Remaining 429 pause',
+                      [({}, limit['paused_for'])]),
+        format_metric('eventbrite_rate_limited_total', 'counter', '429 responses from Eventbrite',
+                      [({}, limit['throttled'])]),
+        format_metric('dashboard_cache_entries', 'gauge', 'Entries per cache',
+                      [({'cache': name}, stats['entries']) for name, stats in caches]),
+        format_metric('dashboard_cache_lookups_total', 'counter', 'Cache lookups by result', [
+            ({'cache': name, 'result': result}, stats[key])
+            for name, stats in caches
+            for result, key in (('hit', 'hits'), ('stale', 'stale_hits'), ('miss', 'misses'),
+                                ('coalesced', 'coalesced'))
+        ]),
+        *webhooks
+    ])
+
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """Prometheus metrics: rate limit and caches, plus per-route request metrics when instrumented"""
+    try:
+        text = process_metrics()
+        if request_metrics is not None:
+            text += request_metrics.render()
+        return app.response_class(text, content_type='text/plain; version=0.0.4; charset=utf-8')
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/sync-status', methods=['GET'])
+def get_sync_status():
+    """How complete the org's synced data is, and which events still lack attendees"""
+    try:
+        org_id = org_resolver.resolve(request.args.get('org_id'))
+        return jsonify(event_sync.status(org_id))
+    
+    except OrgResolutionError as e:
+        return jsonify({'error': str(e)}), e.status_code
+    except RateBudgetExhausted:
+        raise
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/organizations', methods=['GET'])
 def get_organizations():
     """Fetch all organizations the user has access to"""
     try:
-        org_response = requests.get(
-            f"{EVENTBRITE_API_BASE}/users/me/organizations/",
-            headers=get_headers()
-        )
-        
-        if org_response.status_code != 200:
+        try:
+            organizations = org_resolver.organizations()
+        except OrgResolutionError:
             return jsonify({'error': 'Failed to fetch organizations'}), 500
         
-        organizations = org_response.json().get('organizations', [])
-        
         # Filter to only The Nova Comedy Collective
         formatted_orgs = []
         for org in organizations:
@@ -71,84 +331,54 @@ def get_organizations():
         
         return jsonify({'organizations': formatted_orgs})
     
+    except RateBudgetExhausted:
+        raise
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/events', methods=['GET'])
 def get_events():
-    """Fetch all events for the organization"""
+    """Fetch all events for the organization, optionally within a date range or statuses"""
     try:
-        # Get organization ID from query parameter or use first organization
-        org_id = request.args.get('org_id')
-        
-        if not org_id:
-            org_response = requests.get(
-                f"{EVENTBRITE_API_BASE}/users/me/organizations/",
-                headers=get_headers()
-            )
-            
-            if org_response.status_code != 200:
-                return jsonify({'error': 'Failed to fetch organization'}), 500
-            
-            organizations = org_response.json().get('organizations', [])
-            if not organizations:
-                return jsonify({'error': 'No organization found'}), 404
-            
-            org_id = organizations[0]['id']
-        
-        # Get all events for the organization with pagination
-        all_events = []
-        continuation = None
-        
-        while True:
-            params = {'status': 'all', 'order_by': 'start_desc'}
-            if continuation:
-                params['continuation'] = continuation
-            
-            events_response = requests.get(
-                f"{EVENTBRITE_API_BASE}/organizations/{org_id}/events/",
-                headers=get_headers(),
-                params=params
-            )
-            
-            if events_response.status_code != 200:
-                return jsonify({'error': 'Failed to fetch events'}), 500
-            
-            events_data = events_response.json()
-            page_events = events_data.get('events', [])
-            all_events.extend(page_events)
-            
-            # Check if there are more pages
-            pagination = events_data.get('pagination', {})
-            if not pagination.get('has_more_items', False):
-                break
+        try:
+            start_from, start_before = date_range_args()
+        except ValueError:
+            return jsonify({'error': 'start_date and end_date must be YYYY-MM-DD'}), 400
+        
+        # Org from the query string or the first organization, synced into the store
+        org_id = org_resolver.resolve_synced(request.args.get('org_id'), start_from, start_before)
+        
+        def build():
+            events = store.get_events(org_id, start_from, start_before, statuses=status_args())
+            
+            # Format events and filter out drafts
+            formatted_events = []
+            for event in events:
+                # Skip draft events
+                if event.get('status') == 'draft':
+                    continue
+                    
+                formatted_events.append({
+                    'id': event['id'],
+                    'name': event['name'],
+                    'start': event['start_local'],
+                    'end': event['end_local'],
+                    'status': event['status'],
+                    'url': event['url'],
+                    'capacity': event['capacity'],
+                    'is_free': bool(event['is_free'])
+                })
             
-            continuation = pagination.get('continuation')
-            if not continuation:
-                break
-        
-        events = all_events
-        
-        # Format events and filter out drafts
-        formatted_events = []
-        for event in events:
-            # Skip draft events
-            if event.get('status') == 'draft':
-                continue
-                
-            formatted_events.append({
-                'id': event['id'],
-                'name': event['name']['text'],
-                'start': event['start']['local'],
-                'end': event['end']['local'],
-                'status': event['status'],
-                'url': event['url'],
-                'capacity': event.get('capacity', 0),
-                'is_free': event.get('is_free', False)
-            })
+            return {'events': formatted_events}
         
-        return jsonify({'events': formatted_events})
+        return conditional_json(org_id, build)
     
+    except OrgResolutionError as e:
+        return jsonify({'error': str(e)}), e.status_code
+    except UpstreamFetchError:
+        return jsonify({'error': 'Failed to fetch events'}), 500
+    except RateBudgetExhausted:
+        raise
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -156,21 +386,18 @@ def get_events():
 def get_event_attendees(event_id):
     """Fetch attendees for a specific event"""
     try:
-        attendees_response = requests.get(
-            f"{EVENTBRITE_API_BASE}/events/{event_id}/attendees/",
-            headers=get_headers(),
-            params={'status': 'attending'}
-        )
-        
-        if attendees_response.status_code != 200:
-            return jsonify({'error': 'Failed to fetch attendees'}), 500
-        
-        attendees_data = attendees_response.json()
-        attendees = attendees_data.get('attendees', [])
-        
-        # Format attendees
+        # Serve from the local store once the event's attendees are synced
+        event = store.get_event(event_id)
+        if event and event['attendees_synced_at']:
+            formatted_attendees = []
+            for attendee in store.get_attendees(event_id):
+                attendee['checked_in'] = bool(attendee['checked_in'])
+                formatted_attendees.append(attendee)
+            return jsonify({'attendees': formatted_attendees})
+        
+        # Otherwise format live attendees page by page
         formatted_attendees = []
-        for attendee in attendees:
+        for attendee in iter_attendees(event_id):
             profile = attendee.get('profile', {})
             formatted_attendees.append({
                 'id': attendee['id'],
@@ -186,506 +413,398 @@ def get_event_attendees(event_id):
         
         return jsonify({'attendees': formatted_attendees})
     
+    except UpstreamFetchError:
+        return jsonify({'error': 'Failed to fetch attendees'}), 500
+    except RateBudgetExhausted:
+        raise
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def performance_row(event, metrics):
+    """One event's /api/event-performance entry"""
+    capacity = event['capacity']
+    return {
+        'id': event['id'],
+        'name': event['name'],
+        'status': event['status'],
+        'start': event['start_local'],
+        'capacity': capacity,
+        'attendees': metrics.attendees,
+        'checked_in': metrics.checked_in,
+        'revenue': round(metrics.revenue, 2),
+        'sell_through_rate': round(metrics.sell_through_rate(capacity), 2),
+        'check_in_rate': round(metrics.check_in_rate(), 2),
+        'avg_ticket_price': round(metrics.avg_ticket_price(), 2)
+    }
+
 @app.route('/api/event-performance', methods=['GET'])
 def get_event_performance():
-    """Get event performance rankings"""
+    """Get event performance rankings, optionally within a date range or statuses"""
     try:
-        org_id = request.args.get('org_id')
+        try:
+            start_from, start_before = date_range_args()
+        except ValueError:
+            return jsonify({'error': 'start_date and end_date must be YYYY-MM-DD'}), 400
         
-        if not org_id:
-            org_response = requests.get(
-                f"{EVENTBRITE_API_BASE}/users/me/organizations/",
-                headers=get_headers()
-            )
-            
-            if org_response.status_code != 200:
-                return jsonify({'error': 'Failed to fetch organization'}), 500
-            
-            organizations = org_response.json().get('organizations', [])
-            if not organizations:
-                return jsonify({'error': 'No organization found'}), 404
-            
-            org_id = organizations[0]['id']
+        org_id = org_resolver.resolve_synced(request.args.get('org_id'), start_from, start_before)
+        def build():
+            all_events = store.get_events(org_id, start_from, start_before, statuses=status_args())
         
-        # Get all events with pagination
-        all_events = []
-        continuation = None
+            # Calculate performance metrics for each event
+            event_performance = []
         
-        while True:
-            params = {'status': 'all', 'order_by': 'start_desc'}
-            if continuation:
-                params['continuation'] = continuation
-            
-            events_response = requests.get(
-                f"{EVENTBRITE_API_BASE}/organizations/{org_id}/events/",
-                headers=get_headers(),
-                params=params
-            )
-            
-            if events_response.status_code != 200:
-                return jsonify({'error': 'Failed to fetch events'}), 500
-            
-            events_data = events_response.json()
-            page_events = events_data.get('events', [])
-            all_events.extend(page_events)
-            
-            pagination = events_data.get('pagination', {})
-            if not pagination.get('has_more_items', False):
-                break
-            
-            continuation = pagination.get('continuation')
-            if not continuation:
-                break
+            # Skip draft events
+            published_events = [e for e in all_events if e['status'] != 'draft']
         
-        # Calculate performance metrics for each event
-        event_performance = []
+            # Precomputed per-event attendee metrics
+            org_metrics = metrics_table.for_org(org_id)
         
-        for event in all_events:
-            # Skip draft events
-            if event.get('status') == 'draft':
-                continue
-                
-            event_id = event['id']
-            event_name = event['name']['text']
-            capacity = event.get('capacity', 0)
-            status = event.get('status', '')
-            
-            # Get attendees
-            attendees_response = requests.get(
-                f"{EVENTBRITE_API_BASE}/events/{event_id}/attendees/",
-                headers=get_headers(),
-                params={'status': 'attending'}
-            )
-            
-            if attendees_response.status_code == 200:
-                attendees = attendees_response.json().get('attendees', [])
-                attendee_count = len(attendees)
-                checked_in_count = sum(1 for a in attendees if a.get('checked_in', False))
-                
-                # Calculate revenue
-                total_event_revenue = 0
-                for attendee in attendees:
-                    costs = attendee.get('costs', {})
-                    gross = costs.get('gross', {})
-                    revenue_cents = gross.get('value', 0)
-                    total_event_revenue += revenue_cents / 100.0
-                
-                # Calculate sell-through rate
-                sell_through_rate = (attendee_count / capacity * 100) if capacity > 0 else 0
-                check_in_rate = (checked_in_count / attendee_count * 100) if attendee_count > 0 else 0
-                
-                event_performance.append({
-                    'id': event_id,
-                    'name': event_name,
-                    'status': status,
-                    'start': event['start']['local'],
-                    'capacity': capacity,
-                    'attendees': attendee_count,
-                    'checked_in': checked_in_count,
-                    'revenue': round(total_event_revenue, 2),
-                    'sell_through_rate': round(sell_through_rate, 2),
-                    'check_in_rate': round(check_in_rate, 2),
-                    'avg_ticket_price': round(total_event_revenue / attendee_count, 2) if attendee_count > 0 else 0
-                })
+            for event in published_events:
+                metrics = org_metrics.get(event['id'])
+                if metrics is not None:
+                    event_performance.append(performance_row(event, metrics))
         
-        # Sort by revenue for rankings
-        event_performance.sort(key=lambda x: x['revenue'], reverse=True)
+            # Sort by revenue for rankings
+            event_performance.sort(key=lambda x: x['revenue'], reverse=True)
         
-        return jsonify({'events': event_performance})
+            return {'events': event_performance}
+        
+        return conditional_json(org_id, build)
     
+    except OrgResolutionError as e:
+        return jsonify({'error': str(e)}), e.status_code
+    except UpstreamFetchError:
+        return jsonify({'error': 'Failed to fetch events'}), 500
+    except RateBudgetExhausted:
+        raise
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+_SYNC_DONE = object()  # Ends a streamed sync's progress queue
+
+@app.route('/api/event-performance/stream', methods=['GET'])
+def stream_event_performance():
+    """
+    Stream event performance as NDJSON, each event as soon as its metrics are ready
+
+    Lines are {"type": "event", "event": {...}} in the /api/event-performance
+    entry shape, then one {"type": "summary"} with the revenue ranking
+    (event ids) and totals. On a cold store the full sync runs while the
+    response streams, and each event is sent the moment its attendees land.
+    """
+    try:
+        try:
+            start_from, start_before = date_range_args()
+        except ValueError:
+            return jsonify({'error': 'start_date and end_date must be YYYY-MM-DD'}), 400
+        statuses = status_args()
+        
+        org_id = org_resolver.resolve(request.args.get('org_id'))
+        # Only an unwindowed cold store streams its sync; anything else is quick to sync first
+        progressive = store.org_synced_at(org_id) is None and start_from is None and start_before is None
+        if not progressive:
+            org_resolver.resolve_synced(org_id, start_from, start_before)
+        org_metrics = metrics_table.for_org(org_id)
+    
+    except OrgResolutionError as e:
+        return jsonify({'error': str(e)}), e.status_code
+    except UpstreamFetchError:
+        return jsonify({'error': 'Failed to fetch events'}), 500
+    except RateBudgetExhausted:
+        raise
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    
+    def included(event):
+        return (
+            event['status'] != 'draft'
+            and (not statuses or event['status'] in statuses)
+            and (start_from is None or event['start_local'] >= start_from)
+            and (start_before is None or event['start_local'] < start_before)
+        )
+    
+    def generate():
+        sent = {}  # event_id -> revenue, for the final ranking
+        totals = {'attendees': 0, 'revenue': 0.0}
+        
+        def event_line(event, metrics):
+            row = performance_row(event, metrics)
+            sent[event['id']] = row['revenue']
+            totals['attendees'] += row['attendees']
+            totals['revenue'] += row['revenue']
+            return dumps({'type': 'event', 'event': row}) + b'\n'
+        
+        def unsent():
+            for event in store.get_events(org_id, start_from, start_before, statuses=statuses):
+                metrics = org_metrics.get(event['id']) or metrics_table.get(event['id'])
+                if event['id'] not in sent and included(event) and metrics is not None:
+                    yield event, metrics
+        
+        # Everything already in the store goes out first
+        for event, metrics in unsent():
+            yield event_line(event, metrics)
+        
+        if progressive:
+            progress = queue.Queue()
+            
+            def run():
+                try:
+                    event_sync.sync(org_id, on_synced=progress.put)
+                except Exception as e:
+                    progress.put(e)
+                finally:
+                    progress.put(_SYNC_DONE)
+            
+            threading.Thread(target=run, daemon=True).start()
+            while True:
+                item = progress.get()
+                if item is _SYNC_DONE:
+                    break
+                if isinstance(item, Exception):
+                    yield dumps({'type': 'error', 'error': str(item)}) + b'\n'
+                    continue
+                event = store.get_event(item)
+                metrics = metrics_table.get(item)
+                if event is not None and metrics is not None and item not in sent and included(event):
+                    yield event_line(event, metrics)
+            
+            # Events a concurrent sync covered before ours started
+            for event, metrics in unsent():
+                yield event_line(event, metrics)
+        
+        yield dumps({
+            'type': 'summary',
+            'ranking': sorted(sent, key=lambda event_id: sent[event_id], reverse=True),
+            'event_count': len(sent),
+            'total_attendees': totals['attendees'],
+            'total_revenue': round(totals['revenue'], 2)
+        }) + b'\n'
+    
+    response = app.response_class(generate(), mimetype='application/x-ndjson')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # Don't let a proxy hold rows back
+    return response
+
 @app.route('/api/insights', methods=['GET'])
 def get_insights():
     """Get comprehensive insights across all events"""
     try:
-        # Get organization ID from query parameter or use first organization
-        org_id = request.args.get('org_id')
-        
-        if not org_id:
-            org_response = requests.get(
-                f"{EVENTBRITE_API_BASE}/users/me/organizations/",
-                headers=get_headers()
-            )
-            
-            if org_response.status_code != 200:
-                return jsonify({'error': 'Failed to fetch organization'}), 500
-            
-            organizations = org_response.json().get('organizations', [])
-            if not organizations:
-                return jsonify({'error': 'No organization found'}), 404
-            
-            org_id = organizations[0]['id']
+        # Org from the query string or the first organization, synced into the store
+        org_id = org_resolver.resolve_synced(request.args.get('org_id'))
         
-        # Get all events with pagination
-        all_events = []
-        continuation = None
+        # Rollups are kept current per sync delta, and say which events they still lack
+        sync_status = event_sync.status(org_id)
         
-        while True:
-            params = {'status': 'all', 'order_by': 'start_desc'}
-            if continuation:
-                params['continuation'] = continuation
-            
-            events_response = requests.get(
-                f"{EVENTBRITE_API_BASE}/organizations/{org_id}/events/",
-                headers=get_headers(),
-                params=params
-            )
-            
-            if events_response.status_code != 200:
-                return jsonify({'error': 'Failed to fetch events'}), 500
-            
-            events_data = events_response.json()
-            page_events = events_data.get('events', [])
-            all_events.extend(page_events)
-            
-            # Check if there are more pages
-            pagination = events_data.get('pagination', {})
-            if not pagination.get('has_more_items', False):
-                break
-            
-            continuation = pagination.get('continuation')
-            if not continuation:
-                break
-        
-        events = all_events
-        
-        # Aggregate insights
-        total_events = len(events)
-        total_attendees = 0
-        total_revenue = 0
-        events_by_month = defaultdict(int)
-        attendees_by_month = defaultdict(int)
-        revenue_by_month = defaultdict(float)
-        ticket_types = defaultdict(int)
-        ticket_revenue = defaultdict(float)
-        unique_emails = set()
-        repeat_customers = defaultdict(int)
-        customer_revenue = defaultdict(float)  # email -> total revenue
-        customer_event_dates = defaultdict(list)  # email -> list of event dates
-        customer_events = defaultdict(list)  # email -> list of {event_name, date}
-        events_list = []  # List of events with monthly data for filtering
-        events_by_month_by_event = defaultdict(lambda: defaultdict(int))  # event_name -> month -> event count
-        attendees_by_month_by_event = defaultdict(lambda: defaultdict(int))  # event_name -> month -> attendee count
-        # Capacity tracking
-        capacity_events_attendees = 0
-        total_capacity = 0
-        
-        for event in events:
-            # Skip draft events
-            if event.get('status') == 'draft':
-                continue
-                
-            event_id = event['id']
-            event_name = event['name']['text']
-            
-            # Get attendees for each event
-            attendees_response = requests.get(
-                f"{EVENTBRITE_API_BASE}/events/{event_id}/attendees/",
-                headers=get_headers(),
-                params={'status': 'attending'}
-            )
-            
-            if attendees_response.status_code == 200:
-                attendees = attendees_response.json().get('attendees', [])
-                event_attendee_count = len(attendees)
-                total_attendees += event_attendee_count
-                
-                # Track capacity utilization
-                event_capacity = event.get('capacity', 0)
-                if event_capacity > 0:
-                    capacity_events_attendees += event_attendee_count
-                    total_capacity += event_capacity
-                
-                # Parse event date
-                event_start = event['start']['local']
-                event_date = datetime.fromisoformat(event_start.replace('Z', '+00:00'))
-                month_key = event_date.strftime('%Y-%m')
-                
-                events_by_month[month_key] += 1
-                attendees_by_month[month_key] += event_attendee_count
-                
-                # Track per-event data for filtering
-                events_by_month_by_event[event_name][month_key] += 1
-                attendees_by_month_by_event[event_name][month_key] += event_attendee_count
-                if event_name not in [e['name'] for e in events_list]:
-                    events_list.append({'id': event_id, 'name': event_name})
-                
-                # Process attendees
-                for attendee in attendees:
-                    profile = attendee.get('profile', {})
-                    email = profile.get('email', '')
-                    
-                    if email:
-                        repeat_customers[email] += 1
-                        unique_emails.add(email)
-                        customer_event_dates[email].append(month_key)
-                        customer_events[email].append({
-                            'event_name': event_name,
-                            'event_date': event_start,
-                            'event_id': event_id
-                        })
-                    
-                    ticket_class = attendee.get('ticket_class_name', 'Unknown')
-                    ticket_types[ticket_class] += 1
-                    
-                    # Track revenue
-                    costs = attendee.get('costs', {})
-                    gross = costs.get('gross', {})
-                    revenue_cents = gross.get('value', 0)
-                    revenue_dollars = revenue_cents / 100.0
-                    
-                    total_revenue += revenue_dollars
-                    revenue_by_month[month_key] += revenue_dollars
-                    ticket_revenue[ticket_class] += revenue_dollars
-                    
-                    if email:
-                        customer_revenue[email] += revenue_dollars
-        
-        # Calculate repeat customer percentage
-        repeat_customer_count = sum(1 for count in repeat_customers.values() if count > 1)
-        repeat_customer_rate = (repeat_customer_count / len(unique_emails) * 100) if unique_emails else 0
-        new_customer_count = len(unique_emails) - repeat_customer_count
-        
-        # Calculate customer lifetime value
-        avg_customer_lifetime_value = (total_revenue / len(unique_emails)) if unique_emails else 0
-        
-        # Find top customers by event attendance
-        top_customers = sorted(repeat_customers.items(), key=lambda x: x[1], reverse=True)[:10]
-        top_customers_data = []
-        for email, event_count in top_customers:
-            top_customers_data.append({
-                'email': email,
-                'events_attended': event_count,
-                'lifetime_value': round(customer_revenue.get(email, 0), 2)
-            })
+        def build():
+            return {**insights_registry.get(org_id).to_response(), 'sync': sync_status}
         
-        # Calculate subscription behavior (customers with 3+ events = "pseudo-subscribers")
-        pseudo_subscribers = sum(1 for count in repeat_customers.values() if count >= 3)
-        pseudo_subscriber_rate = (pseudo_subscribers / len(unique_emails) * 100) if unique_emails else 0
-        multi_show_buyers = sum(1 for count in repeat_customers.values() if count >= 2)
-        
-        # Build detailed customer event history
-        customer_details = {}
-        for email, events_attended in repeat_customers.items():
-            # Sort events by date
-            events_list_sorted = sorted(
-                customer_events.get(email, []), 
-                key=lambda x: x['event_date']
-            )
-            
-            customer_details[email] = {
-                'email': email,
-                'total_events': events_attended,
-                'lifetime_value': round(customer_revenue.get(email, 0), 2),
-                'event_months': sorted(set(customer_event_dates.get(email, []))),
-                'events': events_list_sorted
-            }
+        return conditional_json(
+            org_id,
+            build,
+            sync_status['complete'],
+            sync_status['resuming_from'],
+            len(sync_status['missing_events'])
+        )
+    
+    except OrgResolutionError as e:
+        return jsonify({'error': str(e)}), e.status_code
+    except UpstreamFetchError:
+        return jsonify({'error': 'Failed to fetch events'}), 500
+    except RateBudgetExhausted:
+        raise
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/customers', methods=['GET'])
+def get_customers():
+    """Get one page of customers with their event history"""
+    try:
+        # Org from the query string or the first organization, synced into the store
+        org_id = org_resolver.resolve_synced(request.args.get('org_id'))
         
-        # Calculate average capacity utilization (already tracked during event loop)
-        capacity_utilization = (capacity_events_attendees / total_capacity * 100) if total_capacity > 0 else 0
-        
-        # Cohort analysis: first-timer retention  
-        # Count customers who only attended 1 event
-        first_time_customers = sum(1 for count in repeat_customers.values() if count == 1)
-        # First-timer retention = what % of all customers became repeat customers
-        first_timer_retention_rate = repeat_customer_rate  # Same metric, different context
-        
-        # Format monthly data for charts
-        monthly_data = []
-        for month in sorted(events_by_month.keys()):
-            monthly_data.append({
-                'month': month,
-                'events': events_by_month[month],
-                'attendees': attendees_by_month[month],
-                'revenue': round(revenue_by_month[month], 2)
-            })
+        try:
+            return conditional_json(org_id, lambda: insights_registry.get(org_id).customers_page(
+                sort=request.args.get('sort', 'lifetime_value'),
+                cursor=request.args.get('cursor'),
+                limit=int(request.args.get('limit', DEFAULT_CUSTOMERS_PAGE)),
+                email_prefix=request.args.get('email', '').strip(),
+                min_events=int(request.args.get('min_events', 0))
+            ))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+    
+    except OrgResolutionError as e:
+        return jsonify({'error': str(e)}), e.status_code
+    except UpstreamFetchError:
+        return jsonify({'error': 'Failed to fetch events'}), 500
+    except RateBudgetExhausted:
+        raise
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/forecast', methods=['GET'])
+def get_forecast():
+    """Get attendance and revenue forecasts, overall and per event name"""
+    try:
+        # Org from the query string or the first organization, synced into the store
+        org_id = org_resolver.resolve_synced(request.args.get('org_id'))
         
-        # Format ticket type data with revenue
-        ticket_data = []
-        for ticket_type, count in ticket_types.items():
-            ticket_data.append({
-                'type': ticket_type,
-                'count': count,
-                'revenue': round(ticket_revenue[ticket_type], 2)
-            })
+        try:
+            months_ahead = int(request.args.get('months_ahead', DEFAULT_MONTHS_AHEAD))
+        except ValueError:
+            return jsonify({'error': 'months_ahead must be a number'}), 400
+        if not 1 <= months_ahead <= MAX_MONTHS_AHEAD:
+            return jsonify({'error': f'months_ahead must be between 1 and {MAX_MONTHS_AHEAD}'}), 400
         
-        # Format event-specific monthly data for filtering
-        events_monthly_data = {}
-        for event_name in events_by_month_by_event.keys():
-            event_monthly = []
-            all_months = set(events_by_month_by_event[event_name].keys()) | set(attendees_by_month_by_event[event_name].keys())
-            for month in sorted(all_months):
-                event_monthly.append({
-                    'month': month,
-                    'events': events_by_month_by_event[event_name][month],
-                    'attendees': attendees_by_month_by_event[event_name][month]
-                })
-            events_monthly_data[event_name] = event_monthly
-        
-        insights = {
-            'total_events': total_events,
-            'total_attendees': total_attendees,
-            'total_revenue': round(total_revenue, 2),
-            'avg_revenue_per_event': round(total_revenue / total_events, 2) if total_events > 0 else 0,
-            'avg_revenue_per_ticket': round(total_revenue / total_attendees, 2) if total_attendees > 0 else 0,
-            'unique_customers': len(unique_emails),
-            'new_customers': new_customer_count,
-            'repeat_customers': repeat_customer_count,
-            'repeat_customer_rate': round(repeat_customer_rate, 2),
-            'avg_customer_lifetime_value': round(avg_customer_lifetime_value, 2),
-            'avg_attendees_per_event': round(total_attendees / total_events, 2) if total_events > 0 else 0,
-            'monthly_trends': monthly_data,
-            'ticket_types': ticket_data,
-            'events_list': events_list,
-            'events_monthly_data': events_monthly_data,
-            'top_customers': top_customers_data,
-            # Subscription behavior metrics
-            'pseudo_subscribers': pseudo_subscribers,
-            'pseudo_subscriber_rate': round(pseudo_subscriber_rate, 2),
-            'multi_show_buyers': multi_show_buyers,
-            # Capacity utilization metrics
-            'capacity_utilization': round(capacity_utilization, 2),
-            'total_capacity': total_capacity,
-            # Retention cohort metrics
-            'first_time_customers': first_time_customers,
-            'first_timer_retention_rate': round(first_timer_retention_rate, 2),
-            # Customer details for expanded view
-            'customer_details': list(customer_details.values())
-        }
-        
-        return jsonify(insights)
+        # Named events only, or every event name with all_events=true
+        event_names = None if request.args.get('all_events') == 'true' else request.args.getlist('event_name')
+        
+        return conditional_json(org_id, lambda: forecast_service.to_response(org_id, months_ahead, event_names))
     
+    except OrgResolutionError as e:
+        return jsonify({'error': str(e)}), e.status_code
+    except UpstreamFetchError:
+        return jsonify({'error': 'Failed to fetch events'}), 500
+    except RateBudgetExhausted:
+        raise
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def this_week_start():
+    """Monday of the current week"""
+    return get_week_start(datetime.now().date())
+
+def week_changed_at(week_start):
+    """When a report relative to the current week last changed by the calendar alone (Monday 00:00 local)"""
+    return datetime.combine(week_start, time()).astimezone(timezone.utc)
+
+def weeks_window(week_offset, weeks):
+    """(first Monday, last Sunday) of the weeks weeks ending week_offset weeks from now"""
+    this_week = this_week_start()
+    week_start = this_week + timedelta(weeks=week_offset - weeks + 1)
+    week_end = this_week + timedelta(weeks=week_offset, days=6)
+    return week_start, week_end
+
+def weekly_sales_data(org_id, week_start, week_end):
+    """Bucket the org's events between two dates by week, in one pass over the store"""
+    events = store.get_events(
+        org_id,
+        start_from=week_start.isoformat(),
+        start_before=(week_end + timedelta(days=1)).isoformat(),
+        order='ASC'
+    )
+    return generate_weekly_report_from_store(events, metrics_table.for_org(org_id))
+
 @app.route('/api/weekly-sales', methods=['GET'])
 def get_weekly_sales():
     """Get weekly sales report"""
     try:
-        org_id = request.args.get('org_id')
         week_offset = int(request.args.get('week_offset', 0))  # 0 = current week, -1 = last week, etc.
+        week_start, week_end = weeks_window(week_offset, 1)
         
-        if not org_id:
-            org_response = make_api_request(
-                f"{EVENTBRITE_API_BASE}/users/me/organizations/"
-            )
-            
-            if not org_response or org_response.status_code != 200:
-                return jsonify({'error': 'Failed to fetch organization'}), 500
-            
-            organizations = org_response.json().get('organizations', [])
-            if not organizations:
-                return jsonify({'error': 'No organization found'}), 404
-            
-            org_id = organizations[0]['id']
-        
-        # Calculate week start (Monday) and end (Sunday)
-        today = datetime.now().date()
-        days_since_monday = today.weekday()
-        week_start = today - timedelta(days=days_since_monday) + timedelta(weeks=week_offset)
-        week_end = week_start + timedelta(days=6)
-        
-        # Get all events with pagination
-        all_events = []
-        continuation = None
-        
-        while True:
-            params = {'status': 'all', 'order_by': 'start_asc'}
-            if continuation:
-                params['continuation'] = continuation
-            
-            events_response = make_api_request(
-                f"{EVENTBRITE_API_BASE}/organizations/{org_id}/events/",
-                params=params
-            )
-            
-            if not events_response or events_response.status_code != 200:
-                return jsonify({'error': 'Failed to fetch events'}), 500
-            
-            events_data = events_response.json()
-            page_events = events_data.get('events', [])
-            all_events.extend(page_events)
-            
-            pagination = events_data.get('pagination', {})
-            if not pagination.get('has_more_items', False):
-                break
-            
-            continuation = pagination.get('continuation')
-            if not continuation:
-                break
+        # On a cold store only the week itself is fetched from Eventbrite
+        org_id = org_resolver.resolve_synced(
+            request.args.get('org_id'),
+            week_start.isoformat(),
+            (week_end + timedelta(days=1)).isoformat()
+        )
         
-        # Filter events for the selected week and get attendee data
-        weekly_sales = []
-        total_tickets = 0
-        total_revenue = 0
+        def build():
+            weekly_data = weekly_sales_data(org_id, week_start, week_end)
+            return summarize_week(week_start, weekly_data.get(week_start, []))
         
-        for event in all_events:
-            # Skip draft events
-            if event.get('status') == 'draft':
-                continue
-                
-            event_id = event['id']
-            event_name = event['name']['text']
-            event_start = event['start']['local']
+        # week_offset is relative, so the week is part of the tag
+        this_week = this_week_start()
+        return conditional_json(org_id, build, this_week.isoformat(), changed_at=week_changed_at(this_week))
+    
+    except OrgResolutionError as e:
+        return jsonify({'error': str(e)}), e.status_code
+    except UpstreamFetchError:
+        return jsonify({'error': 'Failed to fetch events'}), 500
+    except RateBudgetExhausted:
+        raise
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/weekly-sales/range', methods=['GET'])
+def get_weekly_sales_range():
+    """Get several consecutive weekly sales reports in one response"""
+    try:
+        week_offset = int(request.args.get('week_offset', 0))  # Last week in the range
+        weeks = min(max(int(request.args.get('weeks', DEFAULT_REPORT_WEEKS)), 1), MAX_REPORT_WEEKS)
+        week_start, week_end = weeks_window(week_offset, weeks)
+        
+        # On a cold store only the requested weeks are fetched from Eventbrite
+        org_id = org_resolver.resolve_synced(
+            request.args.get('org_id'),
+            week_start.isoformat(),
+            (week_end + timedelta(days=1)).isoformat()
+        )
+        
+        def build():
+            weekly_data = weekly_sales_data(org_id, week_start, week_end)
             
-            # Parse event date
-            event_date = datetime.fromisoformat(event_start.replace('Z', '+00:00')).date()
+            reports = [
+                summarize_week(start, weekly_data.get(start, []))
+                for start in (week_start + timedelta(weeks=i) for i in range(weeks))
+            ]
             
-            # Check if event is in the selected week
-            if week_start <= event_date <= week_end:
-                # Get attendees
-                attendees_response = make_api_request(
-                    f"{EVENTBRITE_API_BASE}/events/{event_id}/attendees/",
-                    params={'status': 'attending'}
-                )
-                
-                if attendees_response and attendees_response.status_code == 200:
-                    attendees = attendees_response.json().get('attendees', [])
-                    tickets_sold = len(attendees)
-                    
-                    # Calculate revenue
-                    event_revenue = 0
-                    for attendee in attendees:
-                        costs = attendee.get('costs', {})
-                        gross = costs.get('gross', {})
-                        revenue_cents = gross.get('value', 0)
-                        event_revenue += revenue_cents / 100.0
-                    
-                    weekly_sales.append({
-                        'event_name': event_name,
-                        'event_date': event_start,
-                        'tickets_sold': tickets_sold,
-                        'gross_revenue': round(event_revenue, 2)
-                    })
-                    
-                    total_tickets += tickets_sold
-                    total_revenue += event_revenue
-                    
-                    # Add small delay to avoid rate limiting
-                    time.sleep(0.1)
-        
-        # Sort by event date
-        weekly_sales.sort(key=lambda x: x['event_date'])
-        
-        return jsonify({
-            'week_start': week_start.isoformat(),
-            'week_end': week_end.isoformat(),
-            'events': weekly_sales,
-            'total_tickets': total_tickets,
-            'total_revenue': round(total_revenue, 2),
-            'event_count': len(weekly_sales)
-        })
+            return {
+                'weeks': reports,
+                'total_tickets': sum(report['total_tickets'] for report in reports),
+                'total_revenue': round(sum(report['total_revenue'] for report in reports), 2),
+                'event_count': sum(report['event_count'] for report in reports)
+            }
+        
+        # week_offset is relative, so the week is part of the tag
+        this_week = this_week_start()
+        return conditional_json(org_id, build, this_week.isoformat(), changed_at=week_changed_at(this_week))
     
+    except OrgResolutionError as e:
+        return jsonify({'error': str(e)}), e.status_code
+    except UpstreamFetchError:
+        return jsonify({'error': 'Failed to fetch events'}), 500
+    except RateBudgetExhausted:
+        raise
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-if __name__ == '__main__':
+@app.route('/api/webhooks/eventbrite', methods=['POST'])
+def eventbrite_webhook():
+    """Queue an Eventbrite order, attendee or event webhook to be applied to the store"""
+    try:
+        if not WEBHOOKS_ENABLED:
+            return jsonify({'error': 'Webhooks are not enabled'}), 404
+        
+        # Eventbrite doesn't sign webhooks, so the endpoint URL carries a shared secret
+        if not WEBHOOK_SECRET:
+            return jsonify({'error': 'WEBHOOK_SECRET is not configured'}), 403
+        if not hmac.compare_digest(request.args.get('secret', ''), WEBHOOK_SECRET):
+            return jsonify({'error': 'Invalid webhook secret'}), 403
+        
+        payload = request.get_json(silent=True)
+        if not isinstance(payload, dict):
+            return jsonify({'error': 'Expected a JSON webhook payload'}), 400
+        
+        # Applied by the receiver's worker, a sync in progress can't hold up the delivery
+        action = webhook_receiver.accept(payload)
+        return jsonify({'action': action, 'queued': True}), 202
+    
+    except WebhookError as e:
+        return jsonify({'error': str(e)}), e.status_code
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def start_background():
+    """Start the prefetcher unless it's disabled, called by whichever server runs the app"""
+    if WEBHOOKS_ENABLED and not WEBHOOK_SECRET:
+        print("Warning: WEBHOOKS_ENABLED is set without WEBHOOK_SECRET, webhooks will be refused!")
     if not EVENTBRITE_TOKEN:
         print("Warning: EVENTBRITE_TOKEN environment variable not set!")
+    elif os.environ.get('PREFETCH_ENABLED', 'true').lower() != 'false':
+        prefetcher.start()
+
+if __name__ == '__main__':
+    start_background()
     app.run(debug=True, port=8080, use_reloader=False)
 
@@ -0,0 +1,172 @@
+"""
+ASGI entry point: the dashboard API for many concurrent users
+
+    uvicorn asgi:app --port 8080
+
+Same routes and response shapes as app.py, whose Flask app still renders
+every response. What moves onto the event loop is the waiting. Before a
+request is handed to Flask, the Eventbrite calls it would block on are made
+here through AsyncEventbriteClient: the organizations list and live attendee
+pages straight into the shared response cache, and a cold store's first
+sync (async_sync.AsyncEventSync: event list and attendee pages on the loop,
+only store writes in threads) once per org and window, awaited by every
+concurrent request. Flask then only reads the cache and the store, so a few
+render threads serve many users whose Eventbrite calls are in flight.
+
+Syncs of a warm store (the prefetcher, background refreshes and resumes)
+still run in threads on the blocking EventbriteClient; no request waits on
+them.
+"""
+import asyncio
+import os
+import re
+from datetime import timedelta
+from urllib.parse import parse_qsl
+
+from a2wsgi import WSGIMiddleware
+from werkzeug.datastructures import MultiDict
+
+import app as dashboard
+from async_client import AsyncEventbriteClient, DEFAULT_POOL_SIZE
+from async_sync import AsyncEventSync
+from instrumentation import end_trace, phase, start_trace
+
+RENDER_WORKERS = int(os.environ.get('ASGI_RENDER_WORKERS', 8))
+ASYNC_POOL_SIZE = int(os.environ.get('EVENTBRITE_ASYNC_POOL_SIZE', DEFAULT_POOL_SIZE))
+
+ATTENDEES_ROUTE = re.compile(r'^/api/event/([^/]+)/attendees$')
+WINDOW_ROUTES = ('/api/events', '/api/event-performance', '/api/event-performance/stream')
+FULL_SYNC_ROUTES = ('/api/insights', '/api/customers', '/api/forecast')
+WEEKLY_ROUTES = ('/api/weekly-sales', '/api/weekly-sales/range')
+
+
+def sync_window(path, args):
+    """
+    (start_from, start_before) a store-backed route syncs a cold store for
+
+    None for routes that don't sync first: the others, and the stream route
+    without a window, which streams its own cold sync. Raises ValueError on
+    malformed params, which Flask then answers with a 400.
+    """
+    if path in WINDOW_ROUTES:
+        window = dashboard.date_range_args(args)
+        if path.endswith('/stream') and window == (None, None):
+            return None
+        return window
+    if path in FULL_SYNC_ROUTES:
+        return None, None
+    if path in WEEKLY_ROUTES:
+        weeks = 1
+        if path.endswith('/range'):
+            weeks = min(max(int(args.get('weeks', dashboard.DEFAULT_REPORT_WEEKS)), 1),
+                        dashboard.MAX_REPORT_WEEKS)
+        week_start, week_end = dashboard.weeks_window(int(args.get('week_offset', 0)), weeks)
+        return week_start.isoformat(), (week_end + timedelta(days=1)).isoformat()
+    return None
+
+
+class AsyncDashboard:
+    """ASGI app that does a request's Eventbrite waiting on the event loop, then renders it with Flask"""
+
+    def __init__(self, flask_app, render_workers=RENDER_WORKERS, pool_size=ASYNC_POOL_SIZE):
+        self.render = WSGIMiddleware(flask_app, workers=render_workers)
+        self.pool_size = pool_size
+        self.client = None
+        self.event_sync = None
+        self._syncs = {}  # (org_id, start_from, start_before) -> task running that cold sync
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+            return
+        # The trace follows the request into Flask, which records it
+        trace_token = start_trace() if scope['type'] == 'http' and dashboard.request_metrics is not None else None
+        try:
+            if scope['type'] == 'http' and scope['method'] == 'GET' and self.client is not None:
+                args = MultiDict(parse_qsl(scope['query_string'].decode('latin-1'), keep_blank_values=True))
+                try:
+                    with phase('prefetch'):
+                        await self.prepare(scope['path'], args)
+                except Exception as e:
+                    # Flask makes the same calls and answers with the route's own error
+                    print(f"Async prefetch failed for {scope['path']}: {e}")
+            await self.render(scope, receive, send)
+        finally:
+            if trace_token is not None:
+                end_trace(trace_token)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                self.client = AsyncEventbriteClient.from_client(dashboard.eventbrite, pool_size=self.pool_size)
+                self.event_sync = AsyncEventSync(dashboard.event_sync, self.client)
+                dashboard.start_background()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                dashboard.prefetcher.stop()
+                await self.client.aclose()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def prepare(self, path, args):
+        """Make the Eventbrite calls the route would block on, so Flask finds their results"""
+        match = ATTENDEES_ROUTE.match(path)
+        if match:
+            await self.live_attendees(match.group(1))
+            return
+        if path == '/api/organizations':
+            await self.organizations()
+            return
+
+        try:
+            window = sync_window(path, args)
+        except ValueError:
+            return
+        if window is None and path not in WINDOW_ROUTES:
+            return
+
+        org_id = args.get('org_id')
+        if not org_id:
+            organizations = await self.organizations()
+            if not organizations:
+                return
+            org_id = organizations[0]['id']
+        if window is not None and dashboard.store.org_synced_at(org_id) is None:
+            await self.cold_sync(org_id, *window)
+
+    async def organizations(self):
+        """The organizations list, fetched into the cache the resolver reads"""
+        data = await self.client.get_json(
+            f"{self.client.base_url}/users/me/organizations/",
+            ttl=dashboard.ORGANIZATIONS_TTL
+        )
+        return data.get('organizations', []) if data else []
+
+    async def live_attendees(self, event_id):
+        """Fetch an unsynced event's attendee pages into the cache iter_attendees reads"""
+        event = dashboard.store.get_event(event_id)
+        if event and event['attendees_synced_at']:
+            return
+        async for _ in self.client.iter_paginated(
+            f"{dashboard.EVENTBRITE_API_BASE}/events/{event_id}/attendees/",
+            'attendees',
+            params={'status': 'attending'},
+            ttl=dashboard.LIVE_ATTENDEES_TTL
+        ):
+            pass
+
+    async def cold_sync(self, org_id, start_from, start_before):
+        """Run a cold store's first sync on the loop, shared by every request waiting on it"""
+        key = (org_id, start_from, start_before)
+        task = self._syncs.get(key)
+        if task is None:
+            task = self._syncs[key] = asyncio.ensure_future(
+                self.event_sync.ensure_synced(org_id, start_from, start_before)
+            )
+            task.add_done_callback(lambda _: self._syncs.pop(key, None))
+        # A disconnecting client doesn't cancel the sync the others await
+        await asyncio.shield(task)
+
+
+app = AsyncDashboard(dashboard.app)
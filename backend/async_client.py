@@ -0,0 +1,176 @@
+"""
+Async Eventbrite API client for the ASGI server
+
+The coroutine counterpart of EventbriteClient: an httpx.AsyncClient
+connection pool sharing the synchronous client's token, rate limiter and
+response cache. Entries use the same keys and CachedJSON values, so a page
+fetched here is a cache hit for the Flask routes, and calls waiting for a
+rate limit token or a response hold no thread.
+"""
+import asyncio
+import time
+
+import httpx
+
+from cache import make_key
+from eventbrite_client import CachedJSON, UpstreamFetchError, DEFAULT_TTL
+from instrumentation import record_backoff, record_upstream
+from rate_limiter import RateBudgetExhausted, parse_retry_after, PRIORITY_INTERACTIVE
+
+DEFAULT_POOL_SIZE = 64
+MAX_TOKEN_POLL = 1  # seconds between rate limiter checks while waiting for a token
+
+
+class AsyncEventbriteClient:
+    """Pooled, rate-limited async HTTP client for the Eventbrite API"""
+
+    def __init__(self, token, rate_limiter, cache=None, base_url=None, pool_size=DEFAULT_POOL_SIZE,
+                 timeout=None, max_wait=None):
+        self.token = token
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        self.base_url = base_url
+        self.max_wait = max_wait  # Max seconds an interactive call queues for a token
+        self._inflight = {}  # cache key -> asyncio.Future of the fetch in progress
+
+        connect_timeout, read_timeout = timeout or (None, None)
+        self.session = httpx.AsyncClient(
+            headers={'Authorization': f'Bearer {token}', 'Content-Type': 'application/json'},
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+        )
+
+    @classmethod
+    def from_client(cls, client, pool_size=DEFAULT_POOL_SIZE):
+        """An async client sharing an EventbriteClient's token, limiter, cache and timeouts"""
+        return cls(client.token, client.rate_limiter, cache=client.cache, base_url=client.base_url,
+                   pool_size=pool_size, timeout=client.timeout, max_wait=client.max_wait)
+
+    async def _acquire(self, priority):
+        """Wait for a rate limit token without blocking the event loop"""
+        max_wait = self.max_wait if priority == PRIORITY_INTERACTIVE else None
+        deadline = None if max_wait is None else time.monotonic() + max_wait
+        while True:
+            wait = self.rate_limiter.try_acquire(priority)
+            if wait <= 0:
+                return
+            if deadline is not None and time.monotonic() + wait > deadline:
+                raise RateBudgetExhausted(wait)
+            await asyncio.sleep(min(wait, MAX_TOKEN_POLL))
+
+    async def get(self, url, params=None, max_retries=3, priority=PRIORITY_INTERACTIVE, headers=None):
+        """GET with rate limit handling, returns the response or None after repeated 429s"""
+        for attempt in range(max_retries):
+            try:
+                started = time.perf_counter()
+                await self._acquire(priority)
+                requested = time.perf_counter()
+                record_backoff(requested - started)
+                try:
+                    response = await self.session.get(url, params=params, headers=headers)
+                except Exception:
+                    record_upstream(url, 'error', time.perf_counter() - requested)
+                    raise
+                record_upstream(url, response.status_code, time.perf_counter() - requested)
+
+                if response.status_code == 429:
+                    # Same shared pause the synchronous client honors
+                    wait_time = self.rate_limiter.on_rate_limited(
+                        parse_retry_after(response.headers.get('Retry-After'))
+                    )
+                    print(f"Rate limited, waiting {wait_time}s before retry...")
+                    continue
+
+                self.rate_limiter.on_success()
+                return response
+            except RateBudgetExhausted:
+                raise
+            except Exception:
+                if attempt == max_retries - 1:
+                    raise
+                await asyncio.sleep(1)
+                record_backoff(1)
+
+        return None
+
+    async def get_json(self, url, params=None, ttl=DEFAULT_TTL, priority=PRIORITY_INTERACTIVE,
+                       use_cache=True):
+        """
+        Fetch a JSON resource, through the shared cache when there is one, returns None on failure
+
+        A fresh entry is returned as is; a missing or expired one is fetched
+        (conditionally when it carried validators) and stored back. Concurrent
+        coroutines asking for the same key share one fetch.
+        """
+        if not use_cache or self.cache is None:
+            response = await self.get(url, params=params, priority=priority)
+            if not response or response.status_code != 200:
+                return None
+            return response.json()
+
+        key = make_key(url, params)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached.data
+
+        flight = self._inflight.get(key)
+        if flight is None:
+            flight = self._inflight[key] = asyncio.ensure_future(self._fetch(key, url, params, ttl, priority))
+            flight.add_done_callback(lambda _: self._inflight.pop(key, None))
+        cached = await asyncio.shield(flight)
+        return cached.data if cached is not None else None
+
+    async def _fetch(self, key, url, params, ttl, priority):
+        previous = self.cache.peek(key)
+        headers = previous.conditional_headers() if previous is not None else None
+        response = await self.get(url, params=params, priority=priority, headers=headers or None)
+        if response is not None and response.status_code == 304 and previous is not None:
+            fetched = previous
+        elif not response or response.status_code != 200:
+            return None
+        else:
+            fetched = CachedJSON(response.json(), response.headers.get('ETag'),
+                                 response.headers.get('Last-Modified'))
+        self.cache.set(key, fetched, ttl)
+        return fetched
+
+    async def iter_pages(self, url, params=None, ttl=DEFAULT_TTL, priority=PRIORITY_INTERACTIVE,
+                         use_cache=True, continuation=None):
+        """
+        Yield (page, next continuation) for every page of a paginated resource
+
+        Same pages and cache keys as EventbriteClient.iter_pages. Raises
+        UpstreamFetchError if any page fails.
+        """
+        while True:
+            page_params = dict(params or {})
+            if continuation:
+                page_params['continuation'] = continuation
+
+            data = await self.get_json(url, params=page_params, ttl=ttl, priority=priority,
+                                       use_cache=use_cache)
+            if data is None:
+                raise UpstreamFetchError(f"Failed to fetch {url}")
+
+            pagination = data.get('pagination', {})
+            continuation = pagination.get('continuation') if pagination.get('has_more_items', False) else None
+            yield data, continuation
+
+            if not continuation:
+                break
+
+    async def iter_paginated(self, url, key, params=None, ttl=DEFAULT_TTL, priority=PRIORITY_INTERACTIVE,
+                             use_cache=True):
+        """
+        Yield the items under key from every page of a paginated resource
+
+        Same pages and cache keys as EventbriteClient.iter_paginated. Raises
+        UpstreamFetchError if any page fails.
+        """
+        async for data, _ in self.iter_pages(url, params=params, ttl=ttl, priority=priority,
+                                             use_cache=use_cache):
+            for item in data.get(key, []):
+                yield item
+
+    async def aclose(self):
+        await self.session.aclose()
@@ -0,0 +1,151 @@
+"""
+Async store sync for the ASGI server
+
+The coroutine counterpart of EventSync.sync, sync_range and ensure_synced
+for a request on a cold store. The event list pages and every event's
+attendee pages are fetched through AsyncEventbriteClient on the event
+loop, up to workers events at a time, so a full history download holds no
+thread while it waits on Eventbrite. Only the store writes run in worker
+threads. The checkpoints, window bookkeeping and org lock are EventSync's
+own, so a run started here and one started by a thread (the prefetcher,
+a background resume) never overlap and pick up after each other. Window
+syncs take EventSync's window locks, so they don't wait for a full sync.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+
+from eventbrite_client import UpstreamFetchError
+from instrumentation import phase
+from rate_limiter import RateBudgetExhausted, PRIORITY_INTERACTIVE
+from sync import EVENT_LIST_PARAMS, range_params, utc_now
+
+LOCK_POLL = 0.05  # seconds between tries for a lock a thread holds
+
+
+class AsyncEventSync:
+    """Runs an EventSync's cold store syncs with async upstream calls"""
+
+    def __init__(self, event_sync, client, workers=None):
+        self.event_sync = event_sync
+        self.store = event_sync.store
+        self.client = client
+        self.workers = workers or event_sync.workers
+
+    @asynccontextmanager
+    async def _hold(self, lock):
+        """Hold one of EventSync's locks, waiting for it without blocking the loop"""
+        while not lock.acquire(blocking=False):
+            await asyncio.sleep(LOCK_POLL)
+        try:
+            yield
+        finally:
+            lock.release()
+
+    async def _map(self, fn, items):
+        """await fn(item) for every item, workers at a time, preserving order"""
+        semaphore = asyncio.Semaphore(self.workers)
+
+        async def run(item):
+            async with semaphore:
+                return await fn(item)
+
+        # Like map_concurrently, every call finishes before an error is raised
+        results = await asyncio.gather(*(run(item) for item in items), return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return results
+
+    async def ensure_synced(self, org_id, start_from=None, start_before=None):
+        """EventSync.ensure_synced, with the inline syncs made on the event loop"""
+        if await asyncio.to_thread(self.store.org_synced_at, org_id) is None:
+            if start_from is not None:
+                if not self.event_sync.range_is_fresh(org_id, start_from, start_before):
+                    await self.sync_range(org_id, start_from, start_before)
+                self.event_sync.sync_in_background(org_id)
+            else:
+                await self.sync(org_id)
+        elif not await asyncio.to_thread(self.event_sync.is_fresh, org_id):
+            self.event_sync.sync_in_background(org_id)
+
+    async def sync(self, org_id, priority=PRIORITY_INTERACTIVE):
+        """EventSync.sync: the same checkpointed run, returns the events whose attendees failed"""
+        async with self._hold(self.event_sync.org_lock(org_id)):
+            checkpoint = await asyncio.to_thread(self.event_sync.start_run, org_id)
+            if checkpoint is None:
+                return 0
+            started = checkpoint['started_at']
+
+            try:
+                if not checkpoint['list_complete']:
+                    with phase('event_list'):
+                        await self._refresh_event_list(org_id, priority, started, checkpoint['continuation'])
+                pending = await asyncio.to_thread(self.event_sync.pending_attendee_syncs, org_id, started)
+                with phase('attendees'):
+                    results = await self._map(lambda event: self.sync_event_attendees(event, priority), pending)
+            except RateBudgetExhausted:
+                self.event_sync.sync_in_background(org_id)
+                raise
+
+            return await asyncio.to_thread(self.event_sync.finish_run, org_id, started, results)
+
+    async def _refresh_event_list(self, org_id, priority, started, continuation):
+        pages = self.client.iter_pages(
+            f"{self.client.base_url}/organizations/{org_id}/events/",
+            params=EVENT_LIST_PARAMS,
+            priority=priority,
+            use_cache=False,
+            continuation=continuation
+        )
+        try:
+            async for data, next_continuation in pages:
+                await asyncio.to_thread(self.event_sync.store_event_page, org_id, data, started, next_continuation)
+                continuation = None  # The checkpointed token worked
+        except UpstreamFetchError:
+            await asyncio.to_thread(self.event_sync.event_list_failed, org_id, started, continuation)
+            raise
+
+    async def sync_range(self, org_id, start_from, start_before=None, priority=PRIORITY_INTERACTIVE):
+        """EventSync.sync_range: just a window's events and their attendees"""
+        async with self._hold(self.event_sync.window_lock(org_id, start_from, start_before)):
+            synced_at = await asyncio.to_thread(self.store.org_synced_at, org_id)
+            if synced_at is not None or self.event_sync.range_is_fresh(org_id, start_from, start_before):
+                return 0  # A full sync or another request for the window finished while we waited
+
+            events = []
+            with phase('event_list'):
+                async for event in self.client.iter_paginated(
+                    f"{self.client.base_url}/organizations/{org_id}/events/",
+                    'events',
+                    params=range_params(start_from, start_before),
+                    priority=priority,
+                    use_cache=False
+                ):
+                    # Checked here too, in case upstream ignores the range
+                    start_local = event['start']['local']
+                    if start_local < start_from:
+                        break
+                    if start_before is None or start_local < start_before:
+                        events.append(event)
+                await asyncio.to_thread(self.store.upsert_events, org_id, events)
+
+            pending = await asyncio.to_thread(self.event_sync.pending_range_syncs, org_id, start_from, start_before)
+            with phase('attendees'):
+                results = await self._map(lambda event: self.sync_event_attendees(event, priority), pending)
+            return self.event_sync.finish_range(org_id, start_from, start_before, results)
+
+    async def sync_event_attendees(self, event, priority=PRIORITY_INTERACTIVE):
+        """Fetch one event's attendees on the loop as compact rows, then write them from a thread"""
+        started = utc_now()
+        url, params = self.event_sync.attendee_request(event)
+        attendees = self.event_sync.attendee_rows(event)
+        try:
+            async for attendee in self.client.iter_paginated(
+                url, 'attendees', params=params, priority=priority, use_cache=False
+            ):
+                attendees.add(attendee)
+        except UpstreamFetchError as e:
+            print(f"Attendee sync failed for event {event['id']}: {e}")
+            return False
+        await asyncio.to_thread(self.event_sync.store_attendees, event, attendees, started)
+        return True
@@ -0,0 +1,244 @@
+"""
+Benchmark: every backend route end to end against the stub Eventbrite API
+
+For each synthetic org size, starts stub_eventbrite.py (recorded payload
+shapes, optional latency and 429s) in its own process and measures each
+route through the Flask app in a fresh process:
+
+- cold store: the first visit on an empty store, which syncs from Eventbrite
+  (/api/insights downloads the full history, /api/weekly-sales only its week)
+- warm store: a fresh process on the synced store, so in-memory caches and
+  rollups start empty (cold), then repeat requests (warm)
+
+Each row reports latency, upstream calls to the stub, response size and how
+much the request raised the process's peak memory (RSS). Results can be
+saved as JSON and compared between runs, so regressions show up as numbers.
+Background syncs a request would start are left out, so counts are exactly
+what the request itself waited on.
+
+Usage (from backend/):
+    python benchmarks/backend_benchmark.py [--sizes 200,2000,20000] [--per-event 20]
+        [--latency 0] [--throttle-every 0] [--repeats 5] [--json results.json]
+"""
+import argparse
+import json
+import os
+import resource
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import requests
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+BACKEND = os.path.dirname(BENCHMARKS)
+sys.path.insert(0, BENCHMARKS)
+
+from stub_eventbrite import ORG_ID  # noqa: E402
+
+# Called the way the dashboard calls them, with the org's id
+COLD_STORE_ROUTES = ['/api/insights?org_id={org_id}', '/api/weekly-sales?org_id={org_id}']
+ROUTES = [
+    '/api/organizations',
+    '/api/events?org_id={org_id}',
+    '/api/events?org_id={org_id}&start_date=2026-01-01&end_date=2026-03-31',
+    '/api/event/{event_id}/attendees',
+    '/api/event-performance?org_id={org_id}',
+    '/api/event-performance/stream?org_id={org_id}',
+    '/api/insights?org_id={org_id}',
+    '/api/customers?org_id={org_id}',
+    '/api/customers?org_id={org_id}&sort=total_events&email=fan1',
+    '/api/forecast?org_id={org_id}&all_events=true',
+    '/api/weekly-sales?org_id={org_id}',
+    '/api/weekly-sales/range?org_id={org_id}&weeks=13',
+    '/api/sync-status?org_id={org_id}',
+]
+
+
+class PeakRss:
+    """
+    Peak resident memory while the block runs, in MB above where it started
+
+    Samples /proc/self/statm from a thread; elsewhere falls back to the rise
+    of the process's lifetime peak, which misses peaks below an earlier one.
+    """
+    INTERVAL = 0.002  # seconds between samples
+
+    def __init__(self):
+        self.peak_mb = 0.0
+        self._done = threading.Event()
+
+    @staticmethod
+    def current_mb():
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+
+    @staticmethod
+    def lifetime_peak_mb():
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+    def _sample(self, start):
+        while not self._done.wait(self.INTERVAL):
+            self.peak_mb = max(self.peak_mb, self.current_mb() - start)
+
+    def __enter__(self):
+        if os.path.exists('/proc/self/statm'):
+            self._thread = threading.Thread(target=self._sample, args=(self.current_mb(),), daemon=True)
+        else:
+            self._thread = None
+            self._start = self.lifetime_peak_mb()
+        if self._thread is not None:
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._done.set()
+        if self._thread is not None:
+            self._thread.join()
+        else:
+            self.peak_mb = self.lifetime_peak_mb() - self._start
+
+
+def stub_calls(api_base):
+    stats = requests.get(api_base.rsplit('/v3', 1)[0] + '/__stats', timeout=10).json()
+    return stats['total']
+
+
+def run_route(route, repeats):
+    """Worker: time one route cold, then warm, against EVENT_STORE_PATH"""
+    sys.path.insert(0, BACKEND)
+    import app as dashboard
+
+    # Only what the request waits on is measured
+    dashboard.event_sync.sync_in_background = lambda *args, **kwargs: None
+    api_base = os.environ['EVENTBRITE_API_BASE']
+    client = dashboard.app.test_client()
+    event_id = None
+    if '{event_id}' in route:
+        completed = [event for event in dashboard.store.get_events(ORG_ID) if event['status'] == 'completed']
+        event_id = completed[0]['id']
+    route = route.format(org_id=ORG_ID, event_id=event_id)
+
+    calls = stub_calls(api_base)
+    with PeakRss() as memory:
+        started = time.perf_counter()
+        response = client.get(route)
+        body = response.get_data()
+        cold_ms = (time.perf_counter() - started) * 1000
+    cold_calls = stub_calls(api_base) - calls
+
+    timings = []
+    calls = stub_calls(api_base)
+    for _ in range(repeats):
+        started = time.perf_counter()
+        client.get(route).get_data()
+        timings.append((time.perf_counter() - started) * 1000)
+    return {
+        'route': route,
+        'status': response.status_code,
+        'bytes': len(body),
+        'cold_ms': cold_ms,
+        'cold_calls': cold_calls,
+        'peak_mb': memory.peak_mb,
+        'warm_ms': statistics.median(timings) if timings else None,
+        'warm_calls': stub_calls(api_base) - calls
+    }
+
+
+def worker(route, db_path, api_base, repeats):
+    env = dict(
+        os.environ,
+        EVENTBRITE_API_BASE=api_base,
+        EVENT_STORE_PATH=db_path,
+        EVENTBRITE_TOKEN='benchmark',
+        EVENTBRITE_RATE_LIMIT=str(10 ** 9),  # The stub's 429s are the only limit
+        SYNC_INTERVAL=str(10 ** 9)  # A synced store stays fresh for the whole run
+    )
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--worker', route, '--repeats', str(repeats)],
+        env=env, cwd=BACKEND, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{route} failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def copy_store(source, target):
+    """Consistent copy of a WAL-mode SQLite store"""
+    with sqlite3.connect(source) as src, sqlite3.connect(target) as dst:
+        src.backup(dst)
+
+
+def start_stub(args, size):
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(BENCHMARKS, 'stub_eventbrite.py'), '--events', str(size),
+         '--per-event', str(args.per_event), '--latency', str(args.latency),
+         '--throttle-every', str(args.throttle_every)],
+        stdout=subprocess.PIPE, text=True
+    )
+    return process, process.stdout.readline().strip()
+
+
+def print_row(label, row):
+    warm = f"{row['warm_ms']:>9.1f}" if row['warm_ms'] is not None else f"{'-':>9}"
+    print(f"{label:<72} {row['status']:>4} {row['cold_ms']:>10.1f} {row['cold_calls']:>7} "
+          f"{row['peak_mb']:>8.1f} {warm} {row['warm_calls']:>6} {row['bytes'] / 1024:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', default='200,2000,20000')
+    parser.add_argument('--per-event', type=int, default=20)
+    parser.add_argument('--latency', type=float, default=0.0, help='stub seconds per response')
+    parser.add_argument('--throttle-every', type=int, default=0, help='stub 429 on every Nth request')
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--routes', help='comma-separated subset of the warm store routes')
+    parser.add_argument('--json', help='write the results here')
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_route(args.worker, args.repeats)))
+        return
+
+    routes = args.routes.split(',') if args.routes else ROUTES
+    results = []
+    for size in [int(size) for size in args.sizes.split(',')]:
+        stub, api_base = start_stub(args, size)
+        workdir = tempfile.mkdtemp()
+        try:
+            print(f"\n{size} events, ~{args.per_event} attendees each, stub latency {args.latency}s")
+            print(f"{'route':<72} {'code':>4} {'cold ms':>10} {'calls':>7} {'peak MB':>8} "
+                  f"{'warm ms':>9} {'calls':>6} {'KB':>9}")
+
+            synced = os.path.join(workdir, 'synced.db')
+            for route in COLD_STORE_ROUTES:
+                db_path = synced if route.startswith('/api/insights') else os.path.join(workdir, 'window.db')
+                row = worker(route, db_path, api_base, args.repeats)
+                print_row(f"cold store {row['route']}", row)
+                results.append(dict(row, size=size, store='cold'))
+
+            for number, route in enumerate(routes):
+                db_path = os.path.join(workdir, f"route{number}.db")
+                copy_store(synced, db_path)
+                row = worker(route, db_path, api_base, args.repeats)
+                print_row(row['route'], row)
+                results.append(dict(row, size=size, store='warm'))
+        finally:
+            stub.terminate()
+            stub.wait()
+            shutil.rmtree(workdir)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
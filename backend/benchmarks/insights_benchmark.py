@@ -0,0 +1,137 @@
+"""
+Benchmark: /api/insights aggregation on synthetic orgs
+
+Fills a throwaway EventStore with a synthetic org (repeating event names,
+a customer base that buys across many events) and times the three stages
+behind /api/insights: building the aggregator from the store (columnar,
+as the app does, with the per-event summary build for comparison), producing
+the response dict, and serializing it to JSON, plus the first page of
+/api/customers (which builds its sort index). Peak memory (store read,
+aggregator and response dict) and the memory the built aggregator holds
+on to are measured with tracemalloc in a separate pass. Sizes scale up to a 5k-event / 500k-attendee org.
+
+Usage (from backend/):
+    python benchmarks/insights_benchmark.py [--sizes 500,1000,5000] [--per-event 100]
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analytics import AttendeeColumns  # noqa: E402
+from insights import InsightsAggregator  # noqa: E402
+from store import EventStore  # noqa: E402
+
+ORG_ID = 'bench-org'
+EVENT_NAMES = 200  # Distinct event names, so most names repeat
+TICKET_TYPES = ['General Admission', 'VIP', 'Early Bird', 'Student']
+
+
+def populate(store, num_events, per_event, seed=1):
+    rng = random.Random(seed)
+    customers = max(per_event * num_events // 5, 1)  # Average customer attends ~5 events
+    start = datetime(2020, 1, 1, 19, 0)
+    events = []
+    for i in range(num_events):
+        local = (start + timedelta(hours=7 * i)).strftime('%Y-%m-%dT%H:%M:%S')
+        events.append({
+            'id': str(100000 + i),
+            'name': {'text': f'Show {i % EVENT_NAMES}'},
+            'start': {'local': local, 'utc': local + 'Z'},
+            'end': {'local': local, 'utc': local + 'Z'},
+            'status': 'completed',
+            'capacity': per_event * 2
+        })
+    store.upsert_events(ORG_ID, events)
+
+    attendee_id = 0
+    for event in events:
+        attendees = []
+        for _ in range(per_event):
+            attendee_id += 1
+            ticket_type = rng.choice(TICKET_TYPES)
+            attendees.append({
+                'id': str(attendee_id),
+                'ticket_class_name': ticket_type,
+                'profile': {'email': f'fan{rng.randrange(customers)}@example.com'},
+                'costs': {'gross': {'value': 1500 if ticket_type != 'VIP' else 4500}},
+                'checked_in': rng.random() < 0.8,
+                'status': 'Attending'
+            })
+        store.replace_attendees(event['id'], attendees)
+        store.mark_attendees_synced(event['id'], '2026-01-01T00:00:00Z', True)
+
+
+def build(store):
+    events = store.get_events(ORG_ID)
+    return InsightsAggregator.from_columns(events, AttendeeColumns.from_store(store, ORG_ID, events))
+
+
+def measure(store):
+    summaries_started = time.perf_counter()
+    InsightsAggregator.from_store(store.get_events(ORG_ID), store.event_summaries(ORG_ID))
+    summaries_built = time.perf_counter()
+
+    started = time.perf_counter()
+    aggregator = build(store)
+    built = time.perf_counter()
+    response = aggregator.to_response()
+    responded = time.perf_counter()
+    body = json.dumps(response)
+    serialized = time.perf_counter()
+    aggregator.customers_page()
+    paged = time.perf_counter()
+
+    # Separate pass for memory, tracemalloc slows everything it traces
+    del aggregator, response
+    tracemalloc.start()
+    aggregator = build(store)
+    held, _ = tracemalloc.get_traced_memory()
+    aggregator.to_response()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        'summaries_build': summaries_built - summaries_started,
+        'build': built - started,
+        'response': responded - built,
+        'json': serialized - responded,
+        'customers': paged - serialized,
+        'peak_mb': peak / (1024 * 1024),
+        'held_mb': held / (1024 * 1024),
+        'body_mb': len(body) / (1024 * 1024)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', default='500,1000,5000',
+                        help='comma separated event counts')
+    parser.add_argument('--per-event', type=int, default=100)
+    args = parser.parse_args()
+
+    print(f"{'events':>7} {'attendees':>10} {'summaries':>10} {'build':>9} {'response':>9} {'json':>9} {'customers':>10} "
+          f"{'peak MB':>9} {'held MB':>9} {'body MB':>9}")
+    for num_events in (int(size) for size in args.sizes.split(',')):
+        workdir = tempfile.mkdtemp()
+        try:
+            store = EventStore(os.path.join(workdir, 'bench.db'))
+            populate(store, num_events, args.per_event)
+            result = measure(store)
+        finally:
+            shutil.rmtree(workdir)
+        print(f"{num_events:>7} {num_events * args.per_event:>10} {result['summaries_build'] * 1000:>8.0f}ms "
+              f"{result['build'] * 1000:>7.0f}ms {result['response'] * 1000:>7.0f}ms "
+              f"{result['json'] * 1000:>7.0f}ms {result['customers'] * 1000:>8.0f}ms {result['peak_mb']:>9.1f} "
+              f"{result['held_mb']:>9.1f} {result['body_mb']:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
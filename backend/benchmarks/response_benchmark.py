@@ -0,0 +1,93 @@
+"""
+Benchmark: JSON response pipeline on a synthetic large org
+
+Builds the /api/insights payload and a full /api/customers page for a
+synthetic org (see insights_benchmark.populate), then compares Flask's
+jsonify (before) with the FAST_RESPONSES pipeline (after): serialize time,
+compression time and wire size per encoding, and the cost of a repeat hit
+served from the cached bytes.
+
+Usage (from backend/):
+    python benchmarks/response_benchmark.py [--events 5000] [--per-event 100]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from flask import Flask, jsonify
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from insights import MAX_CUSTOMERS_PAGE  # noqa: E402
+from insights_benchmark import build, populate  # noqa: E402
+from responses import EncodedBodies, compress, dumps  # noqa: E402
+from store import EventStore  # noqa: E402
+
+REPEATS = 5
+
+
+def best_of(fn):
+    """Fastest of REPEATS runs, in seconds, and the last result"""
+    best = None
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def measure(app, payload):
+    rows = []
+    with app.app_context():
+        seconds, body = best_of(lambda: jsonify(payload).get_data())
+    rows.append(('jsonify', 'identity', seconds, len(body)))
+
+    seconds, body = best_of(lambda: dumps(payload))
+    rows.append(('fast', 'identity', seconds, len(body)))
+    for encoding in EncodedBodies().encodings:
+        seconds, compressed = best_of(lambda: compress(body, encoding))
+        rows.append(('fast', encoding, seconds, len(compressed)))
+
+    bodies = EncodedBodies()
+    encoding = bodies.encodings[0]
+    bodies.get('bench', encoding, lambda: payload)
+    seconds, _ = best_of(lambda: bodies.get('bench', encoding, lambda: payload))
+    rows.append(('fast repeat hit', encoding, seconds, None))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--events', type=int, default=5000)
+    parser.add_argument('--per-event', type=int, default=100)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    try:
+        store = EventStore(os.path.join(workdir, 'bench.db'))
+        populate(store, args.events, args.per_event)
+        aggregator = build(store)
+        payloads = {
+            '/api/insights': aggregator.to_response(),
+            f'/api/customers (limit {MAX_CUSTOMERS_PAGE})': aggregator.customers_page(limit=MAX_CUSTOMERS_PAGE)
+        }
+    finally:
+        shutil.rmtree(workdir)
+
+    app = Flask(__name__)
+    print(f"{args.events} events, {args.events * args.per_event} attendees, best of {REPEATS}")
+    for name, payload in payloads.items():
+        print(f"\n{name}")
+        print(f"{'pipeline':>16} {'encoding':>9} {'time':>10} {'wire KB':>9}")
+        for pipeline, encoding, seconds, size in measure(app, payload):
+            wire = f"{size / 1024:>9.1f}" if size is not None else f"{'-':>9}"
+            print(f"{pipeline:>16} {encoding:>9} {seconds * 1000:>8.3f}ms {wire}")
+
+
+if __name__ == '__main__':
+    main()
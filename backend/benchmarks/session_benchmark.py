@@ -0,0 +1,100 @@
+"""
+Microbenchmark: bare requests.get vs the pooled EventbriteClient session
+
+Serves a canned attendees page from a local keep-alive stub server and
+times sequential GETs both ways. Runs over plain HTTP on localhost, so it
+only shows connection setup and request overhead; against
+www.eventbriteapi.com the pooled client also skips a TLS handshake per call.
+
+Usage (from backend/):
+    python benchmarks/session_benchmark.py [--requests 500]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from eventbrite_client import EventbriteClient  # noqa: E402
+from rate_limiter import RateLimiter  # noqa: E402
+
+PAGE = json.dumps({
+    'attendees': [
+        {
+            'id': str(i),
+            'profile': {'email': f'fan{i}@example.com'},
+            'ticket_class_name': 'General Admission',
+            'costs': {'gross': {'value': 1500}},
+            'checked_in': False
+        }
+        for i in range(50)
+    ],
+    'pagination': {'has_more_items': False}
+}).encode()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Needed for keep-alive
+    disable_nagle_algorithm = True  # Avoid delayed-ACK stalls on reused connections
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(PAGE)))
+        self.end_headers()
+        self.wfile.write(PAGE)
+
+    def log_message(self, *args):
+        pass
+
+
+def time_calls(get, url, count):
+    timings = []
+    for _ in range(count):
+        start = time.perf_counter()
+        response = get(url)
+        response.content
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def summarize(label, timings):
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(f"{label:<22} mean {statistics.mean(timings):6.3f} ms   "
+          f"p50 {statistics.median(timings):6.3f} ms   p95 {p95:6.3f} ms")
+    return statistics.mean(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--requests', type=int, default=500)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f'http://127.0.0.1:{server.server_port}/v3/events/1/attendees/'
+
+    client = EventbriteClient('token', RateLimiter(capacity=10 ** 9, window=1))
+
+    # Warm up both paths
+    time_calls(requests.get, url, 10)
+    time_calls(client.get, url, 10)
+
+    bare = summarize('requests.get', time_calls(requests.get, url, args.requests))
+    pooled = summarize('EventbriteClient', time_calls(client.get, url, args.requests))
+    print(f"Saved {bare - pooled:.3f} ms per request ({(1 - pooled / bare) * 100:.0f}%)")
+
+    client.close()
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
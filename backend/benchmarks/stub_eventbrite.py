@@ -0,0 +1,326 @@
+"""
+Local stub of the Eventbrite API, replaying recorded responses at any org size
+
+Responses are built from the recorded objects in fixtures/ (an event, an
+attendee, an order and the organizations list), so payload shapes and sizes
+match the real API. One org of num_events events is synthesized around
+now: past shows completed, upcoming ones live, a few drafts, repeating show
+names and a customer base that comes back. Attendees are generated per
+event on request (the same every time), so a 20k-event org costs no memory
+up front.
+
+Supports the endpoints the backend calls, with Eventbrite's continuation
+pagination, start_date ranges, order_by and changed_since, plus optional
+per-request latency and injected 429s with Retry-After. GET /__stats
+returns call counts by endpoint; POST /__orders?event_id= sells a ticket.
+
+Usage (from backend/):
+    python benchmarks/stub_eventbrite.py [--events 2000] [--per-event 20] [--latency 0.05]
+                                         [--throttle-every 0] [--port 0]
+"""
+import argparse
+import copy
+import json
+import os
+import random
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+ORG_ID = '2000000001'
+FIRST_EVENT_ID = 3000000001
+FIRST_ORDER_ID = 4000000001
+FIRST_ATTENDEE_ID = 5000000001
+IDS_PER_EVENT = 100000  # Order and attendee ids are FIRST_*_ID + event index * this + n
+PAGE_SIZE = 50  # Eventbrite's page size
+HISTORY_DAYS = 3 * 365  # Span the synthetic events are spread over
+DRAFT_EVERY = 97  # Every so many upcoming events is a draft
+UTC_OFFSET = timedelta(hours=-8)  # Local time of the recorded event's venue
+TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+LOCAL_FORMAT = '%Y-%m-%dT%H:%M:%S'
+RECORDED_CHANGED = '2026-01-01T00:00:00Z'  # 'changed' of generated attendees
+
+SHOW_NAMES = [
+    'Nova Comedy Night', 'The Late Show', 'Open Mic Mayhem', 'Improv Jam', 'Headliner Series',
+    'Sketch Lab', 'Roast Battle', 'Storytelling Hour', 'Comedy Brunch', 'New Faces Showcase'
+]
+TICKET_CLASSES = [  # (name, gross cents, weight)
+    ('General Admission', 1676, 70),
+    ('VIP', 4512, 10),
+    ('Early Bird', 1118, 15),
+    ('Comp', 0, 5)
+]
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES, name)) as f:
+        return json.load(f)
+
+
+class StubEventbrite:
+    """One synthetic org served with the recorded payload shapes"""
+
+    def __init__(self, num_events=200, per_event=20, past_share=0.8, latency=0.0, jitter=0.0,
+                 throttle_every=0, retry_after=1, seed=1):
+        self.per_event = per_event
+        self.latency = latency
+        self.jitter = jitter
+        self.throttle_every = throttle_every
+        self.retry_after = retry_after
+        self.seed = seed
+        self.calls = Counter()  # endpoint -> requests served (429s included)
+        self.throttled = 0
+        self._lock = threading.Lock()
+        self._rng = random.Random(seed)
+        self._event_template = load_fixture('event.json')
+        self._attendee_template = load_fixture('attendee.json')
+        self._order_template = load_fixture('order.json')
+        self._organizations = load_fixture('organizations.json')
+        self._sold = {}  # event_id -> attendees sold through place_order
+        self._orders = {}  # order_id -> order sold through place_order
+        self._next_sale = num_events * IDS_PER_EVENT
+        self.customers = max(num_events * per_event // 4, 1)  # Average customer comes ~4 times
+
+        now = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+        spacing = timedelta(days=HISTORY_DAYS) / max(num_events, 1)
+        first = now - spacing * int(num_events * past_share)
+        self.events = [self._event(i, first + spacing * i, now) for i in range(num_events)]
+        self._index = {event['id']: i for i, event in enumerate(self.events)}
+
+    def _event(self, i, start_utc, now):
+        event = copy.deepcopy(self._event_template)
+        event_id = str(FIRST_EVENT_ID + i)
+        name = SHOW_NAMES[i % len(SHOW_NAMES)]
+        end_utc = start_utc + timedelta(hours=2)
+        past = end_utc < now
+        event.update({
+            'id': event_id,
+            'organization_id': ORG_ID,
+            'url': f"https://www.eventbrite.com/e/{name.lower().replace(' ', '-')}-tickets-{event_id}",
+            'resource_uri': f"https://www.eventbriteapi.com/v3/events/{event_id}/",
+            'status': 'completed' if past else 'draft' if i % DRAFT_EVERY == 0 else 'live',
+            'capacity': self.per_event * 2
+        })
+        event['name'] = {'text': name, 'html': name}
+        event['start'] = dict(event['start'], local=(start_utc + UTC_OFFSET).strftime(LOCAL_FORMAT),
+                              utc=start_utc.strftime(TIMESTAMP_FORMAT))
+        event['end'] = dict(event['end'], local=(end_utc + UTC_OFFSET).strftime(LOCAL_FORMAT),
+                            utc=end_utc.strftime(TIMESTAMP_FORMAT))
+        return event
+
+    # Generated data
+
+    def attendees(self, event_id):
+        """Every attendee of an event, generated from its index (plus tickets sold since)"""
+        i = self._index.get(event_id)
+        if i is None:
+            return []
+        event = self.events[i]
+        if event['status'] == 'draft':
+            return list(self._sold.get(event_id, []))
+        rng = random.Random(self.seed * 1000003 + i)
+        count = rng.randint(self.per_event // 2, self.per_event * 3 // 2)
+        past = event['status'] == 'completed'
+        names = [ticket[0] for ticket in TICKET_CLASSES]
+        weights = [ticket[2] for ticket in TICKET_CLASSES]
+        attendees = []
+        for n in range(count):
+            ticket = names.index(rng.choices(names, weights)[0])
+            customer = rng.randrange(self.customers)
+            attendees.append(self._attendee(
+                event_id, FIRST_ATTENDEE_ID + i * IDS_PER_EVENT + n, FIRST_ORDER_ID + i * IDS_PER_EVENT + n,
+                ticket, customer, checked_in=past and rng.random() < 0.8, changed=RECORDED_CHANGED
+            ))
+        return attendees + self._sold.get(event_id, [])
+
+    def _attendee(self, event_id, attendee_id, order_id, ticket, customer, checked_in, changed):
+        # Shallow copies, the nested objects that differ are replaced below
+        attendee = dict(self._attendee_template)
+        name, gross, _ = TICKET_CLASSES[ticket]
+        attendee.update({
+            'id': str(attendee_id),
+            'event_id': event_id,
+            'order_id': str(order_id),
+            'resource_uri': f"https://www.eventbriteapi.com/v3/events/{event_id}/attendees/{attendee_id}/",
+            'ticket_class_name': name,
+            'ticket_class_id': f"19{event_id}{ticket}",
+            'checked_in': checked_in,
+            'status': 'Checked In' if checked_in else 'Attending',
+            'changed': changed
+        })
+        attendee['costs'] = dict(attendee['costs'], gross=dict(
+            attendee['costs']['gross'], value=gross, display=f"${gross / 100:.2f}", major_value=f"{gross / 100:.2f}"
+        ))
+        attendee['profile'] = dict(attendee['profile'], email=f"fan{customer}@example.com",
+                                   first_name='Fan', last_name=str(customer), name=f"Fan {customer}")
+        return attendee
+
+    def place_order(self, event_id):
+        """Sell one ticket to a random customer now, returns the order id"""
+        with self._lock:
+            sale = self._next_sale
+            self._next_sale += 1
+            order_id = str(FIRST_ORDER_ID + sale)
+            attendee = self._attendee(
+                event_id, FIRST_ATTENDEE_ID + sale, order_id, 0, self._rng.randrange(self.customers),
+                checked_in=False, changed=datetime.now(timezone.utc).strftime(TIMESTAMP_FORMAT)
+            )
+            self._sold.setdefault(event_id, []).append(attendee)
+            self._orders[order_id] = dict(self._order_template, id=order_id, event_id=event_id,
+                                          resource_uri=f"https://www.eventbriteapi.com/v3/orders/{order_id}/")
+            return order_id
+
+    def order(self, order_id):
+        if order_id in self._orders:
+            return self._orders[order_id]
+        i, _ = divmod(int(order_id) - FIRST_ORDER_ID, IDS_PER_EVENT)
+        if not 0 <= i < len(self.events):
+            return None
+        return dict(self._order_template, id=order_id, event_id=self.events[i]['id'],
+                    resource_uri=f"https://www.eventbriteapi.com/v3/orders/{order_id}/")
+
+    # Request handling
+
+    @staticmethod
+    def page(key, items, query):
+        """One page of items, continuation being the page number"""
+        number = int(query.get('continuation', ['0'])[0] or 0)
+        more = (number + 1) * PAGE_SIZE < len(items)
+        return {
+            key: items[number * PAGE_SIZE:(number + 1) * PAGE_SIZE],
+            'pagination': {
+                'object_count': len(items),
+                'page_number': number + 1,
+                'page_size': PAGE_SIZE,
+                'page_count': max(1, -(-len(items) // PAGE_SIZE)),
+                'has_more_items': more,
+                'continuation': str(number + 1) if more else None
+            }
+        }
+
+    def respond(self, path, query):
+        """(status, body, endpoint) for a GET on an API path like /v3/events/1/"""
+        parts = [part for part in path.split('/') if part][1:]  # Drop 'v3'
+        if parts == ['users', 'me', 'organizations']:
+            return 200, self._organizations, 'organizations'
+        if len(parts) == 3 and parts[0] == 'organizations' and parts[2] == 'events':
+            if parts[1] != ORG_ID:
+                return 404, {'error': 'NOT_FOUND'}, 'events'
+            events = self.events
+            range_start = query.get('start_date.range_start', [None])[0]
+            range_end = query.get('start_date.range_end', [None])[0]
+            if range_start or range_end:
+                events = [
+                    event for event in events
+                    if (not range_start or event['start']['local'] >= range_start)
+                    and (not range_end or event['start']['local'] < range_end)
+                ]
+            if query.get('order_by', ['start_asc'])[0] == 'start_desc':
+                events = events[::-1]
+            return 200, self.page('events', events, query), 'events'
+        if len(parts) == 2 and parts[0] == 'events':
+            i = self._index.get(parts[1])
+            return (200, self.events[i], 'event') if i is not None else (404, {'error': 'NOT_FOUND'}, 'event')
+        if len(parts) in (3, 4) and parts[0] == 'events' and parts[2] == 'attendees':
+            attendees = self.attendees(parts[1])
+            if 'changed_since' in query:
+                attendees = [a for a in attendees if a['changed'] >= query['changed_since'][0]]
+            if len(parts) == 4:
+                match = [a for a in attendees if a['id'] == parts[3]]
+                return (200, match[0], 'attendee') if match else (404, {'error': 'NOT_FOUND'}, 'attendee')
+            return 200, self.page('attendees', attendees, query), 'attendees'
+        if len(parts) == 2 and parts[0] == 'orders':
+            order = self.order(parts[1])
+            return (200, order, 'order') if order else (404, {'error': 'NOT_FOUND'}, 'order')
+        return 404, {'error': 'NOT_FOUND'}, 'unknown'
+
+    def stats(self):
+        with self._lock:
+            return {'calls': dict(self.calls), 'total': sum(self.calls.values()), 'throttled': self.throttled}
+
+    def serve(self, port=0):
+        """Start serving on a daemon thread, returns the server"""
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # Needed for keep-alive
+            disable_nagle_algorithm = True  # Avoid delayed-ACK stalls on reused connections
+
+            def send_json(self, status, body, headers=()):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                for name, value in headers:
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                if url.path == '/__stats':
+                    self.send_json(200, stub.stats())
+                    return
+                if stub.latency or stub.jitter:
+                    time.sleep(stub.latency + random.random() * stub.jitter)
+                status, body, endpoint = stub.respond(url.path, parse_qs(url.query))
+                with stub._lock:
+                    stub.calls[endpoint] += 1
+                    total = sum(stub.calls.values())
+                    throttle = stub.throttle_every and total % stub.throttle_every == 0
+                    if throttle:
+                        stub.throttled += 1
+                if throttle:
+                    self.send_json(429, {'error': 'HIT_RATE_LIMIT'}, [('Retry-After', str(stub.retry_after))])
+                else:
+                    self.send_json(status, body)
+
+            def do_POST(self):
+                url = urlparse(self.path)
+                event_id = parse_qs(url.query).get('event_id', [None])[0]
+                if url.path != '/__orders' or event_id not in stub._index:
+                    self.send_json(404, {'error': 'NOT_FOUND'})
+                    return
+                self.send_json(200, {'order_id': stub.place_order(event_id)})
+
+            def log_message(self, *args):
+                pass
+
+        class Server(ThreadingHTTPServer):
+            daemon_threads = True
+            request_queue_size = 128
+
+        server = Server(('127.0.0.1', port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--events', type=int, default=2000)
+    parser.add_argument('--per-event', type=int, default=20)
+    parser.add_argument('--past-share', type=float, default=0.8)
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='up to this many more seconds, at random')
+    parser.add_argument('--throttle-every', type=int, default=0, help='answer every Nth request with a 429')
+    parser.add_argument('--retry-after', type=int, default=1)
+    parser.add_argument('--port', type=int, default=0)
+    args = parser.parse_args()
+
+    stub = StubEventbrite(args.events, args.per_event, args.past_share, args.latency, args.jitter,
+                          args.throttle_every, args.retry_after)
+    server = stub.serve(args.port)
+    print(f"http://127.0.0.1:{server.server_port}/v3", flush=True)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""
+Benchmark: webhook ingestion vs polling, in upstream Eventbrite calls
+
+Serves a synthetic org of upcoming events from stub_eventbrite.py,
+syncs it into a throwaway store, then replays the recorded payloads in
+webhook_samples/ and a burst of order.placed notifications through the
+/api/webhooks/eventbrite route, counting the upstream calls of each and
+the time until the receiver's worker has applied it. Those are set
+against what the prefetch scheduler polls per hour for the same org with
+and without WEBHOOKS_ENABLED.
+
+Usage (from backend/):
+    python benchmarks/webhook_benchmark.py [--events 200] [--sales 100] [--sales-per-hour 50]
+"""
+import argparse
+import glob
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+BACKEND = os.path.dirname(BENCHMARKS)
+sys.path.insert(0, BACKEND)
+sys.path.insert(0, BENCHMARKS)
+
+from stub_eventbrite import FIRST_EVENT_ID, FIRST_ORDER_ID, ORG_ID, PAGE_SIZE, StubEventbrite  # noqa: E402
+
+WEBHOOK_SECRET = 'benchmark'
+WEBHOOK_URL = f"/api/webhooks/eventbrite?secret={WEBHOOK_SECRET}"
+
+
+def polled_per_hour(store, tiers, list_interval, prefetch_interval):
+    """Upstream calls the prefetch scheduler makes per hour for the org, one page per refresh"""
+    from scheduler import refresh_interval
+
+    list_pages = -(-len(store.get_events(ORG_ID)) // PAGE_SIZE)
+    calls = list_pages * 3600 / max(list_interval, prefetch_interval)
+    for event in store.events_needing_attendee_sync(ORG_ID):
+        interval = refresh_interval(event, tiers)
+        if interval is not None:
+            calls += 3600 / max(interval, prefetch_interval)
+    return calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--events', type=int, default=200)
+    parser.add_argument('--per-event', type=int, default=40)
+    parser.add_argument('--sales', type=int, default=100, help='order.placed notifications to replay')
+    parser.add_argument('--sales-per-hour', type=int, default=50)
+    args = parser.parse_args()
+
+    stub = StubEventbrite(args.events, args.per_event, past_share=0)
+    rng = random.Random(1)
+    server = stub.serve()
+    workdir = tempfile.mkdtemp()
+    os.environ['EVENTBRITE_API_BASE'] = f"http://127.0.0.1:{server.server_port}/v3"
+    os.environ['EVENT_STORE_PATH'] = os.path.join(workdir, 'bench.db')
+    os.environ['EVENTBRITE_RATE_LIMIT'] = str(10 ** 6)
+    os.environ['WEBHOOKS_ENABLED'] = 'true'
+    os.environ['WEBHOOK_SECRET'] = WEBHOOK_SECRET
+    try:
+        import app as dashboard
+        from scheduler import REFRESH_TIERS, WEBHOOK_REFRESH_TIERS, WEBHOOK_SAFETY_INTERVAL
+
+        dashboard.event_sync.sync(ORG_ID)
+        client = dashboard.app.test_client()
+        print(f"{args.events} upcoming events, {args.per_event} attendees each, synced\n")
+
+        print(f"{'sample':<24} {'status':>6} {'calls':>6} {'time':>9}")
+        for path in sorted(glob.glob(os.path.join(BACKEND, 'webhook_samples', '*.json'))):
+            with open(path) as f:
+                payload = json.load(f)
+            before = stub.stats()['total']
+            started = time.perf_counter()
+            response = client.post(WEBHOOK_URL, json=payload)
+            dashboard.webhook_receiver.join()
+            elapsed = time.perf_counter() - started
+            calls = stub.stats()['total'] - before
+            print(f"{os.path.basename(path):<24} {response.status_code:>6} {calls:>6} {elapsed * 1000:>7.1f}ms")
+
+        with open(os.path.join(BACKEND, 'webhook_samples', 'order_placed.json')) as f:
+            sample = json.load(f)
+        before = stub.stats()['total']
+        started = time.perf_counter()
+        for _ in range(args.sales):
+            event_id = str(FIRST_EVENT_ID + rng.randrange(args.events))
+            order_id = stub.place_order(event_id)
+            payload = dict(sample, api_url=sample['api_url'].replace(str(FIRST_ORDER_ID), order_id))
+            assert client.post(WEBHOOK_URL, json=payload).status_code == 202
+            dashboard.webhook_receiver.join()
+        elapsed = time.perf_counter() - started
+        per_sale = (stub.stats()['total'] - before) / args.sales
+        print(f"\n{args.sales} order.placed: {per_sale:.1f} upstream calls and "
+              f"{elapsed / args.sales * 1000:.1f}ms per sale")
+
+        interval = dashboard.prefetcher.interval
+        polling = polled_per_hour(dashboard.store, REFRESH_TIERS, 0, interval)
+        safety = polled_per_hour(dashboard.store, WEBHOOK_REFRESH_TIERS, WEBHOOK_SAFETY_INTERVAL, interval)
+        webhooks = safety + per_sale * args.sales_per_hour
+        print(f"\nUpstream calls per hour at {args.sales_per_hour} sales/hour "
+              f"(PREFETCH_INTERVAL={interval}s):")
+        print(f"  polling only       {polling:>8.0f}")
+        print(f"  webhooks + safety  {webhooks:>8.0f}  ({safety:.0f} safety-net polling)")
+    finally:
+        server.shutdown()
+        shutil.rmtree(workdir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,178 @@
+"""
+In-memory cache for Eventbrite API responses
+
+Entries are keyed by URL + query params, bounded in size with LRU eviction,
+and carry their own TTL. Once an entry expires it is still served for a
+grace period (stale-while-revalidate) while a single background refresh
+replaces it. Concurrent misses on the same key share one fetch (single-flight).
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from instrumentation import record_cache
+
+DEFAULT_MAX_ENTRIES = 4096
+DEFAULT_STALE_TTL = 24 * 60 * 60  # Serve expired entries for up to a day while refreshing
+
+
+def make_key(url, params=None):
+    """Build a cache key from a URL and its query params"""
+    if not params:
+        return url
+    return url + '?' + '&'.join(f'{k}={params[k]}' for k in sorted(params))
+
+
+class _Entry:
+    __slots__ = ('value', 'fetched_at', 'ttl', 'stale_ttl')
+
+    def __init__(self, value, ttl, stale_ttl):
+        self.value = value
+        self.fetched_at = time.monotonic()
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+
+    def age(self):
+        return time.monotonic() - self.fetched_at
+
+
+class _Flight:
+    """One in-progress fetch that concurrent callers wait on"""
+    __slots__ = ('done', 'value')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+
+
+class TTLCache:
+    """Thread-safe LRU cache with per-entry TTLs and stale-while-revalidate"""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, name=None):
+        self.max_entries = max_entries
+        self.name = name  # Label for per-request lookup counts, unnamed caches aren't counted
+        self._entries = OrderedDict()
+        self._refreshing = set()
+        self._inflight = {}  # key -> _Flight for misses being fetched
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Return a fresh cached value or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.age() > entry.ttl:
+                return None
+            self._entries.move_to_end(key)
+            return entry.value
+
+    def peek(self, key):
+        """Return the cached value for key even if it has expired, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry.value if entry is not None else None
+
+    def set(self, key, value, ttl, stale_ttl=DEFAULT_STALE_TTL):
+        with self._lock:
+            self._entries[key] = _Entry(value, ttl, stale_ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key=None, prefix=None):
+        """Drop one key, every key starting with prefix, or everything"""
+        with self._lock:
+            if key is not None:
+                self._entries.pop(key, None)
+            elif prefix is not None:
+                for k in [k for k in self._entries if k.startswith(prefix)]:
+                    del self._entries[k]
+            else:
+                self._entries.clear()
+
+    def get_or_fetch(self, key, fetch, ttl, stale_ttl=DEFAULT_STALE_TTL):
+        """
+        Return the cached value for key, calling fetch() on a miss
+
+        Expired entries inside their stale window are returned immediately and
+        refreshed in a background thread (at most one refresh per key). On a
+        miss only the first caller fetches; callers arriving meanwhile wait
+        for its result. fetch() returning None means failure and is never
+        cached.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                age = entry.age()
+                if age <= entry.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    self._record('hit')
+                    return entry.value
+                if age <= entry.ttl + entry.stale_ttl:
+                    self._entries.move_to_end(key)
+                    self.stale_hits += 1
+                    self._record('stale')
+                    if key not in self._refreshing:
+                        self._refreshing.add(key)
+                        threading.Thread(
+                            target=self._refresh,
+                            args=(key, fetch, ttl, stale_ttl),
+                            daemon=True
+                        ).start()
+                    return entry.value
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                self.misses += 1
+                flight = self._inflight[key] = _Flight()
+            else:
+                self.coalesced += 1
+            self._record('miss' if leader else 'coalesced')
+
+        if not leader:
+            flight.done.wait()
+            return flight.value
+
+        try:
+            flight.value = fetch()
+            if flight.value is not None:
+                self.set(key, flight.value, ttl, stale_ttl)
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            flight.done.set()
+        return flight.value
+
+    def _record(self, result):
+        if self.name is not None:
+            record_cache(self.name, result)
+
+    def _refresh(self, key, fetch, ttl, stale_ttl):
+        try:
+            value = fetch()
+            if value is not None:
+                self.set(key, value, ttl, stale_ttl)
+        except Exception as e:
+            print(f"Background refresh failed for {key}: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'stale_hits': self.stale_hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+                'refreshing': len(self._refreshing)
+            }
@@ -0,0 +1,163 @@
+"""
+Customer identity index for repeat-customer analytics
+
+Customers are keyed by normalized email (whitespace removed, lowercased),
+so one person's differently typed emails merge into one customer, and each
+customer gets a dense integer id. Per-customer tickets and revenue live in
+numpy arrays indexed by id, so repeat rates, pseudo-subscribers and
+lifetime value are vectorized counts over integers. Each customer's visits
+are one array('i') of (event code, tickets) pairs, event codes pointing
+into a table of event ids shared by every customer, instead of a list of
+[date, event_id, tickets] lists per customer.
+"""
+from array import array
+
+import numpy as np
+
+MIN_CAPACITY = 64
+
+
+def normalize_email(email):
+    """The customer identity of an email, '' when there is none"""
+    return ''.join(email.split()).lower() if email else ''
+
+
+class CustomerIndex:
+    """
+    Dense customer ids for normalized emails, with their totals and visits
+
+    Not thread-safe; InsightsAggregator calls it under its own lock. Ids are
+    never reused, a customer whose tickets all go away keeps theirs and
+    just stops being present.
+    """
+
+    def __init__(self, emails=()):
+        self.emails = list(emails)  # id -> normalized email
+        self._ids = {email: customer for customer, email in enumerate(self.emails)}
+        capacity = max(len(self.emails), MIN_CAPACITY)
+        self._tickets = np.zeros(capacity, dtype=np.int64)
+        self._cents = np.zeros(capacity, dtype=np.int64)
+        self._visits = [None] * len(self.emails)  # id -> array('i') of (event code, tickets) pairs
+        self.event_ids = []  # event code -> event id
+        self._event_codes = {}  # event id -> event code
+
+    def __len__(self):
+        return len(self.emails)
+
+    def id(self, email):
+        """The id of a normalized email, assigned on first sight"""
+        customer = self._ids.get(email)
+        if customer is None:
+            customer = self._ids[email] = len(self.emails)
+            self.emails.append(email)
+            self._visits.append(None)
+            if customer == len(self._tickets):
+                self._tickets = np.concatenate([self._tickets, np.zeros_like(self._tickets)])
+                self._cents = np.concatenate([self._cents, np.zeros_like(self._cents)])
+        return customer
+
+    def find(self, email):
+        """The id of a normalized email, None if it was never seen"""
+        return self._ids.get(email)
+
+    def event_code(self, event_id):
+        code = self._event_codes.get(event_id)
+        if code is None:
+            code = self._event_codes[event_id] = len(self.event_ids)
+            self.event_ids.append(event_id)
+        return code
+
+    # Totals
+
+    def add(self, customer, tickets, cents):
+        """Add (or, negative, take away) tickets and revenue cents"""
+        self._tickets[customer] += tickets
+        self._cents[customer] += cents
+
+    def set_totals(self, tickets, cents):
+        """Set every customer's totals at once, arrays by id"""
+        self._tickets[:len(tickets)] = tickets
+        self._cents[:len(cents)] = cents
+
+    def tickets(self, customer):
+        return int(self._tickets[customer])
+
+    def cents(self, customer):
+        return int(self._cents[customer])
+
+    def totals(self):
+        """(tickets, revenue cents) arrays by id, views that are only valid until the next new id"""
+        return self._tickets[:len(self.emails)], self._cents[:len(self.emails)]
+
+    def present(self):
+        """Ids of customers with any tickets or revenue, ascending"""
+        tickets, cents = self.totals()
+        return np.flatnonzero((tickets != 0) | (cents != 0))
+
+    # Visits
+
+    def visits(self, customer):
+        """[(event id, tickets)] in the order they are kept"""
+        pairs = self._visits[customer]
+        if pairs is None:
+            return []
+        return [(self.event_ids[pairs[i]], pairs[i + 1]) for i in range(0, len(pairs), 2)]
+
+    def last_visit(self, customer):
+        """Event id of the customer's last visit, None without visits"""
+        pairs = self._visits[customer]
+        return self.event_ids[pairs[-2]] if pairs else None
+
+    def add_visit(self, customer, event_id, tickets, key):
+        """
+        Add (or, negative, take away) tickets to a customer's visit of an event
+
+        A new visit is inserted in key(event id) order, and one left with
+        no tickets is dropped.
+        """
+        code = self.event_code(event_id)
+        pairs = self._visits[customer]
+        if pairs is None:
+            if tickets > 0:
+                self._visits[customer] = array('i', (code, tickets))
+            return
+        for i in range(0, len(pairs), 2):
+            if pairs[i] == code:
+                pairs[i + 1] += tickets
+                if pairs[i + 1] <= 0:
+                    del pairs[i:i + 2]
+                    if not pairs:
+                        self._visits[customer] = None
+                return
+        if tickets <= 0:
+            return
+        new_key = key(event_id)
+        i = 0
+        while i < len(pairs) and key(self.event_ids[pairs[i]]) <= new_key:
+            i += 2
+        pairs[i:i] = array('i', (code, tickets))
+
+    def set_visits(self, customers, codes, tickets):
+        """
+        Set visits from parallel arrays grouped by customer, in the order each keeps them
+
+        Codes must already be in the event table (see add_events).
+        """
+        if not len(customers):
+            return
+        flat = np.empty(2 * len(customers), dtype=np.int32)
+        flat[0::2] = codes
+        flat[1::2] = tickets
+        data = flat.tobytes()
+        pair_bytes = 2 * flat.itemsize
+        starts = np.flatnonzero(np.r_[True, customers[1:] != customers[:-1]])
+        ends = np.r_[starts[1:], len(customers)]
+        for customer, start, end in zip(customers[starts].tolist(), starts.tolist(), ends.tolist()):
+            pairs = array('i')
+            pairs.frombytes(data[start * pair_bytes:end * pair_bytes])
+            self._visits[customer] = pairs
+
+    def add_events(self, event_ids):
+        """Code event ids in order, so positions in a list of events are its codes"""
+        for event_id in event_ids:
+            self.event_code(event_id)
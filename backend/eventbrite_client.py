@@ -0,0 +1,178 @@
+"""
+Eventbrite API client
+
+Wraps a pooled requests.Session so the hundreds of per-event calls reuse
+keep-alive connections instead of opening a fresh TLS connection each time.
+All calls go through the shared rate limiter. Cached resources remember
+the ETag/Last-Modified Eventbrite sent, and refreshing them sends a
+conditional request, so an unchanged resource comes back as an empty 304
+and the cached copy is kept without downloading or parsing it again.
+"""
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from cache import make_key
+from instrumentation import record_backoff, record_upstream
+from rate_limiter import RateBudgetExhausted, parse_retry_after, PRIORITY_INTERACTIVE
+
+EVENTBRITE_API_BASE = "https://www.eventbriteapi.com/v3"
+DEFAULT_TTL = 5 * 60  # seconds
+DEFAULT_POOL_SIZE = 16
+DEFAULT_CONNECT_TIMEOUT = 5  # seconds
+DEFAULT_READ_TIMEOUT = 30  # seconds
+
+
+class UpstreamFetchError(Exception):
+    """Raised when a page of a paginated Eventbrite resource couldn't be fetched"""
+
+
+class CachedJSON:
+    """A cached JSON body with the validators its response carried"""
+    __slots__ = ('data', 'etag', 'last_modified')
+
+    def __init__(self, data, etag=None, last_modified=None):
+        self.data = data
+        self.etag = etag
+        self.last_modified = last_modified
+
+    def conditional_headers(self):
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class EventbriteClient:
+    """Pooled, rate-limited HTTP client for the Eventbrite API"""
+
+    def __init__(self, token, rate_limiter, cache=None, base_url=EVENTBRITE_API_BASE,
+                 pool_size=DEFAULT_POOL_SIZE, connect_timeout=DEFAULT_CONNECT_TIMEOUT,
+                 read_timeout=DEFAULT_READ_TIMEOUT, max_wait=None):
+        self.token = token
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        self.base_url = base_url
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_wait = max_wait  # Max seconds an interactive call queues for a token
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, pool_block=True)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update(self.headers())
+
+    def headers(self):
+        return {
+            'Authorization': f'Bearer {self.token}',
+            'Content-Type': 'application/json',
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive'
+        }
+
+    def get(self, url, params=None, max_retries=3, priority=PRIORITY_INTERACTIVE, headers=None):
+        """GET with rate limit handling, returns the response or None after repeated 429s"""
+        max_wait = self.max_wait if priority == PRIORITY_INTERACTIVE else None
+        for attempt in range(max_retries):
+            try:
+                # Wait for a token; 429 pauses are shared by every caller
+                started = time.perf_counter()
+                self.rate_limiter.acquire(priority, max_wait=max_wait)
+                requested = time.perf_counter()
+                record_backoff(requested - started)
+                try:
+                    response = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
+                except Exception:
+                    record_upstream(url, 'error', time.perf_counter() - requested)
+                    raise
+                record_upstream(url, response.status_code, time.perf_counter() - requested)
+
+                if response.status_code == 429:
+                    # Rate limited - pause every caller, honoring Retry-After
+                    wait_time = self.rate_limiter.on_rate_limited(
+                        parse_retry_after(response.headers.get('Retry-After'))
+                    )
+                    print(f"Rate limited, waiting {wait_time}s before retry...")
+                    continue
+
+                self.rate_limiter.on_success()
+                return response
+            except RateBudgetExhausted:
+                raise
+            except Exception:
+                if attempt == max_retries - 1:
+                    raise
+                time.sleep(1)
+                record_backoff(1)
+
+        return None
+
+    def get_json(self, url, params=None, ttl=DEFAULT_TTL, priority=PRIORITY_INTERACTIVE,
+                 use_cache=True):
+        """Fetch a JSON resource, through the cache when there is one, returns None on failure"""
+        if not use_cache or self.cache is None:
+            response = self.get(url, params=params, priority=priority)
+            if not response or response.status_code != 200:
+                return None
+            return response.json()
+
+        key = make_key(url, params)
+
+        def fetch():
+            # Revalidate the expired copy when its response carried validators
+            previous = self.cache.peek(key)
+            headers = previous.conditional_headers() if previous is not None else None
+            response = self.get(url, params=params, priority=priority, headers=headers or None)
+            if response is not None and response.status_code == 304 and previous is not None:
+                return previous
+            if not response or response.status_code != 200:
+                return None
+            return CachedJSON(response.json(), response.headers.get('ETag'),
+                              response.headers.get('Last-Modified'))
+
+        cached = self.cache.get_or_fetch(key, fetch, ttl)
+        return cached.data if cached is not None else None
+
+    def iter_pages(self, url, params=None, ttl=DEFAULT_TTL, priority=PRIORITY_INTERACTIVE,
+                   use_cache=True, continuation=None):
+        """
+        Yield (page, next continuation) for every page of a paginated resource
+
+        Starts from continuation when given, and the next continuation is
+        None on the last page. Raises UpstreamFetchError if any page fails.
+        """
+        while True:
+            page_params = dict(params or {})
+            if continuation:
+                page_params['continuation'] = continuation
+
+            data = self.get_json(url, params=page_params, ttl=ttl, priority=priority,
+                                 use_cache=use_cache)
+            if data is None:
+                raise UpstreamFetchError(f"Failed to fetch {url}")
+
+            pagination = data.get('pagination', {})
+            continuation = pagination.get('continuation') if pagination.get('has_more_items', False) else None
+            yield data, continuation
+
+            if not continuation:
+                break
+
+    def iter_paginated(self, url, key, params=None, ttl=DEFAULT_TTL,
+                       priority=PRIORITY_INTERACTIVE, use_cache=True):
+        """
+        Yield the items under key from every page of a paginated resource
+
+        Follows pagination.continuation page by page. Raises
+        UpstreamFetchError if any page fails, so callers never see a
+        silently truncated list.
+        """
+        for data, _ in self.iter_pages(url, params=params, ttl=ttl, priority=priority,
+                                       use_cache=use_cache):
+            yield from data.get(key, [])
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,20 @@
+"""
+Concurrent fetch helpers for fanning out per-event Eventbrite calls
+
+Rate limiting and 429 backoff are shared through rate_limiter, so every
+worker in a pool slows down together. Each call runs in a copy of the
+caller's context, so its request's instrumentation trace follows it.
+"""
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+
+def map_concurrently(fn, items, max_workers):
+    """Apply fn to every item on a bounded thread pool, preserving order"""
+    items = list(items)
+    if max_workers <= 1 or len(items) <= 1:
+        return [fn(item) for item in items]
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as pool:
+        futures = [pool.submit(contextvars.copy_context().run, fn, item) for item in items]
+        return [future.result() for future in futures]
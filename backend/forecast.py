@@ -0,0 +1,159 @@
+"""
+Attendance and revenue forecasts behind /api/forecast
+
+Fits a linear trend (least squares over month index) to each org's monthly
+attendee and revenue series, overall and per event name, and projects it a
+few months ahead. Every series is fitted in one batch: they are padded into
+a matrix with a mask and the regression sums are taken row-wise with numpy.
+Results are cached per org until its monthly rollups change.
+"""
+import threading
+
+import numpy as np
+
+DEFAULT_MONTHS_AHEAD = 3
+MAX_MONTHS_AHEAD = 12
+MIN_MONTHS = 3  # Fewer months than this is 'insufficient_data'
+RECENT_MONTHS = 6
+
+# Slopes (per month) beyond which a trend counts as growing or declining
+ATTENDEE_TREND_THRESHOLD = 2
+REVENUE_TREND_THRESHOLD = 20
+
+
+def fit_trends(values, mask):
+    """
+    Least-squares (slope, intercept) per row over x = 0, 1, ... of its masked points
+
+    Rows with fewer than two points get slope and intercept 0.
+    """
+    x = np.arange(values.shape[1], dtype=float)
+    weights = mask.astype(float)
+    n = weights.sum(axis=1)
+    sum_x = weights @ x
+    sum_y = (values * weights).sum(axis=1)
+    sum_xy = (values * weights) @ x
+    sum_x2 = weights @ (x * x)
+    denominator = n * sum_x2 - sum_x * sum_x
+    fitted = (n >= 2) & (denominator != 0)
+    safe = np.where(fitted, denominator, 1)
+    slope = np.where(fitted, (n * sum_xy - sum_x * sum_y) / safe, 0.0)
+    intercept = np.where(fitted, (sum_y - slope * sum_x) / np.where(n > 0, n, 1), 0.0)
+    return slope, intercept
+
+
+def trend(slope, threshold):
+    return 'growing' if slope > threshold else 'declining' if slope < -threshold else 'stable'
+
+
+def next_months(month, count):
+    """The count 'YYYY-MM' months after month"""
+    year, number = map(int, month.split('-'))
+    months = []
+    for _ in range(count):
+        year, number = (year + 1, 1) if number == 12 else (year, number + 1)
+        months.append(f"{year}-{number:02d}")
+    return months
+
+
+def forecast_series(series, months_ahead=DEFAULT_MONTHS_AHEAD):
+    """
+    Forecast every series of InsightsAggregator.monthly_series in one batch
+
+    Returns {key: forecast} with predictions for the next months_ahead
+    months after each series' last month, trend labels and slopes.
+    """
+    keys = list(series)
+    lengths = np.array([len(series[key]) for key in keys], dtype=int)
+    width = int(lengths.max()) if len(keys) else 0
+    attendees = np.zeros((len(keys), width))
+    revenue = np.zeros((len(keys), width))
+    for row, key in enumerate(keys):
+        points = series[key]
+        attendees[row, :len(points)] = [point[1] for point in points]
+        revenue[row, :len(points)] = [point[2] / 100.0 for point in points]
+
+    columns = np.arange(width)
+    mask = columns < lengths[:, None]
+    recent_mask = mask & (columns >= (lengths - RECENT_MONTHS)[:, None])
+    attendee_slope, attendee_intercept = fit_trends(attendees, mask)
+    revenue_slope, revenue_intercept = fit_trends(revenue, mask)
+    recent_slope, _ = fit_trends(attendees, recent_mask)
+
+    # Project to indexes n .. n + months_ahead - 1, rounding half up and clamping at 0
+    ahead = lengths[:, None] + np.arange(months_ahead)
+    predicted_attendees = np.maximum(0, np.floor(
+        attendee_slope[:, None] * ahead + attendee_intercept[:, None] + 0.5
+    ))
+    predicted_revenue = np.maximum(0, np.floor(
+        revenue_slope[:, None] * ahead + revenue_intercept[:, None] + 0.5
+    ))
+
+    forecasts = {}
+    for row, key in enumerate(keys):
+        if lengths[row] < MIN_MONTHS:
+            forecasts[key] = {
+                'predictions': [],
+                'attendee_trend': 'insufficient_data',
+                'revenue_trend': 'insufficient_data',
+                'recent_trend': 'insufficient_data',
+                'avg_growth_rate': 0,
+                'recent_growth_rate': 0
+            }
+            continue
+        months = next_months(series[key][-1][0], months_ahead)
+        forecasts[key] = {
+            'predictions': [
+                {'month': month, 'attendees': int(count), 'revenue': int(amount)}
+                for month, count, amount in zip(months, predicted_attendees[row], predicted_revenue[row])
+            ],
+            'attendee_trend': trend(attendee_slope[row], ATTENDEE_TREND_THRESHOLD),
+            'revenue_trend': trend(revenue_slope[row], REVENUE_TREND_THRESHOLD),
+            'recent_trend': trend(recent_slope[row], ATTENDEE_TREND_THRESHOLD),
+            'avg_growth_rate': round(float(attendee_slope[row]), 2),
+            'recent_growth_rate': round(float(recent_slope[row]), 2)
+        }
+    return forecasts
+
+
+class ForecastService:
+    """
+    Cached forecasts for each org's insights aggregator
+
+    A cached result is reused until the aggregator's monthly_version moves,
+    so refits only happen after a sync changed attendance or revenue.
+    """
+
+    def __init__(self, insights_registry):
+        self.insights_registry = insights_registry
+        self._cache = {}  # (org_id, months_ahead) -> (aggregator, monthly_version, forecasts)
+        self._lock = threading.Lock()
+
+    def forecasts(self, org_id, months_ahead=DEFAULT_MONTHS_AHEAD):
+        """{None: overall forecast, event_name: forecast} for an org"""
+        aggregator = self.insights_registry.get(org_id)
+        key = (org_id, months_ahead)
+        version = aggregator.monthly_version
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached and cached[0] is aggregator and cached[1] == version:
+                return cached[2]
+        forecasts = forecast_series(aggregator.monthly_series(), months_ahead)
+        with self._lock:
+            self._cache[key] = (aggregator, version, forecasts)
+        return forecasts
+
+    def to_response(self, org_id, months_ahead=DEFAULT_MONTHS_AHEAD, event_names=()):
+        """
+        Build the /api/forecast payload
+
+        Per-event forecasts are included for event_names, or for every event
+        name when event_names is None.
+        """
+        forecasts = self.forecasts(org_id, months_ahead)
+        names = [name for name in forecasts if name is not None] if event_names is None else event_names
+        return {
+            'months_ahead': months_ahead,
+            'overall': forecasts[None],
+            'events': {name: forecasts[name] for name in names if name in forecasts}
+        }
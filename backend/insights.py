@@ -0,0 +1,631 @@
+"""
+Incremental insights aggregator
+
+Keeps the rollups behind /api/insights (monthly trends, ticket types,
+repeat customers, per-event monthly series, capacity) for one org and
+updates them per event delta instead of recomputing over every attendee.
+Also serves the paginated customer list behind /api/customers. Customers
+are tracked by integer id in a CustomerIndex, so emails differing only in
+case or whitespace count as one customer.
+"""
+import base64
+import json
+import sys
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+
+import numpy as np
+
+from analytics import AttendeeColumns
+from customers import CustomerIndex, normalize_email
+
+CUSTOMER_SORTS = ('lifetime_value', 'total_events', 'last_seen')
+# Type of each sort's value in a cursor: cents and tickets are numbers, last_seen a date string
+CURSOR_VALUE_TYPES = {'lifetime_value': (int, float), 'total_events': (int, float), 'last_seen': str}
+DEFAULT_CUSTOMERS_PAGE = 50
+MAX_CUSTOMERS_PAGE = 200
+
+
+def empty_summary():
+    """Attendee rollup for one event, in the shape EventStore.event_summaries returns"""
+    return {
+        'attendees': 0,
+        'checked_in': 0,
+        'revenue_cents': 0,
+        'ticket_types': defaultdict(lambda: [0, 0]),  # ticket class -> [count, revenue cents]
+        'customers': defaultdict(lambda: [0, 0])  # normalized email -> [tickets, revenue cents]
+    }
+
+
+def summarize_rows(rows):
+    """Group (email, ticket_class_name, gross_cents, checked_in) rows into a summary"""
+    summary = empty_summary()
+    for email, ticket_class_name, gross_cents, checked_in in rows:
+        summary['attendees'] += 1
+        summary['revenue_cents'] += gross_cents
+        summary['checked_in'] += 1 if checked_in else 0
+        ticket_type = summary['ticket_types'][ticket_class_name]
+        ticket_type[0] += 1
+        ticket_type[1] += gross_cents
+        email = normalize_email(email)
+        if email:
+            customer = summary['customers'][email]
+            customer[0] += 1
+            customer[1] += gross_cents
+    return summary
+
+
+def _add_pair(totals, key, count, cents, sign):
+    pair = totals[key]
+    pair[0] += sign * count
+    pair[1] += sign * cents
+    if pair[0] == 0 and pair[1] == 0:
+        del totals[key]
+
+
+def _compact_event(event):
+    """Keep only the fields rollups need, with name and date strings interned"""
+    return {
+        'id': event['id'],
+        'name': sys.intern(event['name']),
+        'start_local': sys.intern(event['start_local']),
+        'capacity': event['capacity'],
+        'status': event['status']
+    }
+
+
+def encode_cursor(sort, key):
+    """Opaque /api/customers cursor for the last (sort value, email) returned"""
+    return base64.urlsafe_b64encode(json.dumps([sort, *key]).encode()).decode()
+
+
+def decode_cursor(sort, cursor):
+    """Decode a cursor made by encode_cursor, raises ValueError if it's not for this sort"""
+    try:
+        cursor_sort, value, email = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except Exception:
+        raise ValueError('Invalid cursor')
+    if cursor_sort != sort:
+        raise ValueError('Cursor is for a different sort')
+    # A mistyped value would only fail once it's compared against the index
+    if isinstance(value, bool) or not isinstance(value, CURSOR_VALUE_TYPES[sort]) or not isinstance(email, str):
+        raise ValueError('Invalid cursor')
+    return (value, email)
+
+
+def _add_count(counts, key, value):
+    counts[key] += value
+    if counts[key] == 0:
+        del counts[key]
+
+
+class InsightsAggregator:
+    """
+    Stateful /api/insights rollups for one org
+
+    Each event's attendee summary is kept so it can be swapped out when that
+    event changes. Updating one event costs O(its attendees); applying an
+    attendee delta costs O(changed attendees).
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._events = {}  # event_id -> event dict (name, start_local, capacity, status)
+        self._summaries = {}  # event_id -> attendee summary (None until read), for synced events only
+        self._columns = None  # AttendeeColumns the None summaries are materialized from
+        self._column_positions = {}  # event_id -> position in _columns
+
+        self.total_attendees = 0
+        self.total_revenue_cents = 0
+        self.capacity_events_attendees = 0
+        self.total_capacity = 0
+        self.events_by_month = defaultdict(int)
+        self.attendees_by_month = defaultdict(int)
+        self.revenue_cents_by_month = defaultdict(int)
+        self.ticket_types = defaultdict(lambda: [0, 0])  # ticket class -> [count, revenue cents]
+        self.customer_index = CustomerIndex()  # Tickets, revenue and visits (by date) per customer
+        self._events_by_name = defaultdict(set)  # event_name -> ids of counted events
+        self.events_by_month_by_event = defaultdict(lambda: defaultdict(int))  # event_name -> month -> events
+        self.attendees_by_month_by_event = defaultdict(lambda: defaultdict(int))  # event_name -> month -> attendees
+        self.revenue_cents_by_month_by_event = defaultdict(lambda: defaultdict(int))  # event_name -> month -> cents
+        self.monthly_version = 0  # Bumped on every change to the monthly series
+        self._customers_version = 0  # Bumped on every customer change
+        self._customer_indexes = {}  # sort -> sorted [(value, email)], for _indexed_version
+        self._indexed_version = 0
+
+    @classmethod
+    def from_store(cls, events, summaries):
+        """Build from an org's events (newest first) and their attendee summaries"""
+        aggregator = cls()
+        for event in events:
+            aggregator.set_event(event, summaries.get(event['id']))
+        return aggregator
+
+    @classmethod
+    def from_columns(cls, events, columns):
+        """
+        Build from an org's events (newest first) and their AttendeeColumns
+
+        Same result as from_store, but the rollups come from vectorized
+        group-bys over the columns. Per-event summaries are only built when
+        an event's attendees or fields change.
+        """
+        aggregator = cls()
+        compact = [_compact_event(event) for event in events]
+        counted = np.zeros(len(compact), dtype=bool)
+        for position, event in enumerate(compact):
+            aggregator._events[event['id']] = event
+            if events[position]['attendees_synced_at'] is not None:
+                aggregator._summaries[event['id']] = None
+                aggregator._column_positions[event['id']] = position
+                counted[position] = event['status'] != 'draft'
+        aggregator._columns = columns if aggregator._column_positions else None
+
+        attendees, _, revenue_cents = (totals.tolist() for totals in columns.event_totals())
+        for position in np.flatnonzero(counted).tolist():
+            event = compact[position]
+            month = event['start_local'][:7]
+            aggregator.events_by_month[month] += 1
+            aggregator.events_by_month_by_event[event['name']][month] += 1
+            aggregator._events_by_name[event['name']].add(event['id'])
+            aggregator.total_attendees += attendees[position]
+            aggregator.total_revenue_cents += revenue_cents[position]
+            aggregator.attendees_by_month[month] += attendees[position]
+            aggregator.revenue_cents_by_month[month] += revenue_cents[position]
+            aggregator.attendees_by_month_by_event[event['name']][month] += attendees[position]
+            aggregator.revenue_cents_by_month_by_event[event['name']][month] += revenue_cents[position]
+            if event['capacity'] > 0:
+                aggregator.total_capacity += event['capacity']
+                aggregator.capacity_events_attendees += attendees[position]
+
+        for name, count, cents in columns.ticket_types(counted):
+            aggregator.ticket_types[name] = [count, cents]
+
+        # Same customer ids as the columns, and event codes are positions
+        index = aggregator.customer_index = CustomerIndex(columns.emails)
+        index.add_events(event['id'] for event in compact)
+        index.set_totals(*columns.customer_totals(counted))
+        if len(index):
+            aggregator._customers_version += 1
+
+        # Rank events by (start_local, id), the order customer visits are kept in
+        date_order = sorted(range(len(compact)), key=lambda i: (compact[i]['start_local'], compact[i]['id']))
+        date_rank = np.empty(len(compact), dtype=np.int64)
+        date_rank[date_order] = np.arange(len(compact))
+        index.set_visits(*columns.customer_visits(counted, date_rank))
+        return aggregator
+
+    # Updates
+
+    def set_event(self, event, summary=None):
+        """Add or replace one event and its whole attendee summary (None if not synced)"""
+        with self._lock:
+            event = _compact_event(event)
+            self._remove(event['id'])
+            self._events[event['id']] = event
+            if summary is not None:
+                self._summaries[event['id']] = empty_summary()
+                self._add_to_summary(self._summaries[event['id']], summary, 1)
+                self._include(event['id'], 1)
+
+    def update_event(self, event):
+        """Update event fields (name, date, capacity, status) keeping its attendees"""
+        with self._lock:
+            event = _compact_event(event)
+            old = self._events.get(event['id'])
+            if old is None:
+                self._events[event['id']] = event
+                return
+            unchanged = all(
+                old[field] == event[field] for field in ('name', 'start_local', 'capacity', 'status')
+            )
+            if not unchanged:
+                self._include(event['id'], -1)
+            self._events[event['id']] = event
+            if not unchanged:
+                self._include(event['id'], 1)
+
+    def remove_event(self, event_id):
+        with self._lock:
+            self._remove(event_id)
+
+    def has_event(self, event_id):
+        return event_id in self._events
+
+    def add_attendees(self, event_id, delta):
+        """Apply a summary of newly attending attendees to a known event"""
+        with self._lock:
+            if event_id not in self._events:
+                return
+            if event_id not in self._summaries:
+                # First sync of this event: it starts counting, with no attendees yet
+                self._summaries[event_id] = empty_summary()
+                self._include(event_id, 1)
+            self._add_to_summary(self._summary(event_id), delta, 1)
+            if self._counts(event_id):
+                self._add_to_rollups(self._events[event_id], delta, 1)
+
+    def remove_attendees(self, event_id, delta):
+        """Apply a summary of attendees that left (cancelled, refunded or replaced)"""
+        with self._lock:
+            if event_id not in self._summaries:
+                return
+            self._add_to_summary(self._summary(event_id), delta, -1)
+            if self._counts(event_id):
+                self._add_to_rollups(self._events[event_id], delta, -1)
+
+    def _remove(self, event_id):
+        if event_id in self._summaries:
+            self._include(event_id, -1)
+            del self._summaries[event_id]
+            self._column_positions.pop(event_id, None)
+        self._events.pop(event_id, None)
+
+    def _summary(self, event_id):
+        """An event's attendee summary, built from the columns on first use"""
+        summary = self._summaries[event_id]
+        if summary is None:
+            position = self._column_positions.pop(event_id)
+            summary = self._summaries[event_id] = summarize_rows(self._columns.summary_rows(position))
+            if not self._column_positions:
+                self._columns = None  # Every summary is built, let the arrays go
+        return summary
+
+    def _counts(self, event_id):
+        """Whether an event contributes to rollups: published and synced"""
+        event = self._events.get(event_id)
+        return event is not None and event['status'] != 'draft' and event_id in self._summaries
+
+    def _include(self, event_id, sign):
+        """Add (sign=1) or take out (sign=-1) an event's whole contribution"""
+        if not self._counts(event_id):
+            return
+        self.monthly_version += 1
+        event = self._events[event_id]
+        month = event['start_local'][:7]
+        _add_count(self.events_by_month, month, sign)
+        by_event = self.events_by_month_by_event[event['name']]
+        _add_count(by_event, month, sign)
+        if not by_event:
+            del self.events_by_month_by_event[event['name']]
+        same_name = self._events_by_name[event['name']]
+        if sign > 0:
+            same_name.add(event_id)
+        else:
+            same_name.discard(event_id)
+            if not same_name:
+                del self._events_by_name[event['name']]
+        if event['capacity'] > 0:
+            self.total_capacity += sign * event['capacity']
+        self._add_to_rollups(event, self._summary(event_id), sign)
+
+    @staticmethod
+    def _add_to_summary(stored, delta, sign):
+        stored['attendees'] += sign * delta['attendees']
+        stored['checked_in'] += sign * delta['checked_in']
+        stored['revenue_cents'] += sign * delta['revenue_cents']
+        for name, (count, cents) in delta['ticket_types'].items():
+            _add_pair(stored['ticket_types'], name, count, cents, sign)
+        for email, (tickets, cents) in delta['customers'].items():
+            _add_pair(stored['customers'], normalize_email(email), tickets, cents, sign)
+
+    def _add_to_rollups(self, event, delta, sign):
+        """Fold an attendee summary for a counted event into the org-wide rollups"""
+        event_id = event['id']
+        month = event['start_local'][:7]
+        attendees = sign * delta['attendees']
+        revenue_cents = sign * delta['revenue_cents']
+
+        self.total_attendees += attendees
+        self.total_revenue_cents += revenue_cents
+        self.attendees_by_month[month] += attendees
+        self.revenue_cents_by_month[month] += revenue_cents
+        self.attendees_by_month_by_event[event['name']][month] += attendees
+        self.revenue_cents_by_month_by_event[event['name']][month] += revenue_cents
+        if attendees or revenue_cents:
+            self.monthly_version += 1
+        if event['capacity'] > 0:
+            self.capacity_events_attendees += attendees
+
+        for name, (count, cents) in delta['ticket_types'].items():
+            _add_pair(self.ticket_types, name, count, cents, sign)
+
+        if delta['customers']:
+            self._customers_version += 1
+        for email, (tickets, cents) in delta['customers'].items():
+            customer = self.customer_index.id(normalize_email(email))
+            self.customer_index.add(customer, sign * tickets, sign * cents)
+            # Visits are kept in date order as they are built
+            self.customer_index.add_visit(customer, event_id, sign * tickets, self._visit_key)
+
+    def _visit_key(self, event_id):
+        event = self._events[event_id]
+        return event['start_local'], event_id
+
+    # Response
+
+    def monthly_series(self):
+        """
+        Monthly (attendees, revenue cents) series, overall and per event name
+
+        Returns {None: overall, event_name: ...}, each a list of (month,
+        attendees, revenue_cents) over the months that had counted events.
+        """
+        with self._lock:
+            series = {None: [
+                (month, self.attendees_by_month.get(month, 0), self.revenue_cents_by_month.get(month, 0))
+                for month in sorted(self.events_by_month)
+            ]}
+            for event_name, months in self.events_by_month_by_event.items():
+                attendees = self.attendees_by_month_by_event.get(event_name, {})
+                revenue_cents = self.revenue_cents_by_month_by_event.get(event_name, {})
+                series[event_name] = [
+                    (month, attendees.get(month, 0), revenue_cents.get(month, 0)) for month in sorted(months)
+                ]
+            return series
+
+    def _events_list(self):
+        """One {id, name} per event name (its newest event), newest first"""
+        newest = []
+        for ids in self._events_by_name.values():
+            newest.append(self._events[max(sorted(ids), key=lambda i: self._events[i]['start_local'])])
+        newest.sort(key=lambda e: e['id'])
+        newest.sort(key=lambda e: e['start_local'], reverse=True)
+        return [{'id': event['id'], 'name': event['name']} for event in newest]
+
+    def _customer_history(self, customer, entries):
+        """A customer's events (one entry per ticket, already in date order) and months"""
+        history = []
+        months = []
+        for event_id, tickets in self.customer_index.visits(customer):
+            entry = entries.get(event_id)
+            if entry is None:
+                # One shared dict per event, referenced by every ticket
+                event = self._events[event_id]
+                entry = entries[event_id] = {
+                    'event_name': event['name'],
+                    'event_date': event['start_local'],
+                    'event_id': event_id
+                }
+            history.extend([entry] * tickets)
+            month = entry['event_date'][:7]
+            if not months or months[-1] != month:
+                months.append(month)
+        return history, months
+
+    def to_response(self):
+        """Build the /api/insights payload"""
+        with self._lock:
+            total_events = len(self._events)
+            total_attendees = self.total_attendees
+            total_revenue = self.total_revenue_cents / 100.0
+            # Per-customer ticket counts, vectorized over customer ids
+            index = self.customer_index
+            tickets, _ = index.totals()
+            present = index.present()
+            unique_customers = len(present)
+
+            # Calculate repeat customer percentage
+            repeat_customer_count = int(np.count_nonzero(tickets > 1))
+            repeat_customer_rate = (repeat_customer_count / unique_customers * 100) if unique_customers else 0
+            new_customer_count = unique_customers - repeat_customer_count
+
+            # Calculate customer lifetime value
+            avg_customer_lifetime_value = (total_revenue / unique_customers) if unique_customers else 0
+
+            # Find top customers by event attendance
+            top_customers = present[np.argsort(-tickets[present], kind='stable')[:10]].tolist()
+            top_customers_data = []
+            for customer in top_customers:
+                top_customers_data.append({
+                    'email': index.emails[customer],
+                    'events_attended': index.tickets(customer),
+                    'lifetime_value': round(index.cents(customer) / 100.0, 2)
+                })
+
+            # Calculate subscription behavior (customers with 3+ events = "pseudo-subscribers")
+            pseudo_subscribers = int(np.count_nonzero(tickets >= 3))
+            pseudo_subscriber_rate = (pseudo_subscribers / unique_customers * 100) if unique_customers else 0
+            multi_show_buyers = int(np.count_nonzero(tickets >= 2))
+
+            # Calculate average capacity utilization
+            capacity_utilization = (
+                self.capacity_events_attendees / self.total_capacity * 100
+            ) if self.total_capacity > 0 else 0
+
+            # Cohort analysis: customers who only attended 1 event
+            first_time_customers = int(np.count_nonzero(tickets == 1))
+            # First-timer retention = what % of all customers became repeat customers
+            first_timer_retention_rate = repeat_customer_rate
+
+            # Format monthly data for charts
+            monthly_data = []
+            for month in sorted(self.events_by_month.keys()):
+                monthly_data.append({
+                    'month': month,
+                    'events': self.events_by_month[month],
+                    'attendees': self.attendees_by_month.get(month, 0),
+                    'revenue': round(self.revenue_cents_by_month.get(month, 0) / 100.0, 2)
+                })
+
+            # Format ticket type data with revenue
+            ticket_data = []
+            for ticket_type, (count, revenue_cents) in self.ticket_types.items():
+                ticket_data.append({
+                    'type': ticket_type,
+                    'count': count,
+                    'revenue': round(revenue_cents / 100.0, 2)
+                })
+
+            # Format event-specific monthly data for filtering
+            events_monthly_data = {}
+            for event_name, months in self.events_by_month_by_event.items():
+                attendees_by_month = self.attendees_by_month_by_event.get(event_name, {})
+                events_monthly_data[event_name] = [{
+                    'month': month,
+                    'events': months[month],
+                    'attendees': attendees_by_month.get(month, 0)
+                } for month in sorted(months)]
+
+            return {
+                'total_events': total_events,
+                'total_attendees': total_attendees,
+                'total_revenue': round(total_revenue, 2),
+                'avg_revenue_per_event': round(total_revenue / total_events, 2) if total_events > 0 else 0,
+                'avg_revenue_per_ticket': round(total_revenue / total_attendees, 2) if total_attendees > 0 else 0,
+                'unique_customers': unique_customers,
+                'new_customers': new_customer_count,
+                'repeat_customers': repeat_customer_count,
+                'repeat_customer_rate': round(repeat_customer_rate, 2),
+                'avg_customer_lifetime_value': round(avg_customer_lifetime_value, 2),
+                'avg_attendees_per_event': round(total_attendees / total_events, 2) if total_events > 0 else 0,
+                'monthly_trends': monthly_data,
+                'ticket_types': ticket_data,
+                'events_list': self._events_list(),
+                'events_monthly_data': events_monthly_data,
+                'top_customers': top_customers_data,
+                # Subscription behavior metrics
+                'pseudo_subscribers': pseudo_subscribers,
+                'pseudo_subscriber_rate': round(pseudo_subscriber_rate, 2),
+                'multi_show_buyers': multi_show_buyers,
+                # Capacity utilization metrics
+                'capacity_utilization': round(capacity_utilization, 2),
+                'total_capacity': self.total_capacity,
+                # Retention cohort metrics
+                'first_time_customers': first_time_customers,
+                'first_timer_retention_rate': round(first_timer_retention_rate, 2)
+            }
+
+    # Customers
+
+    def _customer_sort_values(self, sort, customers):
+        """Sort values for a list of customer ids"""
+        index = self.customer_index
+        if sort == 'email':
+            return [index.emails[customer] for customer in customers]
+        if sort in ('lifetime_value', 'total_events'):
+            tickets, cents = index.totals()
+            return (cents if sort == 'lifetime_value' else tickets)[customers].tolist()
+        last_seen = []
+        for customer in customers:
+            event_id = index.last_visit(customer)
+            last_seen.append(self._events[event_id]['start_local'] if event_id is not None else '')
+        return last_seen
+
+    def _sorted_customers(self, sort, customers):
+        """[(sort value, email)] for customer ids, ascending"""
+        emails = self.customer_index.emails
+        return sorted(zip(self._customer_sort_values(sort, customers), (emails[c] for c in customers)))
+
+    def _customer_index(self, sort):
+        """Customers sorted by (sort value, email), rebuilt lazily after customer changes"""
+        if self._indexed_version != self._customers_version:
+            self._customer_indexes = {}
+            self._indexed_version = self._customers_version
+        index = self._customer_indexes.get(sort)
+        if index is None:
+            index = self._sorted_customers(sort, self.customer_index.present().tolist())
+            self._customer_indexes[sort] = index
+        return index
+
+    def customers_page(self, sort='lifetime_value', cursor=None, limit=DEFAULT_CUSTOMERS_PAGE,
+                       email_prefix='', min_events=0):
+        """
+        One page of customer details, highest sort value first
+
+        email_prefix matches case-insensitively and min_events filters on
+        tickets bought. Pass the returned next_cursor back to get the page
+        after this one; it is None on the last page.
+        """
+        if sort not in CUSTOMER_SORTS:
+            raise ValueError(f"sort must be one of {', '.join(CUSTOMER_SORTS)}")
+        limit = max(1, min(limit, MAX_CUSTOMERS_PAGE))
+        after = decode_cursor(sort, cursor) if cursor else None
+
+        with self._lock:
+            customer_index = self.customer_index
+            if email_prefix:
+                # Range scan over the email index, then order just the matches
+                prefix = normalize_email(email_prefix)
+                by_email = self._customer_index('email')
+                matches = []
+                for email, _ in by_email[bisect_left(by_email, (prefix,)):]:
+                    if not email.startswith(prefix):
+                        break
+                    matches.append(customer_index.find(email))
+                index = self._sorted_customers(sort, matches)
+            else:
+                index = self._customer_index(sort)
+            if min_events > 1:
+                tickets, _ = customer_index.totals()
+                index = [key for key in index if tickets[customer_index.find(key[1])] >= min_events]
+
+            end = bisect_left(index, after) if after else len(index)
+            start = max(0, end - limit)
+            page = index[start:end][::-1]
+
+            customers = []
+            entries = {}
+            for _, email in page:
+                customer = customer_index.find(email)
+                history, months = self._customer_history(customer, entries)
+                customers.append({
+                    'email': email,
+                    'total_events': customer_index.tickets(customer),
+                    'lifetime_value': round(customer_index.cents(customer) / 100.0, 2),
+                    'last_seen': history[-1]['event_date'] if history else None,
+                    'event_months': months,
+                    'events': history
+                })
+
+            return {
+                'customers': customers,
+                'total': len(index),
+                'sort': sort,
+                'next_cursor': encode_cursor(sort, page[-1]) if start > 0 else None
+            }
+
+
+class InsightsRegistry:
+    """
+    One InsightsAggregator per org, built from the store on first use
+
+    Registered as an EventStore listener so every sync write is applied as
+    a delta to the aggregators already built.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._aggregators = {}
+        self._lock = threading.Lock()
+        store.add_listener(self)
+
+    def get(self, org_id):
+        with self._lock:
+            aggregator = self._aggregators.get(org_id)
+            if aggregator is None:
+                # Hold the store's write lock so no delta lands mid-build
+                with self.store.write_lock:
+                    events = self.store.get_events(org_id)
+                    aggregator = InsightsAggregator.from_columns(
+                        events, AttendeeColumns.from_store(self.store, org_id, events)
+                    )
+                self._aggregators[org_id] = aggregator
+            return aggregator
+
+    def events_changed(self, org_id, event_ids):
+        aggregator = self._aggregators.get(org_id)
+        if aggregator is None:
+            return
+        for event_id in event_ids:
+            event = self.store.get_event(event_id)
+            if event is not None:
+                aggregator.update_event(event)
+
+    def attendees_changed(self, event_id, removed, added):
+        for aggregator in list(self._aggregators.values()):
+            if aggregator.has_event(event_id):
+                if removed:
+                    aggregator.remove_attendees(event_id, summarize_rows(removed))
+                aggregator.add_attendees(event_id, summarize_rows(added))
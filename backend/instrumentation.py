@@ -0,0 +1,278 @@
+"""
+Per-request instrumentation: where a dashboard request's time went
+
+Opt-in (INSTRUMENTATION_ENABLED). Each request carries a RequestTrace in a
+context variable, which follows it into the attendee fan-out threads and,
+in ASGI mode, from the event loop into Flask. The hot paths report into
+whatever trace is current: phase timers (organizations, event_list,
+attendees, build, encode, prefetch), each upstream Eventbrite call with its
+status and duration, time spent backing off (rate limiter waits, 429
+pauses, retry sleeps) and response cache lookups. A finished trace goes out
+as the response's Server-Timing header and into per-route totals that
+/api/metrics serves as Prometheus text. With no trace current, every hook
+costs one context variable lookup.
+
+Phases can nest (attendees runs inside a route's sync), so they don't add
+up to the request's duration. Work outside a request, like the prefetcher,
+background syncs and a streamed response's body, isn't traced.
+"""
+import contextvars
+import math
+import re
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlparse
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)  # seconds
+ID_SEGMENT = re.compile(r'/\d+(?=/|$)')
+
+_current = contextvars.ContextVar('request_trace', default=None)
+
+
+def endpoint_label(url):
+    """Eventbrite URL as a low-cardinality label, like /events/{id}/attendees/"""
+    path = urlparse(url).path
+    _, marker, rest = path.partition('/v3/')
+    return ID_SEGMENT.sub('/{id}', '/' + rest if marker else path)
+
+
+class RequestTrace:
+    """Timers and counts for one request, safe to report into from several threads"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = Counter()  # phase -> seconds
+        self.upstream = Counter()  # (endpoint, status) -> calls
+        self.upstream_seconds = Counter()  # endpoint -> seconds
+        self.backoff_seconds = 0.0
+        self.cache = Counter()  # (cache, result) -> lookups
+        self._lock = threading.Lock()
+
+    def add_phase(self, name, seconds):
+        with self._lock:
+            self.phases[name] += seconds
+
+    def add_upstream(self, url, status, seconds):
+        endpoint = endpoint_label(url)
+        with self._lock:
+            self.upstream[(endpoint, str(status))] += 1
+            self.upstream_seconds[endpoint] += seconds
+
+    def add_backoff(self, seconds):
+        with self._lock:
+            self.backoff_seconds += seconds
+
+    def add_cache(self, cache, result):
+        with self._lock:
+            self.cache[(cache, result)] += 1
+
+    def server_timing(self, elapsed):
+        """Server-Timing header value, durations in milliseconds"""
+        with self._lock:
+            metrics = [f"total;dur={elapsed * 1000:.1f}"]
+            metrics += [f"{name};dur={seconds * 1000:.1f}" for name, seconds in self.phases.items()]
+            calls = sum(self.upstream.values())
+            if calls:
+                throttled = sum(n for (_, status), n in self.upstream.items() if status == '429')
+                desc = f"{calls} calls" + (f", {throttled} rate limited" if throttled else '')
+                metrics.append(f'upstream;dur={sum(self.upstream_seconds.values()) * 1000:.1f};desc="{desc}"')
+            if self.backoff_seconds:
+                metrics.append(f"backoff;dur={self.backoff_seconds * 1000:.1f}")
+            if self.cache:
+                results = Counter()
+                for (_, result), n in self.cache.items():
+                    results[result] += n
+                desc = ', '.join(f"{n} {result}" for result, n in sorted(results.items()))
+                metrics.append(f'cache;desc="{desc}"')
+            return ', '.join(metrics)
+
+
+class _Phase:
+    __slots__ = ('trace', 'name', 'started')
+
+    def __init__(self, trace, name):
+        self.trace = trace
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.trace.add_phase(self.name, time.perf_counter() - self.started)
+        return False
+
+
+class _NoPhase:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_PHASE = _NoPhase()
+
+
+# Hooks for the hot paths, no-ops without a current trace
+
+def current_trace():
+    return _current.get()
+
+
+def start_trace():
+    """Make a new trace current, returns the token end_trace takes"""
+    return _current.set(RequestTrace())
+
+
+def end_trace(token):
+    _current.reset(token)
+
+
+def phase(name):
+    """Context manager timing a phase of the current request"""
+    trace = _current.get()
+    return _NO_PHASE if trace is None else _Phase(trace, name)
+
+
+def record_upstream(url, status, seconds):
+    """One upstream call, status being the HTTP status or 'error'"""
+    trace = _current.get()
+    if trace is not None:
+        trace.add_upstream(url, status, seconds)
+
+
+def record_backoff(seconds):
+    trace = _current.get()
+    if trace is not None:
+        trace.add_backoff(seconds)
+
+
+def record_cache(cache, result):
+    """One cache lookup, result being hit, stale, miss or coalesced"""
+    trace = _current.get()
+    if trace is not None:
+        trace.add_cache(cache, result)
+
+
+# Prometheus text exposition
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + '}'
+
+
+def _sample_value(value):
+    """Counts exactly, seconds at full precision (a rounded counter breaks rate())"""
+    if isinstance(value, float):
+        if math.isinf(value) or math.isnan(value):
+            return {math.inf: '+Inf', -math.inf: '-Inf'}.get(value, 'NaN')
+        return float.__repr__(value)
+    return str(int(value))
+
+
+def format_metric(name, kind, help_text, samples):
+    """
+    One metric family in Prometheus text format
+
+    samples are (labels dict, value) pairs, or (suffix, labels, value)
+    triples for histogram _bucket/_sum/_count series.
+    """
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+    for sample in samples:
+        suffix, labels, value = sample if len(sample) == 3 else ('', *sample)
+        lines.append(f"{name}{suffix}{_labels(labels)} {_sample_value(value)}")
+    return '\n'.join(lines) + '\n'
+
+
+class RequestMetrics:
+    """Per-route totals of finished request traces"""
+
+    def __init__(self, buckets=DURATION_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._requests = Counter()  # (route, method, status) -> requests
+        self._durations = {}  # route -> [count per bucket..., +Inf count, sum]
+        self._phases = Counter()  # (route, phase) -> seconds
+        self._upstream = Counter()  # (route, endpoint, status) -> calls
+        self._upstream_seconds = Counter()  # (route, endpoint) -> seconds
+        self._backoff = Counter()  # route -> seconds
+        self._cache = Counter()  # (route, cache, result) -> lookups
+
+    def record(self, route, method, status, trace):
+        """Add a finished request's trace, returns its duration in seconds"""
+        elapsed = time.perf_counter() - trace.started
+        with trace._lock, self._lock:
+            self._requests[(route, method, str(status))] += 1
+            histogram = self._durations.setdefault(route, [0] * (len(self.buckets) + 1) + [0.0])
+            for i, bound in enumerate(self.buckets):
+                if elapsed <= bound:
+                    histogram[i] += 1
+            histogram[-2] += 1
+            histogram[-1] += elapsed
+            for name, seconds in trace.phases.items():
+                self._phases[(route, name)] += seconds
+            for (endpoint, upstream_status), calls in trace.upstream.items():
+                self._upstream[(route, endpoint, upstream_status)] += calls
+            for endpoint, seconds in trace.upstream_seconds.items():
+                self._upstream_seconds[(route, endpoint)] += seconds
+            if trace.backoff_seconds:
+                self._backoff[route] += trace.backoff_seconds
+            for (cache, result), lookups in trace.cache.items():
+                self._cache[(route, cache, result)] += lookups
+        return elapsed
+
+    def render(self):
+        """Every per-route series as Prometheus text"""
+        with self._lock:
+            histograms = []
+            for route, histogram in sorted(self._durations.items()):
+                histograms += [
+                    ('_bucket', {'route': route, 'le': str(bound)}, histogram[i])
+                    for i, bound in enumerate(self.buckets)
+                ]
+                histograms += [
+                    ('_bucket', {'route': route, 'le': '+Inf'}, histogram[-2]),
+                    ('_sum', {'route': route}, histogram[-1]),
+                    ('_count', {'route': route}, histogram[-2])
+                ]
+            return ''.join([
+                format_metric('dashboard_requests_total', 'counter', 'Requests served, by route and status', [
+                    ({'route': route, 'method': method, 'status': status}, n)
+                    for (route, method, status), n in sorted(self._requests.items())
+                ]),
+                format_metric('dashboard_request_duration_seconds', 'histogram', 'Request latency by route',
+                              histograms),
+                format_metric('dashboard_phase_seconds_total', 'counter',
+                              'Time spent per request phase (phases can nest)', [
+                                  ({'route': route, 'phase': name}, seconds)
+                                  for (route, name), seconds in sorted(self._phases.items())
+                              ]),
+                format_metric('dashboard_upstream_requests_total', 'counter',
+                              'Eventbrite calls made for requests, by endpoint and status', [
+                                  ({'route': route, 'endpoint': endpoint, 'status': status}, n)
+                                  for (route, endpoint, status), n in sorted(self._upstream.items())
+                              ]),
+                format_metric('dashboard_upstream_seconds_total', 'counter',
+                              'Time spent in Eventbrite calls made for requests', [
+                                  ({'route': route, 'endpoint': endpoint}, seconds)
+                                  for (route, endpoint), seconds in sorted(self._upstream_seconds.items())
+                              ]),
+                format_metric('dashboard_backoff_seconds_total', 'counter',
+                              'Time requests spent waiting on the rate limit, 429 pauses and retries', [
+                                  ({'route': route}, seconds) for route, seconds in sorted(self._backoff.items())
+                              ]),
+                format_metric('dashboard_request_cache_lookups_total', 'counter',
+                              'Cache lookups made for requests, by cache and result', [
+                                  ({'route': route, 'cache': cache, 'result': result}, n)
+                                  for (route, cache, result), n in sorted(self._cache.items())
+                              ])
+            ])
@@ -0,0 +1,93 @@
+"""
+Precomputed per-event metrics shared by the dashboard routes
+
+Attendee count, checked-in count and gross revenue per event are loaded
+from the store once per org, then kept current from the store's attendee
+deltas. Event performance, weekly sales and the weekly range report read
+these records instead of re-aggregating attendees on every request.
+"""
+import threading
+
+
+class EventMetrics:
+    """Headline numbers for one event's current attendee set"""
+    __slots__ = ('attendees', 'checked_in', 'revenue_cents')
+
+    def __init__(self, attendees=0, checked_in=0, revenue_cents=0):
+        self.attendees = attendees
+        self.checked_in = checked_in
+        self.revenue_cents = revenue_cents
+
+    @property
+    def revenue(self):
+        return self.revenue_cents / 100.0
+
+    def sell_through_rate(self, capacity):
+        return (self.attendees / capacity * 100) if capacity > 0 else 0
+
+    def check_in_rate(self):
+        return (self.checked_in / self.attendees * 100) if self.attendees > 0 else 0
+
+    def avg_ticket_price(self):
+        return self.revenue / self.attendees if self.attendees > 0 else 0
+
+    def apply(self, rows, sign):
+        """Add (sign=1) or remove (sign=-1) (email, ticket_class_name, gross_cents, checked_in) rows"""
+        for _, _, gross_cents, checked_in in rows:
+            self.attendees += sign
+            self.checked_in += sign if checked_in else 0
+            self.revenue_cents += sign * gross_cents
+
+
+class MetricsTable:
+    """
+    EventMetrics for every synced event of the orgs read so far
+
+    Registered as an EventStore listener, so each attendee write updates
+    the affected event's record in O(changed attendees).
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._metrics = {}  # event_id -> EventMetrics
+        self._orgs = {}  # org_id -> set of event ids
+        self._lock = threading.Lock()
+        store.add_listener(self)
+
+    def for_org(self, org_id):
+        """event_id -> EventMetrics for the org's synced events"""
+        with self._lock:
+            event_ids = self._orgs.get(org_id)
+            if event_ids is not None:
+                return {event_id: self._metrics[event_id] for event_id in event_ids}
+
+        # Load under the store's write lock (taken before ours, like every
+        # listener call) so no delta lands mid-load
+        with self.store.write_lock:
+            with self._lock:
+                if org_id not in self._orgs:
+                    loaded = self.store.event_metrics(org_id)
+                    for event_id, values in loaded.items():
+                        self._metrics[event_id] = EventMetrics(*values)
+                    self._orgs[org_id] = set(loaded)
+                return {event_id: self._metrics[event_id] for event_id in self._orgs[org_id]}
+
+    def get(self, event_id):
+        with self._lock:
+            return self._metrics.get(event_id)
+
+    def events_changed(self, org_id, event_ids):
+        pass  # Metrics depend only on attendees
+
+    def attendees_changed(self, event_id, removed, added):
+        with self._lock:
+            metrics = self._metrics.get(event_id)
+            if metrics is None:
+                # First attendee write for an event of an org already loaded
+                event = self.store.get_event(event_id)
+                if event is None or event['org_id'] not in self._orgs:
+                    return
+                metrics = self._metrics[event_id] = EventMetrics()
+                self._orgs[event['org_id']].add(event_id)
+            metrics.apply(removed, -1)
+            metrics.apply(added, 1)
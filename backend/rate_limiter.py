@@ -0,0 +1,199 @@
+"""
+Process-wide rate limiter for Eventbrite API calls
+
+A token bucket sized to Eventbrite's rolling hourly limit (~1000 requests
+per hour). Callers wait in a priority queue so interactive dashboard
+requests are served before background warm-ups, and background callers can
+never spend the last few tokens. A 429 (with or without Retry-After) pauses
+every caller at once.
+"""
+import contextvars
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 10
+
+DEFAULT_CAPACITY = 1000
+DEFAULT_WINDOW = 60 * 60  # seconds
+DEFAULT_BACKGROUND_RESERVE = 100
+MAX_BACKOFF = 10  # seconds, used when a 429 has no Retry-After
+QUEUED_RETRY = 0.05  # seconds, try_acquire's retry hint while queued threads go first
+
+_tally = contextvars.ContextVar('rate_limit_tally', default=None)
+
+
+class RateBudgetExhausted(Exception):
+    """Raised when a token can't be acquired within the caller's max wait"""
+
+    def __init__(self, retry_in):
+        self.retry_in = retry_in
+        super().__init__(
+            f"Eventbrite rate limit budget exhausted, retry in {int(retry_in) + 1}s"
+        )
+
+
+class TokenTally:
+    """Tokens taken inside one count_tokens() block"""
+    __slots__ = ('taken',)
+
+    def __init__(self):
+        self.taken = 0
+
+
+@contextmanager
+def count_tokens():
+    """
+    Count the tokens this context takes, yields a TokenTally
+
+    Work run in a copy of the context (like the attendee fan-out) counts
+    too; other callers sharing the limiter don't.
+    """
+    tally = TokenTally()
+    token = _tally.set(tally)
+    try:
+        yield tally
+    finally:
+        _tally.reset(token)
+
+
+class RateLimiter:
+    """Thread-safe token bucket with a priority queue of waiting callers"""
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, window=DEFAULT_WINDOW,
+                 background_reserve=DEFAULT_BACKGROUND_RESERVE):
+        self.capacity = capacity
+        self.window = window
+        self.refill_rate = capacity / window  # tokens per second
+        self.background_reserve = min(background_reserve, capacity - 1)
+        self._tokens = float(capacity)
+        self._last_refill = time.monotonic()
+        self._paused_until = 0.0
+        self._strikes = 0
+        self._calls = deque()  # monotonic timestamps of granted calls
+        self._waiters = []  # heap of (priority, seq)
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self.throttled = 0
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.refill_rate)
+        self._last_refill = now
+        while self._calls and self._calls[0] < now - self.window:
+            self._calls.popleft()
+
+    def _wait_time(self, priority, now):
+        """Seconds until a caller at this priority could take a token"""
+        floor = self.background_reserve if priority >= PRIORITY_BACKGROUND else 0
+        needed = floor + 1 - self._tokens
+        token_wait = needed / self.refill_rate if needed > 0 else 0
+        return max(token_wait, self._paused_until - now)
+
+    def _take(self, now):
+        self._tokens -= 1
+        self._calls.append(now)
+        tally = _tally.get()
+        if tally is not None:
+            tally.taken += 1
+
+    def acquire(self, priority=PRIORITY_INTERACTIVE, max_wait=None):
+        """
+        Take one token, blocking in priority order
+
+        Raises RateBudgetExhausted if the token won't be available within
+        max_wait seconds.
+        """
+        ticket = (priority, next(self._seq))
+        deadline = None if max_wait is None else time.monotonic() + max_wait
+        with self._cond:
+            heapq.heappush(self._waiters, ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    wait = self._wait_time(priority, now)
+                    if self._waiters[0] == ticket and wait <= 0:
+                        heapq.heappop(self._waiters)
+                        self._take(now)
+                        return
+                    if deadline is not None and now + wait > deadline:
+                        raise RateBudgetExhausted(wait)
+                    if self._waiters[0] != ticket:
+                        wait = None if deadline is None else deadline - now
+                    self._cond.wait(wait)
+            finally:
+                if ticket in self._waiters:
+                    self._waiters.remove(ticket)
+                    heapq.heapify(self._waiters)
+                self._cond.notify_all()
+
+    def try_acquire(self, priority=PRIORITY_INTERACTIVE):
+        """
+        Take one token without blocking, for callers that wait on an event loop
+
+        Returns 0 when a token was taken, otherwise the seconds to wait
+        before trying again. Threads already queued at the same or a higher
+        priority go first.
+        """
+        with self._cond:
+            now = time.monotonic()
+            self._refill(now)
+            wait = self._wait_time(priority, now)
+            if wait > 0:
+                return wait
+            if self._waiters and self._waiters[0][0] <= priority:
+                return QUEUED_RETRY
+            self._take(now)
+            return 0
+
+    def on_rate_limited(self, retry_after=None):
+        """
+        Record a 429 and pause every caller, returns the pause in seconds
+
+        Without a Retry-After header the pause grows exponentially with
+        consecutive 429s. The bucket is emptied since upstream says we're out.
+        """
+        with self._cond:
+            if retry_after is None:
+                retry_after = min(2 ** self._strikes, MAX_BACKOFF)
+            self._strikes += 1
+            self.throttled += 1
+            now = time.monotonic()
+            self._paused_until = max(self._paused_until, now + retry_after)
+            self._tokens = 0.0
+            self._last_refill = now
+            self._cond.notify_all()
+            return retry_after
+
+    def on_success(self):
+        with self._cond:
+            self._strikes = 0
+
+    def status(self):
+        """Snapshot of the remaining budget"""
+        with self._cond:
+            now = time.monotonic()
+            self._refill(now)
+            return {
+                'capacity': self.capacity,
+                'window_seconds': self.window,
+                'remaining': int(self._tokens),
+                'used_in_window': len(self._calls),
+                'background_reserve': self.background_reserve,
+                'paused_for': round(max(0.0, self._paused_until - now), 2),
+                'next_token_in': round(self._wait_time(PRIORITY_INTERACTIVE, now), 2),
+                'waiting': len(self._waiters),
+                'throttled': self.throttled
+            }
+
+
+def parse_retry_after(value):
+    """Parse a Retry-After header in seconds, None if missing or not numeric"""
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
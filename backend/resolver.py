@@ -0,0 +1,62 @@
+"""
+Shared organization and event-list resolution for the dashboard routes
+
+Every aggregate route needs the same two things: which org the request is
+for (the first organization when org_id isn't given) and that org's events
+in the local store. Both are shared between concurrent requests: the
+organizations call goes through the response cache, where simultaneous
+misses share one fetch, and event-list syncs for an org run one at a time,
+with later callers reusing the result instead of downloading it again.
+"""
+from instrumentation import phase
+from rate_limiter import PRIORITY_INTERACTIVE
+
+ORGANIZATIONS_TTL = 60 * 60  # seconds
+
+
+class OrgResolutionError(Exception):
+    """Raised when the request's organization can't be determined"""
+
+    def __init__(self, message, status_code):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class OrgResolver:
+    """Resolves request org ids and keeps their events synced into the store"""
+
+    def __init__(self, client, event_sync, ttl=ORGANIZATIONS_TTL):
+        self.client = client
+        self.event_sync = event_sync
+        self.ttl = ttl
+
+    def organizations(self, priority=PRIORITY_INTERACTIVE):
+        """Every organization the token can see, memoized for ttl seconds"""
+        with phase('organizations'):
+            data = self.client.get_json(
+                f"{self.client.base_url}/users/me/organizations/",
+                ttl=self.ttl,
+                priority=priority
+            )
+        if data is None:
+            raise OrgResolutionError('Failed to fetch organization', 500)
+        return data.get('organizations', [])
+
+    def resolve(self, org_id=None):
+        """The requested org id, or the user's first organization's"""
+        if org_id:
+            return org_id
+        organizations = self.organizations()
+        if not organizations:
+            raise OrgResolutionError('No organization found', 404)
+        return organizations[0]['id']
+
+    def resolve_synced(self, org_id=None, start_from=None, start_before=None):
+        """
+        Resolve the org and make sure its events are in the store
+
+        Pass the start window a request reads so a cold store fetches only that.
+        """
+        org_id = self.resolve(org_id)
+        self.event_sync.ensure_synced(org_id, start_from, start_before)
+        return org_id
@@ -0,0 +1,92 @@
+"""
+Fast, compressed JSON bodies for the large dashboard payloads
+
+Opt-in replacement for jsonify on the store-backed routes. Payloads are
+serialized with orjson (the standard json module when it isn't installed),
+compressed with brotli or gzip as the client's Accept-Encoding allows, and
+the resulting bytes are cached by the response's data ETag, so repeat hits
+on unchanged data skip building, encoding and compressing altogether. The
+ETag sent carries the content coding, so a cache never takes one coding's
+bytes for another's.
+"""
+import gzip
+import json
+
+from cache import TTLCache
+from instrumentation import phase
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+MIN_COMPRESS_BYTES = 1024  # Smaller bodies aren't worth compressing
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5  # Much faster than the default 11, bodies are only ~10% bigger
+DEFAULT_MAX_BODIES = 32
+BODY_TTL = 24 * 60 * 60  # seconds, bodies are keyed by ETag so they never go stale
+
+
+def dumps(payload):
+    """Compact, key-sorted JSON bytes, the same document jsonify produces"""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(payload, sort_keys=True, separators=(',', ':')).encode()
+
+
+def coded_etag(etag, encoding):
+    """The ETag for a body in a content encoding, each coding's bytes get their own strong tag"""
+    return etag if encoding == 'identity' else f"{etag}-{encoding}"
+
+
+def compress(body, encoding):
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    if encoding == 'gzip':
+        return gzip.compress(body, compresslevel=GZIP_LEVEL)
+    return body
+
+
+class EncodedBodies:
+    """
+    Serialized and compressed response bodies, keyed by data ETag and encoding
+
+    The uncompressed body is cached too, so a payload is built and
+    serialized once however many encodings it is served in.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_BODIES):
+        self._cache = TTLCache(max_entries=max_entries, name='bodies')
+        self.encodings = (['br'] if brotli is not None else []) + ['gzip']
+
+    def negotiate(self, accept_encodings):
+        """Best encoding for a request's Accept-Encoding, 'identity' when none fits"""
+        return accept_encodings.best_match(self.encodings, default='identity') or 'identity'
+
+    def etags(self, etag):
+        """Every tag a body for the data ETag can be sent with"""
+        return [etag] + [coded_etag(etag, encoding) for encoding in self.encodings]
+
+    def get(self, etag, encoding, build):
+        """(body bytes, content encoding) for the payload build() returns"""
+        def serialize():
+            payload = build()
+            with phase('encode'):
+                return dumps(payload)
+
+        def encode():
+            with phase('encode'):
+                return compress(body, encoding)
+
+        body = self._cache.get_or_fetch(f"{etag}:identity", serialize, BODY_TTL)
+        if encoding == 'identity' or len(body) < MIN_COMPRESS_BYTES:
+            return body, 'identity'
+        return self._cache.get_or_fetch(f"{etag}:{encoding}", encode, BODY_TTL), encoding
+
+    def stats(self):
+        return self._cache.stats()
@@ -0,0 +1,154 @@
+"""
+Background prefetch scheduler
+
+Keeps the local event store warm between dashboard visits so user requests
+never have to wait on Eventbrite. Each pass refreshes the org's event list,
+then re-syncs attendees for events that are due, using how soon the event
+starts to decide how often: shows in the next couple of days every pass,
+later shows less often, and past shows once more after they end (after
+which they're final and never fetched again).
+
+Calls run at background priority and are paced across the pass so the
+scheduler only ever uses a share of the hourly rate budget.
+"""
+import threading
+import time
+from datetime import datetime, timezone
+
+from rate_limiter import count_tokens, PRIORITY_BACKGROUND
+from sync import TIMESTAMP_FORMAT, seconds_since, utc_now
+
+DEFAULT_PREFETCH_INTERVAL = 2 * 60  # seconds between passes, keep it under the sync interval
+DEFAULT_BUDGET_SHARE = 0.5  # Share of the rate budget a pass may spend
+
+# (starts within seconds, refresh every seconds), first match wins
+REFRESH_TIERS = (
+    (2 * 24 * 60 * 60, 0),  # Next two days (or running now): every pass
+    (14 * 24 * 60 * 60, 30 * 60),
+    (None, 6 * 60 * 60)
+)
+
+# With webhooks delivering changes, polling is only a safety net for missed
+# deliveries: every event and the event list at most this often
+WEBHOOK_SAFETY_INTERVAL = 6 * 60 * 60
+WEBHOOK_REFRESH_TIERS = ((None, WEBHOOK_SAFETY_INTERVAL),)
+
+
+def seconds_until(timestamp):
+    start = datetime.strptime(timestamp, TIMESTAMP_FORMAT).replace(tzinfo=timezone.utc)
+    return (start - datetime.now(timezone.utc)).total_seconds()
+
+
+def refresh_interval(event, tiers=REFRESH_TIERS):
+    """Seconds between attendee refreshes for an event, None if it needs none"""
+    if event['attendees_final'] or event['status'] == 'draft':
+        return None
+    if event['attendees_synced_at'] is None:
+        return 0
+    if event['end_utc'] and event['end_utc'] < utc_now():
+        # Ended: one more sync to pick up last-minute changes, then it's final
+        return 0 if event['attendees_synced_at'] < event['end_utc'] else None
+    starts_in = seconds_until(event['start_utc']) if event['start_utc'] else None
+    for within, interval in tiers:
+        if within is None or (starts_in is not None and starts_in <= within):
+            return interval
+    return None
+
+
+def due_events(events, tiers=REFRESH_TIERS):
+    """Events whose attendees are due a refresh, soonest start first"""
+    due = []
+    for event in events:
+        interval = refresh_interval(event, tiers)
+        if interval is None:
+            continue
+        if event['attendees_synced_at'] is None or seconds_since(event['attendees_synced_at']) >= interval:
+            due.append(event)
+    now = utc_now()
+    # Upcoming shows first (soonest first), then past ones (most recent first)
+    upcoming = sorted((e for e in due if (e['start_utc'] or now) >= now), key=lambda e: e['start_utc'] or now)
+    past = sorted((e for e in due if (e['start_utc'] or now) < now), key=lambda e: e['start_utc'], reverse=True)
+    return upcoming + past
+
+
+class PrefetchScheduler:
+    """Daemon thread that refreshes the store on a fixed cadence"""
+
+    def __init__(self, event_sync, rate_limiter, org_resolver, org_ids=None,
+                 interval=DEFAULT_PREFETCH_INTERVAL, budget_share=DEFAULT_BUDGET_SHARE, webhooks=False):
+        self.event_sync = event_sync
+        self.store = event_sync.store
+        self.rate_limiter = rate_limiter
+        self.org_resolver = org_resolver
+        self.org_ids = org_ids  # None means every org the token can see
+        self.interval = interval
+        # Requests one pass may spend, and the spacing between them
+        self.budget = max(1, int(rate_limiter.refill_rate * interval * budget_share))
+        self.pace = interval / self.budget
+        # Webhooks (webhooks.py) report changes as they happen, so passes only poll as a safety net
+        self.tiers = WEBHOOK_REFRESH_TIERS if webhooks else REFRESH_TIERS
+        self.list_interval = WEBHOOK_SAFETY_INTERVAL if webhooks else 0
+        self._lists_refreshed = {}  # org_id -> monotonic time of the last event list refresh
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='prefetch', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                for org_id in self._orgs():
+                    self.prefetch(org_id)
+            except Exception as e:
+                print(f"Prefetch pass failed: {e}")
+            self._stop.wait(max(0, self.interval - (time.monotonic() - started)))
+
+    def _orgs(self):
+        if self.org_ids:
+            return self.org_ids
+        return [org['id'] for org in self.org_resolver.organizations(priority=PRIORITY_BACKGROUND)]
+
+    def _spend(self, tally):
+        """Wait out the pace for the calls in a count_tokens() tally, returns the count"""
+        used = max(1, tally.taken)
+        self._stop.wait(self.pace * used)
+        return used
+
+    def prefetch(self, org_id):
+        """
+        Refresh one org's event list and the attendees of its due events
+
+        Marks the org synced when every due event was refreshed, so user
+        requests read the store instead of starting a sync of their own.
+        """
+        started = utc_now()
+        budget = self.budget
+        refreshed = self._lists_refreshed.get(org_id)
+        if refreshed is None or time.monotonic() - refreshed >= self.list_interval:
+            # Only the pass's own calls count, not user requests sharing the limiter
+            with count_tokens() as tally:
+                self.event_sync.refresh_event_list(org_id, priority=PRIORITY_BACKGROUND)
+            self._lists_refreshed[org_id] = time.monotonic()
+            budget -= self._spend(tally)
+
+        due = due_events(self.store.events_needing_attendee_sync(org_id), self.tiers)
+        complete = True
+        for event in due:
+            if budget <= 0 or self._stop.is_set():
+                complete = False  # The rest wait for the next pass
+                break
+            with count_tokens() as tally:
+                synced = self.event_sync.sync_event(org_id, event['id'], priority=PRIORITY_BACKGROUND)
+            if not synced:
+                complete = False
+            budget -= self._spend(tally)
+
+        if complete:
+            self.store.mark_org_synced(org_id, started)
@@ -0,0 +1,481 @@
+"""
+Local SQLite store for Eventbrite events, ticket classes and attendees
+
+The dashboard routes read from here instead of the live API. sync.py keeps
+it up to date incrementally.
+"""
+import os
+import sqlite3
+import threading
+from collections import defaultdict
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'nova_events.db')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id TEXT PRIMARY KEY,
+    org_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    start_local TEXT NOT NULL,
+    start_utc TEXT,
+    end_local TEXT,
+    end_utc TEXT,
+    status TEXT,
+    url TEXT,
+    capacity INTEGER NOT NULL DEFAULT 0,
+    is_free INTEGER NOT NULL DEFAULT 0,
+    changed TEXT,
+    attendees_synced_at TEXT,             -- UTC time the last attendee sync started
+    attendees_final INTEGER NOT NULL DEFAULT 0  -- Synced after the event ended, never refetch
+);
+CREATE INDEX IF NOT EXISTS events_org_start ON events (org_id, start_local);
+
+CREATE TABLE IF NOT EXISTS ticket_classes (
+    event_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    PRIMARY KEY (event_id, id)
+);
+
+CREATE TABLE IF NOT EXISTS attendees (
+    id TEXT PRIMARY KEY,
+    event_id TEXT NOT NULL,
+    ticket_class_id TEXT,
+    email TEXT NOT NULL DEFAULT '',
+    first_name TEXT NOT NULL DEFAULT '',
+    last_name TEXT NOT NULL DEFAULT '',
+    status TEXT NOT NULL DEFAULT '',
+    created TEXT NOT NULL DEFAULT '',
+    quantity INTEGER NOT NULL DEFAULT 1,
+    checked_in INTEGER NOT NULL DEFAULT 0,
+    gross_cents INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS attendees_event ON attendees (event_id);
+
+CREATE TABLE IF NOT EXISTS org_sync (
+    org_id TEXT PRIMARY KEY,
+    synced_at TEXT NOT NULL
+);
+
+-- Progress of a full sync still running or cut short, so it can resume
+CREATE TABLE IF NOT EXISTS sync_checkpoints (
+    org_id TEXT PRIMARY KEY,
+    started_at TEXT NOT NULL,             -- UTC start of the run; attendees synced since are done
+    continuation TEXT,                    -- Next event list page, NULL once the list is complete
+    list_complete INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+SQL_BATCH_SIZE = 500  # Max ids per IN (...) query
+
+EVENT_COLUMNS = (
+    'id', 'org_id', 'name', 'start_local', 'start_utc', 'end_local', 'end_utc', 'status',
+    'url', 'capacity', 'is_free', 'changed', 'attendees_synced_at', 'attendees_final'
+)
+
+UPSERT_EVENT = """
+INSERT INTO events (id, org_id, name, start_local, start_utc, end_local, end_utc,
+                    status, url, capacity, is_free, changed)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (id) DO UPDATE SET
+    org_id = excluded.org_id, name = excluded.name,
+    start_local = excluded.start_local, start_utc = excluded.start_utc,
+    end_local = excluded.end_local, end_utc = excluded.end_utc,
+    status = excluded.status, url = excluded.url, capacity = excluded.capacity,
+    is_free = excluded.is_free, changed = excluded.changed
+WHERE (events.org_id, events.name, events.start_local, events.start_utc,
+       events.end_local, events.end_utc, events.status, events.url,
+       events.capacity, events.is_free, events.changed)
+  IS NOT (excluded.org_id, excluded.name, excluded.start_local, excluded.start_utc,
+          excluded.end_local, excluded.end_utc, excluded.status, excluded.url,
+          excluded.capacity, excluded.is_free, excluded.changed)
+"""
+
+
+def _event_row(org_id, event):
+    return (
+        event['id'],
+        org_id,
+        event['name']['text'],
+        event['start']['local'],
+        event['start'].get('utc'),
+        event.get('end', {}).get('local'),
+        event.get('end', {}).get('utc'),
+        event.get('status', ''),
+        event.get('url', ''),
+        event.get('capacity') or 0,
+        1 if event.get('is_free', False) else 0,
+        event.get('changed')
+    )
+
+
+def _attendee_row(event_id, attendee):
+    profile = attendee.get('profile', {})
+    ticket_class_name = attendee.get('ticket_class_name') or 'Unknown'
+    return (
+        attendee['id'],
+        event_id,
+        attendee.get('ticket_class_id') or ticket_class_name,
+        profile.get('email', '') or '',
+        profile.get('first_name', '') or '',
+        profile.get('last_name', '') or '',
+        attendee.get('status', '') or '',
+        attendee.get('created', '') or '',
+        attendee.get('quantity', 1),
+        1 if attendee.get('checked_in', False) else 0,
+        attendee.get('costs', {}).get('gross', {}).get('value', 0)
+    ), ticket_class_name
+
+
+def _is_cancelled(attendee):
+    return attendee.get('cancelled', False) or attendee.get('refunded', False)
+
+
+class AttendeeRows:
+    """
+    One event's attendee stream, reduced to compact rows as it is read
+
+    Each attendee becomes its row (or a deletion, for a cancellation in a
+    changes stream) the moment it arrives, and a later version replaces an
+    earlier one, so memory grows with the event's attendees, never with
+    the raw JSON of its pages. The reduction happens before the write
+    transaction opens, so slow upstream pages never hold the database lock.
+    """
+
+    def __init__(self, event_id, replace):
+        self.event_id = event_id
+        self.replace = replace  # A full stream replaces the event's attendee set
+        self.latest = {}  # attendee id -> (row, ticket_class_name), or None to delete
+
+    def add(self, attendee):
+        if not self.replace and _is_cancelled(attendee):
+            self.latest[attendee['id']] = None
+        else:
+            self.latest[attendee['id']] = _attendee_row(self.event_id, attendee)
+
+    def extend(self, attendees):
+        for attendee in attendees:
+            self.add(attendee)
+        return self
+
+
+class EventStore:
+    """
+    SQLite-backed store with one connection per thread
+
+    Listeners registered with add_listener are told about every write, while
+    the write lock is still held, through events_changed(org_id, event_ids)
+    and attendees_changed(event_id, removed, added). event_ids are the events
+    the write added or changed; removed/added are (email, ticket_class_name,
+    gross_cents, checked_in) rows.
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        self.write_lock = threading.RLock()
+        self.listeners = []
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    # Events
+
+    def upsert_events(self, org_id, events):
+        """
+        Insert or update events, keeping their attendee sync state
+
+        Rows that are unchanged aren't rewritten, and listeners are only
+        told about the events that were added or changed.
+        """
+        rows = [_event_row(org_id, event) for event in events]
+        with self.write_lock:
+            with self._connect() as conn:
+                # Row by row, so the rowcount says which events were written
+                changed = [row[0] for row in rows if conn.execute(UPSERT_EVENT, row).rowcount]
+            if changed:
+                for listener in self.listeners:
+                    listener.events_changed(org_id, changed)
+
+    def get_events(self, org_id, start_from=None, start_before=None, order='DESC', statuses=None):
+        """
+        Return an org's events as dicts ordered by start time
+
+        start_from (inclusive) and start_before (exclusive) bound start_local
+        as ISO date or datetime strings; statuses limits to those statuses.
+        """
+        query = f"SELECT {', '.join(EVENT_COLUMNS)} FROM events WHERE org_id = ?"
+        args = [org_id]
+        if start_from is not None:
+            query += " AND start_local >= ?"
+            args.append(start_from)
+        if start_before is not None:
+            query += " AND start_local < ?"
+            args.append(start_before)
+        if statuses:
+            query += f" AND status IN ({', '.join('?' * len(statuses))})"
+            args.extend(statuses)
+        query += f" ORDER BY start_local {'ASC' if order == 'ASC' else 'DESC'}, id"
+        return [dict(row) for row in self._connect().execute(query, args)]
+
+    def get_event(self, event_id):
+        row = self._connect().execute(
+            f"SELECT {', '.join(EVENT_COLUMNS)} FROM events WHERE id = ?", (event_id,)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def events_needing_attendee_sync(self, org_id):
+        """Published events whose attendee list may still change"""
+        return [dict(row) for row in self._connect().execute(f"""
+            SELECT {', '.join(EVENT_COLUMNS)} FROM events
+            WHERE org_id = ? AND status != 'draft' AND attendees_final = 0
+            ORDER BY start_local DESC
+        """, (org_id,))]
+
+    def mark_attendees_synced(self, event_id, synced_at, final):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE events SET attendees_synced_at = ?, attendees_final = ? WHERE id = ?",
+                (synced_at, 1 if final else 0, event_id)
+            )
+
+    # Attendees
+
+    def write_attendees(self, attendees):
+        """Write an AttendeeRows reduction of one event's attendee stream"""
+        event_id, replace = attendees.event_id, attendees.replace
+        rows = []
+        deleted = []
+        ticket_classes = {}
+        for attendee_id, reduced in attendees.latest.items():
+            if reduced is None:
+                deleted.append((attendee_id,))
+                continue
+            row, ticket_class_name = reduced
+            ticket_classes[row[2]] = ticket_class_name
+            rows.append(row)
+
+        with self.write_lock:
+            removed = []
+            if self.listeners:
+                removed = self._delta_rows(event_id, replace, [r[0] for r in rows] + [d[0] for d in deleted])
+
+            with self._connect() as conn:
+                if replace:
+                    conn.execute("DELETE FROM attendees WHERE event_id = ?", (event_id,))
+                conn.executemany("DELETE FROM attendees WHERE id = ?", deleted)
+                conn.executemany(
+                    "INSERT OR REPLACE INTO attendees VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+                )
+                conn.executemany(
+                    "INSERT OR REPLACE INTO ticket_classes (event_id, id, name) VALUES (?, ?, ?)",
+                    [(event_id, class_id, name) for class_id, name in ticket_classes.items()]
+                )
+
+            if self.listeners:
+                added = [(r[3], ticket_classes[r[2]], r[10], r[9]) for r in rows]
+                for listener in self.listeners:
+                    listener.attendees_changed(event_id, removed, added)
+
+    def _delta_rows(self, event_id, replace, attendee_ids):
+        """Current rows a write is about to replace, as (email, ticket_class_name, gross_cents, checked_in)"""
+        query = """
+            SELECT a.email, COALESCE(t.name, 'Unknown'), a.gross_cents, a.checked_in
+            FROM attendees a
+            LEFT JOIN ticket_classes t ON t.event_id = a.event_id AND t.id = a.ticket_class_id
+        """
+        conn = self._connect()
+        if replace:
+            return conn.execute(query + " WHERE a.event_id = ?", (event_id,)).fetchall()
+
+        rows = []
+        for i in range(0, len(attendee_ids), SQL_BATCH_SIZE):
+            batch = attendee_ids[i:i + SQL_BATCH_SIZE]
+            rows.extend(conn.execute(
+                query + f" WHERE a.id IN ({', '.join('?' * len(batch))})", batch
+            ).fetchall())
+        return rows
+
+    def replace_attendees(self, event_id, attendees):
+        """Replace an event's attendee set with a full (attending-only) stream"""
+        self.write_attendees(AttendeeRows(event_id, replace=True).extend(attendees))
+
+    def apply_attendee_changes(self, event_id, attendees):
+        """Apply a changed_since stream: upsert attendees, delete cancelled/refunded ones"""
+        self.write_attendees(AttendeeRows(event_id, replace=False).extend(attendees))
+
+    def get_attendees(self, event_id):
+        return [dict(row) for row in self._connect().execute("""
+            SELECT a.id, a.first_name, a.last_name, a.email, a.created, a.status,
+                   COALESCE(t.name, '') AS ticket_class_name, a.quantity, a.checked_in
+            FROM attendees a
+            LEFT JOIN ticket_classes t ON t.event_id = a.event_id AND t.id = a.ticket_class_id
+            WHERE a.event_id = ?
+            ORDER BY a.rowid
+        """, (event_id,))]
+
+    @staticmethod
+    def _event_scope(org_id, event_ids):
+        scope = "e.org_id = ?"
+        args = [org_id]
+        if event_ids is not None:
+            scope += f" AND e.id IN ({', '.join('?' * len(event_ids))})"
+            args.extend(event_ids)
+        return scope, args
+
+    def event_metrics(self, org_id, event_ids=None):
+        """
+        Headline attendee numbers for an org's synced events
+
+        Returns event_id -> (attendees, checked_in, revenue_cents). Events
+        whose attendees were never synced are absent.
+        """
+        scope, args = self._event_scope(org_id, event_ids)
+        conn = self._connect()
+        metrics = {
+            row['id']: (0, 0, 0) for row in conn.execute(f"""
+                SELECT e.id FROM events e WHERE {scope} AND e.attendees_synced_at IS NOT NULL
+            """, args)
+        }
+        for event_id, count, checked_in, revenue_cents in conn.execute(f"""
+            SELECT a.event_id, COUNT(*), SUM(a.checked_in), SUM(a.gross_cents)
+            FROM attendees a JOIN events e ON e.id = a.event_id
+            WHERE {scope}
+            GROUP BY a.event_id
+        """, args):
+            if event_id in metrics:
+                metrics[event_id] = (count, checked_in, revenue_cents)
+        return metrics
+
+    def event_summaries(self, org_id, event_ids=None):
+        """
+        Per-event attendee rollups for an org's synced events
+
+        Returns event_id -> summary dict with attendees, checked_in,
+        revenue_cents, ticket_types (name -> [count, revenue cents]) and
+        customers (email -> [tickets, revenue cents]). Events whose attendees
+        were never synced are absent. event_ids limits the rollup to those
+        events.
+        """
+        conn = self._connect()
+        scope, args = self._event_scope(org_id, event_ids)
+
+        summaries = {}
+        for event_id, (count, checked_in, revenue_cents) in self.event_metrics(org_id, event_ids).items():
+            summaries[event_id] = {
+                'attendees': count,
+                'checked_in': checked_in,
+                'revenue_cents': revenue_cents,
+                'ticket_types': defaultdict(lambda: [0, 0]),
+                'customers': defaultdict(lambda: [0, 0])
+            }
+
+        for event_id, name, count, revenue_cents in conn.execute(f"""
+            SELECT a.event_id, COALESCE(t.name, 'Unknown'), COUNT(*), SUM(a.gross_cents)
+            FROM attendees a
+            JOIN events e ON e.id = a.event_id
+            LEFT JOIN ticket_classes t ON t.event_id = a.event_id AND t.id = a.ticket_class_id
+            WHERE {scope}
+            GROUP BY a.event_id, a.ticket_class_id
+            ORDER BY a.event_id, MIN(a.rowid)
+        """, args):
+            if event_id in summaries:
+                ticket_type = summaries[event_id]['ticket_types'][name]
+                ticket_type[0] += count
+                ticket_type[1] += revenue_cents
+
+        for event_id, email, tickets, revenue_cents in conn.execute(f"""
+            SELECT a.event_id, a.email, COUNT(*), SUM(a.gross_cents)
+            FROM attendees a JOIN events e ON e.id = a.event_id
+            WHERE {scope} AND a.email != ''
+            GROUP BY a.event_id, a.email
+            ORDER BY a.event_id, MIN(a.rowid)
+        """, args):
+            if event_id in summaries:
+                summaries[event_id]['customers'][email] = [tickets, revenue_cents]
+
+        return summaries
+
+    def org_attendee_rows(self, org_id):
+        """
+        Every attendee of an org's synced events in one scan
+
+        Returns (event_id, ticket_class_id, email, gross_cents, checked_in,
+        rowid) tuples, unordered, for loading into analytics.AttendeeColumns.
+        Ticket class names come from org_ticket_classes, joining them here
+        per row makes the scan much slower.
+        """
+        cursor = self._connect().cursor()
+        cursor.row_factory = None  # Plain tuples, this is the largest read the app makes
+        return cursor.execute("""
+            SELECT event_id, ticket_class_id, email, gross_cents, checked_in, rowid
+            FROM attendees
+            WHERE event_id IN (
+                SELECT id FROM events WHERE org_id = ? AND attendees_synced_at IS NOT NULL
+            )
+        """, (org_id,)).fetchall()
+
+    def org_ticket_classes(self, org_id):
+        """(event_id, ticket_class_id) -> name for an org's events"""
+        return {
+            (event_id, class_id): name for event_id, class_id, name in self._connect().execute("""
+                SELECT t.event_id, t.id, t.name
+                FROM ticket_classes t JOIN events e ON e.id = t.event_id
+                WHERE e.org_id = ?
+            """, (org_id,))
+        }
+
+    # Org sync bookkeeping
+
+    def org_synced_at(self, org_id):
+        row = self._connect().execute(
+            "SELECT synced_at FROM org_sync WHERE org_id = ?", (org_id,)
+        ).fetchone()
+        return row['synced_at'] if row else None
+
+    def mark_org_synced(self, org_id, synced_at):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO org_sync (org_id, synced_at) VALUES (?, ?)",
+                (org_id, synced_at)
+            )
+
+    def sync_checkpoint(self, org_id):
+        """The org's unfinished sync run as a dict, or None"""
+        row = self._connect().execute(
+            "SELECT started_at, continuation, list_complete FROM sync_checkpoints WHERE org_id = ?",
+            (org_id,)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def save_sync_checkpoint(self, org_id, started_at, continuation=None, list_complete=False):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO sync_checkpoints (org_id, started_at, continuation, list_complete) "
+                "VALUES (?, ?, ?, ?)",
+                (org_id, started_at, continuation, 1 if list_complete else 0)
+            )
+
+    def clear_sync_checkpoint(self, org_id):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM sync_checkpoints WHERE org_id = ?", (org_id,))
+
+    def events_missing_attendees(self, org_id):
+        """Published events whose attendees have never been synced, newest first"""
+        return [dict(row) for row in self._connect().execute("""
+            SELECT id, name, start_local FROM events
+            WHERE org_id = ? AND status != 'draft' AND attendees_synced_at IS NULL
+            ORDER BY start_local DESC
+        """, (org_id,))]
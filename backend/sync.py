@@ -0,0 +1,358 @@
+"""
+Incremental sync from Eventbrite into the local event store
+
+The org's event list is refreshed on every sync (a few pages). Attendees
+are pulled in full the first time an event is seen, then only what changed
+since the previous sync (changed_since). Once an event has been synced after
+it ended it is marked final and never fetched again.
+"""
+import threading
+from collections import defaultdict
+from datetime import datetime, timezone
+
+from eventbrite_client import UpstreamFetchError
+from fanout import map_concurrently
+from instrumentation import phase
+from rate_limiter import RateBudgetExhausted, PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND
+from store import AttendeeRows
+
+TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%SZ'  # Eventbrite's UTC format
+DEFAULT_SYNC_INTERVAL = 5 * 60  # seconds
+EVENT_LIST_PARAMS = {'status': 'all', 'order_by': 'start_desc'}
+
+
+def utc_now():
+    return datetime.now(timezone.utc).strftime(TIMESTAMP_FORMAT)
+
+
+def _range_bound(value):
+    """ISO date or datetime as Eventbrite's start_date.range_* format"""
+    return value if 'T' in value else value + 'T00:00:00'
+
+
+def range_params(start_from, start_before=None):
+    """Event list params for events starting in [start_from, start_before), newest first"""
+    params = dict(EVENT_LIST_PARAMS, **{'start_date.range_start': _range_bound(start_from)})
+    if start_before is not None:
+        params['start_date.range_end'] = _range_bound(start_before)
+    return params
+
+
+def seconds_since(timestamp):
+    then = datetime.strptime(timestamp, TIMESTAMP_FORMAT).replace(tzinfo=timezone.utc)
+    return (datetime.now(timezone.utc) - then).total_seconds()
+
+
+class EventSync:
+    """
+    Keeps an EventStore in step with Eventbrite, one org at a time
+
+    The store bookkeeping around each upstream step (run checkpoints, event
+    list pages, attendee writes) is in its own method, which
+    async_sync.AsyncEventSync shares to make the same calls on an event loop.
+    """
+
+    def __init__(self, store, client, workers=8, interval=DEFAULT_SYNC_INTERVAL):
+        self.store = store
+        self.client = client
+        self.workers = workers
+        self.interval = interval
+        self._org_locks = defaultdict(threading.Lock)
+        self._window_locks = defaultdict(threading.Lock)  # (org_id, start_from, start_before) -> lock
+        self._guard = threading.Lock()
+        self._background = set()
+        self._ranges = {}  # (org_id, start_from, start_before) -> when sync_range last fetched it all
+
+    def org_lock(self, org_id):
+        """The lock every sync of the org holds, except window syncs"""
+        with self._guard:
+            return self._org_locks[org_id]
+
+    def window_lock(self, org_id, start_from, start_before):
+        """
+        The lock a window sync holds instead of the org lock
+
+        A cold store's first full sync holds the org lock for the whole
+        history download, so windows don't wait for it, only for another
+        sync of the same window. The store serializes the writes; an event
+        both fetch just has its attendees written twice.
+        """
+        with self._guard:
+            return self._window_locks[(org_id, start_from, start_before)]
+
+    def is_fresh(self, org_id):
+        synced_at = self.store.org_synced_at(org_id)
+        return synced_at is not None and seconds_since(synced_at) < self.interval
+
+    def sync(self, org_id, priority=PRIORITY_INTERACTIVE, force=False, on_synced=None):
+        """
+        Pull the org's event list and any attendee changes into the store
+
+        Concurrent calls for the same org wait for the running sync instead
+        of starting another. on_synced(event_id) is called (from a worker
+        thread) as each event's attendees land. Returns the number of events
+        whose attendees could not be fetched (they are retried on the next
+        sync).
+
+        Progress is checkpointed in the store: event list pages as they
+        arrive, and each event once its attendees are written. A run cut
+        short by the rate limit, an upstream failure or a restart resumes
+        from there on the next call instead of starting over; one that ran
+        out of interactive rate budget resumes in the background right away.
+        """
+        with self.org_lock(org_id):
+            checkpoint = self.start_run(org_id, force)
+            if checkpoint is None:
+                return 0
+            started = checkpoint['started_at']
+
+            def sync_one(event):
+                synced = self.sync_event_attendees(event, priority)
+                if synced and on_synced is not None:
+                    on_synced(event['id'])
+                return synced
+
+            try:
+                if not checkpoint['list_complete']:
+                    with phase('event_list'):
+                        self._refresh_event_list(org_id, priority, started, checkpoint['continuation'])
+                pending = self.pending_attendee_syncs(org_id, started)
+                with phase('attendees'):
+                    results = map_concurrently(sync_one, pending, self.workers)
+            except RateBudgetExhausted:
+                if priority != PRIORITY_BACKGROUND:
+                    self.sync_in_background(org_id)
+                raise
+
+            return self.finish_run(org_id, started, results)
+
+    def start_run(self, org_id, force=False):
+        """
+        The checkpoint a full sync runs from, call with the org lock held
+
+        An unfinished run's checkpoint, or a new one. None when there's
+        nothing to do: no unfinished run and a fresh store (unless force).
+        """
+        checkpoint = self.store.sync_checkpoint(org_id)
+        if not force and checkpoint is None and self.is_fresh(org_id):
+            return None
+        if checkpoint is None:
+            checkpoint = {'started_at': utc_now(), 'continuation': None, 'list_complete': 0}
+            self.store.save_sync_checkpoint(org_id, checkpoint['started_at'])
+        return checkpoint
+
+    def pending_attendee_syncs(self, org_id, started):
+        """Events whose attendees the run started at started still has to sync"""
+        # Events already synced by this run (before a restart or pause) are done
+        return [
+            event for event in self.store.events_needing_attendee_sync(org_id)
+            if event['attendees_synced_at'] is None or event['attendees_synced_at'] < started
+        ]
+
+    def finish_run(self, org_id, started, results):
+        """Mark a full sync done given each pending event's result, returns the failures"""
+        self.store.mark_org_synced(org_id, started)
+        self.store.clear_sync_checkpoint(org_id)
+        failed = results.count(False)
+        if failed:
+            print(f"Sync of org {org_id} finished without attendees for {failed} events")
+        return failed
+
+    def _refresh_event_list(self, org_id, priority, started=None, continuation=None):
+        """
+        Page the org's event list into the store, from continuation when resuming
+
+        With started (a checkpointed run), every stored page is followed by
+        a checkpoint of the next page's continuation.
+        """
+        pages = self.client.iter_pages(
+            f"{self.client.base_url}/organizations/{org_id}/events/",
+            params=EVENT_LIST_PARAMS,
+            priority=priority,
+            use_cache=False,
+            continuation=continuation
+        )
+        try:
+            for data, next_continuation in pages:
+                self.store_event_page(org_id, data, started, next_continuation)
+                continuation = None  # The checkpointed token worked
+        except UpstreamFetchError:
+            self.event_list_failed(org_id, started, continuation)
+            raise
+
+    def store_event_page(self, org_id, data, started=None, next_continuation=None):
+        """Write one event list page, then checkpoint the next page's continuation for a run"""
+        self.store.upsert_events(org_id, data.get('events', []))
+        if started is not None:
+            self.store.save_sync_checkpoint(
+                org_id, started, next_continuation, list_complete=next_continuation is None
+            )
+
+    def event_list_failed(self, org_id, started, continuation):
+        """A run's event list page failed; a resumed continuation may have expired"""
+        if continuation and started is not None:
+            # Continuations expire; the next run lists from the first page
+            self.store.save_sync_checkpoint(org_id, started)
+
+    def sync_range(self, org_id, start_from, start_before=None, priority=PRIORITY_INTERACTIVE):
+        """
+        Pull just the events starting in [start_from, start_before) and their attendees
+
+        For reports on a store that hasn't done its first full sync. The
+        window is sent upstream as a start_date range, and pagination
+        (newest first) stops once events start before the window, so a week
+        costs a page or two instead of the org's whole history. Returns the
+        number of events whose attendees could not be fetched.
+        """
+        with self.window_lock(org_id, start_from, start_before):
+            # A full sync, or another request for the window, may have finished while we waited
+            if self.store.org_synced_at(org_id) is not None or self.range_is_fresh(org_id, start_from, start_before):
+                return 0
+
+            events = []
+            with phase('event_list'):
+                for event in self.client.iter_paginated(
+                    f"{self.client.base_url}/organizations/{org_id}/events/",
+                    'events',
+                    params=range_params(start_from, start_before),
+                    priority=priority,
+                    use_cache=False
+                ):
+                    # Checked here too, in case upstream ignores the range
+                    start_local = event['start']['local']
+                    if start_local < start_from:
+                        break
+                    if start_before is None or start_local < start_before:
+                        events.append(event)
+                self.store.upsert_events(org_id, events)
+
+            pending = self.pending_range_syncs(org_id, start_from, start_before)
+            with phase('attendees'):
+                results = map_concurrently(
+                    lambda event: self.sync_event_attendees(event, priority),
+                    pending,
+                    self.workers
+                )
+            return self.finish_range(org_id, start_from, start_before, results)
+
+    def pending_range_syncs(self, org_id, start_from, start_before):
+        """Events in a window whose attendees may still change"""
+        return [
+            event for event in self.store.get_events(org_id, start_from, start_before)
+            if event['status'] != 'draft' and not event['attendees_final']
+        ]
+
+    def finish_range(self, org_id, start_from, start_before, results):
+        """Remember a window whose attendees all synced, returns the failures"""
+        failed = results.count(False)
+        if not failed:
+            with self._guard:
+                self._ranges[(org_id, start_from, start_before)] = utc_now()
+        return failed
+
+    def refresh_event_list(self, org_id, priority=PRIORITY_INTERACTIVE):
+        """Pull just the org's event list into the store"""
+        with self.org_lock(org_id):
+            self._refresh_event_list(org_id, priority)
+
+    def sync_event(self, org_id, event_id, priority=PRIORITY_INTERACTIVE, force=False):
+        """Sync one event's attendees, unless they are already final (or force)"""
+        with self.org_lock(org_id):
+            # Re-read under the lock, a full sync may have just covered it
+            event = self.store.get_event(event_id)
+            if event is None or (event['attendees_final'] and not force):
+                return True
+            return self.sync_event_attendees(event, priority)
+
+    def sync_event_attendees(self, event, priority=PRIORITY_INTERACTIVE):
+        """Fetch one event's attendees (in full, or changes since its last sync)"""
+        started = utc_now()
+        url, params = self.attendee_request(event)
+        try:
+            attendees = self.attendee_rows(event).extend(self.client.iter_paginated(
+                url, 'attendees', params=params, priority=priority, use_cache=False
+            ))
+        except UpstreamFetchError as e:
+            print(f"Attendee sync failed for event {event['id']}: {e}")
+            return False
+        self.store_attendees(event, attendees, started)
+        return True
+
+    def attendee_request(self, event):
+        """(url, params) of an event's attendee sync"""
+        url = f"{self.client.base_url}/events/{event['id']}/attendees/"
+        if event['attendees_synced_at'] is None:
+            return url, {'status': 'attending'}
+        # Every status, so cancellations and refunds show up as changes
+        return url, {'changed_since': event['attendees_synced_at']}
+
+    def attendee_rows(self, event):
+        """AttendeeRows to reduce an attendee_request stream into as its pages arrive"""
+        # A first sync is the full attending list, later ones are changes
+        return AttendeeRows(event['id'], replace=event['attendees_synced_at'] is None)
+
+    def store_attendees(self, event, attendees, started):
+        """Write an event's attendee_rows and mark the event synced as of started"""
+        self.store.write_attendees(attendees)
+        # A sync that started after the event ended is the last one it needs
+        final = bool(event['end_utc']) and event['end_utc'] < started
+        self.store.mark_attendees_synced(event['id'], started, final)
+
+    def status(self, org_id):
+        """
+        How complete the org's store data is
+
+        missing_events are published events whose attendees were never
+        synced; anything aggregated from the store leaves them out until a
+        sync (resumed from resuming_from, when set) fetches them.
+        """
+        synced_at = self.store.org_synced_at(org_id)
+        checkpoint = self.store.sync_checkpoint(org_id)
+        missing = [event['id'] for event in self.store.events_missing_attendees(org_id)]
+        return {
+            'complete': synced_at is not None and checkpoint is None and not missing,
+            'synced_at': synced_at,
+            'resuming_from': checkpoint['started_at'] if checkpoint else None,
+            'missing_events': missing
+        }
+
+    def range_is_fresh(self, org_id, start_from, start_before):
+        with self._guard:
+            synced_at = self._ranges.get((org_id, start_from, start_before))
+        return synced_at is not None and seconds_since(synced_at) < self.interval
+
+    def ensure_synced(self, org_id, start_from=None, start_before=None):
+        """
+        Block on a cold store, refresh a stale one in the background
+
+        With a start window, a cold store only fetches that window inline and
+        leaves the full history download to a background sync.
+        """
+        if self.store.org_synced_at(org_id) is None:
+            if start_from is not None:
+                # A window fetched moments ago isn't fetched again
+                if not self.range_is_fresh(org_id, start_from, start_before):
+                    self.sync_range(org_id, start_from, start_before)
+                self.sync_in_background(org_id)
+            else:
+                self.sync(org_id)
+        elif not self.is_fresh(org_id):
+            self.sync_in_background(org_id)
+
+    def sync_in_background(self, org_id, priority=PRIORITY_BACKGROUND):
+        """Start a background sync for the org unless one is already running"""
+        with self._guard:
+            if org_id in self._background:
+                return
+            self._background.add(org_id)
+
+        def run():
+            try:
+                self.sync(org_id, priority=priority)
+            except Exception as e:
+                print(f"Background sync failed for org {org_id}: {e}")
+            finally:
+                with self._guard:
+                    self._background.discard(org_id)
+
+        threading.Thread(target=run, daemon=True).start()
@@ -0,0 +1,71 @@
+"""
+Shared fixtures: a temporary event store and the stub Eventbrite API
+
+Tests import the backend modules the way app.py does, and talk to
+benchmarks/stub_eventbrite.py over HTTP through a real EventbriteClient.
+"""
+import os
+import sys
+
+import pytest
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND)
+sys.path.insert(0, os.path.join(BACKEND, 'benchmarks'))
+
+from eventbrite_client import EventbriteClient  # noqa: E402
+from rate_limiter import RateLimiter  # noqa: E402
+from store import EventStore  # noqa: E402
+from stub_eventbrite import StubEventbrite  # noqa: E402
+
+
+@pytest.fixture
+def store(tmp_path):
+    return EventStore(str(tmp_path / 'events.db'))
+
+
+@pytest.fixture
+def stub():
+    """A small synthetic org served on a free port, stub.api_base is its API base URL"""
+    stub = StubEventbrite(num_events=120, per_event=8)
+    server = stub.serve()
+    stub.api_base = f"http://127.0.0.1:{server.server_port}/v3"
+    yield stub
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def make_client(stub):
+    """EventbriteClient factory for the stub, with its own rate limiter"""
+    clients = []
+
+    def make(capacity=10 ** 6, max_wait=None):
+        limiter = RateLimiter(capacity=capacity, background_reserve=0)
+        client = EventbriteClient('test', limiter, base_url=stub.api_base, max_wait=max_wait)
+        clients.append(client)
+        return client
+
+    yield make
+    for client in clients:
+        client.close()
+
+
+@pytest.fixture
+def make_dashboard(monkeypatch, tmp_path, stub):
+    """Import a fresh app module configured by env vars, talking to the stub"""
+    def make(**env):
+        env = {
+            'EVENTBRITE_API_BASE': stub.api_base,
+            'EVENTBRITE_TOKEN': 'test',
+            'EVENT_STORE_PATH': str(tmp_path / 'dashboard.db'),
+            **env
+        }
+        for name, value in env.items():
+            monkeypatch.setenv(name, value)
+        sys.modules.pop('app', None)
+        import app
+        return app
+
+    yield make
+    sys.modules.pop('app', None)
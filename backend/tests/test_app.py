@@ -0,0 +1,51 @@
+from stub_eventbrite import ORG_ID
+
+
+def test_exhausted_rate_budget_is_a_503_with_retry_after_and_sync_status(make_dashboard):
+    dashboard = make_dashboard(EVENTBRITE_RATE_LIMIT='40', RATE_LIMIT_MAX_WAIT='0.01',
+                               RATE_LIMIT_BACKGROUND_RESERVE='0', ATTENDEE_FETCH_WORKERS='1')
+    resumed = []
+    dashboard.event_sync.sync_in_background = resumed.append
+    client = dashboard.app.test_client()
+
+    response = client.get(f"/api/insights?org_id={ORG_ID}")
+    assert response.status_code == 503
+    retry_after = int(response.headers['Retry-After'])
+    assert retry_after >= 1
+    body = response.get_json()
+    assert body['retry_after'] == retry_after
+    assert 'rate limit' in body['error']
+    assert body['sync']['complete'] is False
+    assert body['sync']['resuming_from'] is not None
+    assert body['sync']['missing_events']
+    assert resumed == [ORG_ID]
+
+    # Routes without an org still answer 503, just without a sync block
+    response = client.get('/api/event/3000000001/attendees')
+    assert response.status_code == 503
+    assert response.get_json()['sync'] is None
+
+
+def test_event_filters_on_a_cold_store_sync_only_the_window(make_dashboard, stub):
+    dashboard = make_dashboard()
+    background = []
+    dashboard.event_sync.sync_in_background = background.append
+    client = dashboard.app.test_client()
+    start_date = stub.events[100]['start']['local'][:10]
+    end_date = stub.events[110]['start']['local'][:10]
+
+    response = client.get('/api/events', query_string={
+        'org_id': ORG_ID, 'start_date': start_date, 'end_date': end_date, 'status': 'live'
+    })
+    assert response.status_code == 200
+    expected = [
+        event['id'] for event in stub.events
+        if start_date <= event['start']['local'][:10] <= end_date and event['status'] == 'live'
+    ]
+    assert sorted(event['id'] for event in response.get_json()['events']) == sorted(expected) != []
+    # The window came inline, the rest of the history is left to a background sync
+    assert len(dashboard.store.get_events(ORG_ID)) < len(stub.events)
+    assert background == [ORG_ID]
+
+    response = client.get('/api/events', query_string={'org_id': ORG_ID, 'start_date': '2024-13-01'})
+    assert response.status_code == 400
@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+
+from async_client import AsyncEventbriteClient
+from async_sync import AsyncEventSync
+from rate_limiter import RateBudgetExhausted, RateLimiter
+from store import EventStore
+from stub_eventbrite import ORG_ID
+from sync import EventSync
+
+
+def attendee_counts(store):
+    return {event_id: metrics[0] for event_id, metrics in store.event_metrics(ORG_ID).items()}
+
+
+def run_async(event_sync, method, *args):
+    async def main():
+        client = AsyncEventbriteClient.from_client(event_sync.client)
+        try:
+            return await getattr(AsyncEventSync(event_sync, client), method)(ORG_ID, *args)
+        finally:
+            await client.aclose()
+    return asyncio.run(main())
+
+
+def test_async_sync_matches_threaded_sync(stub, store, make_client, tmp_path):
+    before = stub.stats()['total']
+    assert run_async(EventSync(store, make_client()), 'sync') == 0
+    calls = stub.stats()['total'] - before
+
+    threaded = EventStore(str(tmp_path / 'threaded.db'))
+    before = stub.stats()['total']
+    EventSync(threaded, make_client(), workers=1).sync(ORG_ID)
+    assert stub.stats()['total'] - before == calls
+    assert attendee_counts(store) == attendee_counts(threaded)
+    assert store.get_events(ORG_ID) != [] and store.sync_checkpoint(ORG_ID) is None
+
+
+def test_async_range_sync_fetches_only_the_window(stub, store, make_client):
+    event_sync = EventSync(store, make_client())
+    start_from = stub.events[40]['start']['local'][:10]
+    start_before = stub.events[50]['start']['local'][:10]
+    assert run_async(event_sync, 'sync_range', start_from, start_before) == 0
+
+    synced = {event['id'] for event in store.get_events(ORG_ID) if event['attendees_synced_at']}
+    window = {event['id'] for event in store.get_events(ORG_ID, start_from, start_before)
+              if event['status'] != 'draft'}
+    assert synced == window and 0 < len(window) < len(stub.events)
+    assert event_sync.range_is_fresh(ORG_ID, start_from, start_before)
+    assert store.org_synced_at(ORG_ID) is None
+
+
+def test_async_range_sync_does_not_wait_for_the_org_lock(stub, store, make_client):
+    event_sync = EventSync(store, make_client())
+    start_from = stub.events[40]['start']['local'][:10]
+    with event_sync.org_lock(ORG_ID):  # As a running full sync would
+        assert run_async(event_sync, 'sync_range', start_from) == 0
+    assert event_sync.range_is_fresh(ORG_ID, start_from, None)
+
+
+def test_interrupted_async_sync_resumes_in_a_thread(stub, store, make_client):
+    client = make_client(capacity=40, max_wait=0.01)
+    event_sync = EventSync(store, client, workers=1)
+    resumed = []
+    event_sync.sync_in_background = resumed.append
+    with pytest.raises(RateBudgetExhausted):
+        run_async(event_sync, 'sync')
+    assert resumed == [ORG_ID]
+    assert store.sync_checkpoint(ORG_ID)['list_complete']
+
+    client.rate_limiter = RateLimiter(capacity=10 ** 6)
+    before = stub.stats()['calls']
+    assert event_sync.sync(ORG_ID) == 0
+    assert stub.stats()['calls'].get('events') == before.get('events')
+    assert event_sync.status(ORG_ID)['complete']
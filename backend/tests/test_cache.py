@@ -0,0 +1,73 @@
+import threading
+import time
+
+from cache import TTLCache, make_key
+
+
+def test_concurrent_misses_share_one_fetch():
+    cache = TTLCache()
+    calls = []
+    release = threading.Event()
+
+    def fetch():
+        calls.append(1)
+        release.wait(5)
+        return 'value'
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_fetch('key', fetch, 60)))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    while cache.stats()['coalesced'] < 7:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert calls == [1]
+    assert results == ['value'] * 8
+    assert cache.stats()['misses'] == 1
+
+
+def test_expired_entry_is_served_stale_while_one_refresh_runs():
+    cache = TTLCache()
+    cache.set('key', 'old', ttl=0)
+    refreshed = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        refreshed.wait(5)
+        return 'new'
+
+    assert cache.get_or_fetch('key', fetch, 60) == 'old'
+    assert cache.get_or_fetch('key', fetch, 60) == 'old'
+    refreshed.set()
+    while cache.stats()['refreshing']:
+        time.sleep(0.01)
+
+    assert calls == [1]
+    assert cache.get_or_fetch('key', fetch, 60) == 'new'
+    assert cache.stats()['stale_hits'] == 2
+
+
+def test_failed_fetch_is_not_cached():
+    cache = TTLCache()
+    assert cache.get_or_fetch('key', lambda: None, 60) is None
+    assert cache.get_or_fetch('key', lambda: 'value', 60) == 'value'
+
+
+def test_lru_eviction_and_prefix_invalidation():
+    cache = TTLCache(max_entries=2)
+    cache.set('a/1', 1, 60)
+    cache.set('a/2', 2, 60)
+    cache.get('a/1')
+    cache.set('b/1', 3, 60)
+    assert cache.get('a/2') is None  # Least recently used
+    cache.invalidate(prefix='a/')
+    assert cache.get('a/1') is None and cache.get('b/1') == 3
+
+
+def test_make_key_ignores_param_order():
+    assert make_key('/events', {'b': 2, 'a': 1}) == make_key('/events', {'a': 1, 'b': 2}) == '/events?a=1&b=2'
@@ -0,0 +1,54 @@
+import pytest
+
+from stub_eventbrite import ORG_ID
+
+WEEKLY_ROUTES = [
+    f"/api/weekly-sales?org_id={ORG_ID}&week_offset=-2",
+    f"/api/weekly-sales/range?org_id={ORG_ID}&weeks=8&week_offset=0"
+]
+
+
+@pytest.fixture
+def dashboard(make_dashboard):
+    dashboard = make_dashboard()
+    dashboard.event_sync.sync(ORG_ID)  # Warm, so no background sync changes the data mid-test
+    return dashboard
+
+
+@pytest.mark.parametrize('url', WEEKLY_ROUTES)
+def test_unchanged_weekly_report_is_a_304(dashboard, url):
+    client = dashboard.app.test_client()
+    first = client.get(url)
+    assert first.status_code == 200 and first.get_json()
+    etag, last_modified = first.headers['ETag'], first.headers['Last-Modified']
+    assert first.headers['Cache-Control'] == 'no-cache'
+
+    for headers in ({'If-None-Match': etag}, {'If-Modified-Since': last_modified}):
+        response = client.get(url, headers=headers)
+        assert response.status_code == 304
+        assert response.get_data() == b''
+        assert response.headers['ETag'] == etag
+
+    # Another week (week_offset -21, or 01) is another tag
+    other = client.get(url + '1', headers={'If-None-Match': etag})
+    assert other.status_code == 200 and other.headers['ETag'] != etag
+
+
+@pytest.mark.parametrize('url', WEEKLY_ROUTES)
+def test_changed_data_gets_a_new_weekly_report(dashboard, url):
+    client = dashboard.app.test_client()
+    etag = client.get(url).headers['ETag']
+
+    event = dashboard.store.get_events(ORG_ID)[0]
+    dashboard.store.upsert_events(ORG_ID, [{
+        'id': event['id'],
+        'name': {'text': 'Renamed'},
+        'start': {'local': event['start_local'], 'utc': event['start_utc']},
+        'end': {'local': event['end_local'], 'utc': event['end_utc']},
+        'status': event['status'],
+        'capacity': event['capacity']
+    }])
+
+    response = client.get(url, headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
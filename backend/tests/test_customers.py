@@ -0,0 +1,70 @@
+import base64
+import json
+
+import pytest
+
+from insights import CUSTOMER_SORTS, MAX_CUSTOMERS_PAGE
+from stub_eventbrite import ORG_ID
+
+
+@pytest.fixture
+def client(make_dashboard):
+    return make_dashboard().app.test_client()
+
+
+def get_customers(client, **params):
+    response = client.get('/api/customers', query_string={'org_id': ORG_ID, **params})
+    return response.status_code, response.get_json()
+
+
+def sort_key(customer, sort):
+    return (customer[sort] if sort != 'lifetime_value' else round(customer[sort] * 100), customer['email'])
+
+
+@pytest.mark.parametrize('sort', CUSTOMER_SORTS)
+def test_cursor_pages_through_every_customer_once(client, sort):
+    seen = []
+    cursor = None
+    while True:
+        params = {'sort': sort, 'limit': 7, **({'cursor': cursor} if cursor else {})}
+        status, body = get_customers(client, **params)
+        assert status == 200 and len(body['customers']) <= 7
+        seen.extend(body['customers'])
+        cursor = body['next_cursor']
+        if cursor is None:
+            break
+
+    emails = [customer['email'] for customer in seen]
+    assert len(emails) == len(set(emails)) == body['total'] > 7
+    keys = [sort_key(customer, sort) for customer in seen]
+    assert keys == sorted(keys, reverse=True)
+
+
+def test_email_prefix_min_events_and_limit_cap(client):
+    _, everyone = get_customers(client, limit=10 ** 6)
+    assert len(everyone['customers']) == min(everyone['total'], MAX_CUSTOMERS_PAGE)
+
+    email = everyone['customers'][0]['email']
+    prefix = email[:5]
+    _, matches = get_customers(client, email=f" {prefix.upper()}", limit=MAX_CUSTOMERS_PAGE)
+    assert email in [customer['email'] for customer in matches['customers']]
+    assert all(customer['email'].startswith(prefix) for customer in matches['customers'])
+
+    _, regulars = get_customers(client, min_events=3, limit=MAX_CUSTOMERS_PAGE)
+    assert 0 < regulars['total'] < everyone['total']
+    assert all(customer['total_events'] >= 3 for customer in regulars['customers'])
+
+
+@pytest.mark.parametrize('sort, cursor', [
+    ('lifetime_value', 'not a cursor'),
+    ('lifetime_value', ['total_events', 3, 'fan@example.com']),  # Another sort's cursor
+    ('lifetime_value', ['lifetime_value', 'x', 'y']),
+    ('lifetime_value', ['lifetime_value', True, 'fan@example.com']),
+    ('total_events', ['total_events', 3, None]),
+    ('last_seen', ['last_seen', 5, 'fan@example.com'])
+])
+def test_bad_cursor_is_a_400(client, sort, cursor):
+    if not isinstance(cursor, str):
+        cursor = base64.urlsafe_b64encode(json.dumps(cursor).encode()).decode()
+    status, body = get_customers(client, sort=sort, cursor=cursor)
+    assert status == 400 and 'cursor' in body['error'].lower()
@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+from forecast import ForecastService, MAX_MONTHS_AHEAD, fit_trends, forecast_series, next_months
+from stub_eventbrite import ORG_ID
+
+
+def test_batch_fit_matches_polyfit_per_row():
+    rng = np.random.default_rng(3)
+    values = rng.uniform(0, 100, (5, 12))
+    lengths = np.array([12, 7, 3, 1, 0])
+    mask = np.arange(12) < lengths[:, None]
+
+    slope, intercept = fit_trends(values, mask)
+    for row, length in enumerate(lengths):
+        if length >= 2:
+            expected = np.polyfit(np.arange(length), values[row, :length], 1)
+            assert np.allclose([slope[row], intercept[row]], expected)
+        else:
+            assert slope[row] == intercept[row] == 0
+
+
+def test_forecast_projects_the_trend_past_the_last_month():
+    series = {
+        None: [(f"2024-{month:02d}", 10 + 5 * i, 100000 + 1000 * i) for i, month in enumerate(range(9, 13))],
+        'Open Mic': [('2024-11', 4, 0), ('2024-12', 5, 0)]
+    }
+    forecasts = forecast_series(series, months_ahead=2)
+
+    overall = forecasts[None]
+    assert overall['predictions'] == [
+        {'month': '2025-01', 'attendees': 30, 'revenue': 1040},
+        {'month': '2025-02', 'attendees': 35, 'revenue': 1050}
+    ]
+    assert overall['attendee_trend'] == 'growing' and overall['avg_growth_rate'] == 5.0
+    assert forecasts['Open Mic']['attendee_trend'] == 'insufficient_data'
+    assert forecasts['Open Mic']['predictions'] == []
+    assert next_months('2024-11', 3) == ['2024-12', '2025-01', '2025-02']
+
+
+def test_forecasts_are_refitted_only_when_the_monthly_series_change():
+    class Aggregator:
+        monthly_version = 0
+
+        def __init__(self):
+            self.fits = 0
+
+        def monthly_series(self):
+            self.fits += 1
+            return {None: [('2024-01', 1, 100), ('2024-02', 2, 200), ('2024-03', 3, 300)]}
+
+    aggregator = Aggregator()
+
+    class Registry:
+        def get(self, org_id):
+            return aggregator
+
+    service = ForecastService(Registry())
+    first = service.forecasts(ORG_ID)
+    assert service.forecasts(ORG_ID) is first and aggregator.fits == 1
+    aggregator.monthly_version += 1
+    assert service.forecasts(ORG_ID) is not first and aggregator.fits == 2
+
+
+@pytest.fixture
+def client(make_dashboard):
+    return make_dashboard().app.test_client()
+
+
+def test_forecast_route(client):
+    response = client.get('/api/forecast', query_string={'org_id': ORG_ID, 'months_ahead': 4, 'all_events': 'true'})
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['months_ahead'] == 4 and len(body['overall']['predictions']) == 4
+    assert body['events'] and all(len(f['predictions']) in (0, 4) for f in body['events'].values())
+
+    name = next(iter(body['events']))
+    named = client.get('/api/forecast', query_string={'org_id': ORG_ID, 'event_name': name}).get_json()
+    assert list(named['events']) == [name]
+
+
+@pytest.mark.parametrize('months_ahead', ['0', str(MAX_MONTHS_AHEAD + 1), 'soon'])
+def test_forecast_route_rejects_bad_months_ahead(client, months_ahead):
+    response = client.get('/api/forecast', query_string={'org_id': ORG_ID, 'months_ahead': months_ahead})
+    assert response.status_code == 400
@@ -0,0 +1,123 @@
+import random
+
+from analytics import AttendeeColumns
+from insights import InsightsAggregator, InsightsRegistry
+
+ORG_ID = '1'
+SYNCED_AT = '2024-01-01T00:00:00Z'
+
+
+def make_event(i, name=None, start=None, status='live', capacity=50):
+    return {
+        'id': str(i),
+        'name': {'text': name or f"Show {i % 4}"},
+        'start': {'local': start or f"2024-{1 + i % 12:02d}-{1 + i % 27:02d}T20:00:00", 'utc': SYNCED_AT},
+        'end': {'local': '', 'utc': SYNCED_AT},
+        'status': status,
+        'capacity': capacity
+    }
+
+
+def make_attendee(rng, event_id, n, cancelled=False):
+    # Mixed-case and padded emails are one customer
+    email = f"fan{rng.randint(0, 40)}@example.com"
+    return {
+        'id': f"{event_id}-{n}",
+        'profile': {'email': rng.choice([email, email.upper(), f" {email}"])},
+        'ticket_class_name': rng.choice(['General Admission', 'VIP', None]),
+        'costs': {'gross': {'value': rng.choice([0, 1000, 2500])}},
+        'checked_in': rng.random() < 0.5,
+        'cancelled': cancelled
+    }
+
+
+def rebuilt(store):
+    events = store.get_events(ORG_ID)
+    return [
+        InsightsAggregator.from_store(events, store.event_summaries(ORG_ID)),
+        InsightsAggregator.from_columns(events, AttendeeColumns.from_store(store, ORG_ID, events))
+    ]
+
+
+def snapshot(aggregator):
+    """Responses with insertion-order dependent lists put in a fixed order"""
+    response = aggregator.to_response()
+    response['ticket_types'] = sorted(response['ticket_types'], key=lambda t: t['type'])
+    response['top_customers'] = [c['events_attended'] for c in response['top_customers']]
+    customers = aggregator.customers_page(limit=10 ** 6)['customers']
+    response['customers'] = sorted(customers, key=lambda c: c['email'])
+    return response
+
+
+def test_incremental_updates_match_rebuild(store):
+    rng = random.Random(5)
+    registry = InsightsRegistry(store)
+    registry.get(ORG_ID)  # Built empty, so every write below arrives as a delta
+
+    events = [make_event(i, status='draft' if i == 3 else 'live') for i in range(20)]
+    store.upsert_events(ORG_ID, events)
+    for i in range(20):
+        store.replace_attendees(str(i), [make_attendee(rng, i, n) for n in range(rng.randint(0, 30))])
+        store.mark_attendees_synced(str(i), SYNCED_AT, False)
+    for _ in range(200):
+        i = rng.randrange(20)
+        store.apply_attendee_changes(str(i), [
+            make_attendee(rng, i, rng.randint(0, 40), cancelled=rng.random() < 0.3) for _ in range(3)
+        ])
+
+    events[5] = make_event(5, name='Renamed', start='2023-05-05T20:00:00')
+    events[3] = make_event(3)  # Published
+    events[7] = make_event(7, status='draft')  # Unpublished
+    events[9] = make_event(9, capacity=0)
+    store.upsert_events(ORG_ID, events)
+    store.replace_attendees('2', [make_attendee(rng, 2, n) for n in range(5)])
+
+    incremental = snapshot(registry.get(ORG_ID))
+    assert incremental['total_attendees'] > 0
+    for aggregator in rebuilt(store):
+        assert snapshot(aggregator) == incremental
+
+
+def test_rebuilt_aggregator_keeps_applying_deltas(store):
+    rng = random.Random(7)
+    events = [make_event(i) for i in range(10)]
+    store.upsert_events(ORG_ID, events)
+    for i in range(10):
+        store.replace_attendees(str(i), [make_attendee(rng, i, n) for n in range(20)])
+        store.mark_attendees_synced(str(i), SYNCED_AT, False)
+
+    registry = InsightsRegistry(store)
+    registry.get(ORG_ID)  # Built from the columns
+    for _ in range(50):
+        i = rng.randrange(10)
+        store.apply_attendee_changes(str(i), [
+            make_attendee(rng, i, rng.randint(0, 25), cancelled=rng.random() < 0.4) for _ in range(2)
+        ])
+    events[4] = make_event(4, name='Renamed')
+    store.upsert_events(ORG_ID, events)
+
+    incremental = snapshot(registry.get(ORG_ID))
+    for aggregator in rebuilt(store):
+        assert snapshot(aggregator) == incremental
+
+
+def test_listeners_get_only_changed_events(store):
+    class Recorder:
+        def __init__(self):
+            self.changed = []
+
+        def events_changed(self, org_id, event_ids):
+            self.changed.append(event_ids)
+
+        def attendees_changed(self, event_id, removed, added):
+            pass
+
+    recorder = Recorder()
+    store.add_listener(recorder)
+    events = [make_event(i) for i in range(5)]
+    store.upsert_events(ORG_ID, events)
+    store.upsert_events(ORG_ID, events)
+    events[2] = make_event(2, name='Renamed')
+    store.upsert_events(ORG_ID, events)
+
+    assert recorder.changed == [['0', '1', '2', '3', '4'], ['2']]
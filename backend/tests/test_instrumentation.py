@@ -0,0 +1,51 @@
+import re
+
+from instrumentation import format_metric
+from stub_eventbrite import ORG_ID
+
+SAMPLE = re.compile(r'^([a-z_]+)(\{(?:[a-z_]+="(?:[^"\\]|\\.)*",?)*\})? (\S+)$')
+
+
+def parse(text):
+    """{(name, labels): value} for every sample line of Prometheus text"""
+    samples = {}
+    for line in text.splitlines():
+        if line.startswith('#'):
+            continue
+        match = SAMPLE.match(line)
+        assert match, line
+        name, labels, value = match.groups()
+        samples[(name, labels or '')] = value
+    return samples
+
+
+def test_samples_keep_full_precision():
+    text = format_metric('calls_total', 'counter', 'Calls', [
+        ({'route': 'a'}, 12345678), ({'route': 'b'}, 0.1 + 0.2), ({'route': 'c'}, float('inf')), ({'route': 'd'}, 0)
+    ])
+    assert parse(text) == {
+        ('calls_total', '{route="a"}'): '12345678',
+        ('calls_total', '{route="b"}'): '0.30000000000000004',
+        ('calls_total', '{route="c"}'): '+Inf',
+        ('calls_total', '{route="d"}'): '0'
+    }
+
+
+def test_metrics_endpoint_counts_requests_exactly(make_dashboard):
+    dashboard = make_dashboard(INSTRUMENTATION_ENABLED='true')
+    client = dashboard.app.test_client()
+    for _ in range(3):
+        assert client.get('/api/health').status_code == 200
+    assert client.get(f"/api/events?org_id={ORG_ID}").status_code == 200
+    dashboard.request_metrics._requests[('/api/big', 'GET', '200')] = 12345678
+
+    response = client.get('/api/metrics')
+    assert response.status_code == 200 and response.content_type.startswith('text/plain')
+    samples = parse(response.get_data(as_text=True))
+
+    assert samples[('dashboard_requests_total', '{route="/api/health",method="GET",status="200"}')] == '3'
+    assert samples[('dashboard_requests_total', '{route="/api/big",method="GET",status="200"}')] == '12345678'
+    assert int(samples[('dashboard_upstream_requests_total',
+                        '{route="/api/events",endpoint="/events/{id}/attendees/",status="200"}')]) > 0
+    assert float(samples[('dashboard_request_duration_seconds_sum', '{route="/api/events"}')]) > 0
+    assert samples[('eventbrite_rate_limit_used', '')].isdigit()
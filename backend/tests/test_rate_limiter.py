@@ -0,0 +1,63 @@
+import contextvars
+import threading
+import time
+
+import pytest
+
+from rate_limiter import (
+    RateBudgetExhausted, RateLimiter, count_tokens, parse_retry_after, MAX_BACKOFF, PRIORITY_BACKGROUND
+)
+
+
+def test_rate_limited_pauses_every_caller_for_retry_after():
+    limiter = RateLimiter(capacity=1000, window=1)
+    assert limiter.on_rate_limited(0.2) == 0.2
+    assert limiter.try_acquire() > 0.1
+
+    started = time.monotonic()
+    limiter.acquire()
+    assert time.monotonic() - started >= 0.15
+    assert limiter.status()['throttled'] == 1
+
+
+def test_pause_without_retry_after_grows_until_a_success():
+    limiter = RateLimiter()
+    assert [limiter.on_rate_limited() for _ in range(6)] == [1, 2, 4, 8, MAX_BACKOFF, MAX_BACKOFF]
+    limiter.on_success()
+    assert limiter.on_rate_limited() == 1
+
+
+def test_interactive_wait_is_bounded_by_max_wait():
+    limiter = RateLimiter(capacity=10, window=3600, background_reserve=0)
+    limiter.on_rate_limited(30)
+    with pytest.raises(RateBudgetExhausted) as error:
+        limiter.acquire(max_wait=0.1)
+    assert error.value.retry_in > 29
+
+
+def test_background_callers_leave_the_reserve():
+    limiter = RateLimiter(capacity=5, window=3600, background_reserve=3)
+    for _ in range(2):
+        assert limiter.try_acquire(PRIORITY_BACKGROUND) == 0
+    assert limiter.try_acquire(PRIORITY_BACKGROUND) > 0
+    assert limiter.try_acquire() == 0
+
+
+def test_parse_retry_after():
+    assert parse_retry_after('3') == 3.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after('Wed, 21 Oct 2026 07:28:00 GMT') is None
+
+
+def test_count_tokens_counts_only_its_own_context():
+    limiter = RateLimiter(capacity=100)
+    other = threading.Thread(target=lambda: [limiter.acquire() for _ in range(5)])
+    with count_tokens() as tally:
+        limiter.acquire()
+        other.start()
+        other.join()
+        contextvars.copy_context().run(limiter.try_acquire)
+    limiter.acquire()
+
+    assert tally.taken == 2
+    assert limiter.status()['used_in_window'] == 8
@@ -0,0 +1,35 @@
+import gzip
+import json
+
+from stub_eventbrite import ORG_ID
+
+EVENTS = f"/api/events?org_id={ORG_ID}"
+
+
+def test_each_content_coding_gets_its_own_etag(make_dashboard):
+    client = make_dashboard(FAST_RESPONSES='true').app.test_client()
+
+    zipped = client.get(EVENTS, headers={'Accept-Encoding': 'gzip'})
+    plain = client.get(EVENTS, headers={'Accept-Encoding': 'identity'})
+    assert zipped.headers['Content-Encoding'] == 'gzip'
+    assert 'Content-Encoding' not in plain.headers
+    assert json.loads(gzip.decompress(zipped.get_data())) == plain.get_json()
+
+    zipped_tag, plain_tag = zipped.headers['ETag'], plain.headers['ETag']
+    assert zipped_tag == plain_tag[:-1] + '-gzip"'
+    assert not zipped_tag.startswith('W/')
+
+    # Revalidating either coding's tag is a 304 that names the tag it matched
+    for tag, encoding in ((zipped_tag, 'gzip'), (plain_tag, 'gzip'), (zipped_tag, 'identity')):
+        response = client.get(EVENTS, headers={'Accept-Encoding': encoding, 'If-None-Match': tag})
+        assert response.status_code == 304
+        assert response.headers['ETag'] == tag
+        assert 'Accept-Encoding' in response.headers['Vary']
+
+
+def test_jsonify_responses_keep_one_etag(make_dashboard):
+    client = make_dashboard(FAST_RESPONSES='false').app.test_client()
+    response = client.get(EVENTS, headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in response.headers
+    assert client.get(EVENTS, headers={'If-None-Match': response.headers['ETag']}).status_code == 304
+    assert client.get(EVENTS, headers={'If-None-Match': '"other"'}).status_code == 200
@@ -0,0 +1,34 @@
+import threading
+
+from rate_limiter import PRIORITY_INTERACTIVE
+from scheduler import PrefetchScheduler
+from stub_eventbrite import ORG_ID
+from sync import EventSync
+
+
+def test_prefetch_budget_ignores_concurrent_user_calls(stub, store, make_client):
+    interval = 0.2
+    budget = 2 * len(stub.events)  # Room for this pass's own calls only
+    client = make_client(capacity=int(budget * 3600 / interval))
+    scheduler = PrefetchScheduler(EventSync(store, client, workers=1), client.rate_limiter, None,
+                                  interval=interval, budget_share=1)
+    assert scheduler.budget == budget
+
+    stop = threading.Event()
+
+    def user_traffic():
+        while not stop.is_set():
+            client.rate_limiter.acquire(PRIORITY_INTERACTIVE)
+
+    users = threading.Thread(target=user_traffic)
+    users.start()
+    try:
+        scheduler.prefetch(ORG_ID)
+    finally:
+        stop.set()
+        users.join()
+
+    # Every due event fit in the budget, so the pass marked the org synced
+    assert store.org_synced_at(ORG_ID) is not None
+    published = [event for event in store.get_events(ORG_ID) if event['status'] != 'draft']
+    assert all(event['attendees_synced_at'] for event in published)
@@ -0,0 +1,62 @@
+import json
+
+import pytest
+
+from stub_eventbrite import ORG_ID
+
+ROW_FIELDS = {
+    'id', 'name', 'status', 'start', 'capacity', 'attendees', 'checked_in', 'revenue',
+    'sell_through_rate', 'check_in_rate', 'avg_ticket_price'
+}
+
+
+def read_stream(client, **params):
+    response = client.get('/api/event-performance/stream', query_string={'org_id': ORG_ID, **params})
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    *events, summary = lines
+    assert all(line['type'] == 'event' and set(line['event']) == ROW_FIELDS for line in events)
+    assert summary['type'] == 'summary'
+    return [line['event'] for line in events], summary
+
+
+def check_summary(rows, summary):
+    ids = [row['id'] for row in rows]
+    assert len(ids) == len(set(ids)) == summary['event_count']
+    revenue = {row['id']: row['revenue'] for row in rows}
+    assert sorted(summary['ranking']) == sorted(ids)
+    assert [revenue[i] for i in summary['ranking']] == sorted(revenue.values(), reverse=True)
+    assert summary['total_attendees'] == sum(row['attendees'] for row in rows)
+    assert summary['total_revenue'] == pytest.approx(sum(revenue.values()), abs=0.01)
+
+
+def test_cold_store_streams_every_event_as_it_syncs(make_dashboard, stub):
+    dashboard = make_dashboard()
+    client = dashboard.app.test_client()
+    rows, summary = read_stream(client)
+    check_summary(rows, summary)
+
+    # Same rows as the buffered route once the sync is done
+    assert dashboard.store.org_synced_at(ORG_ID) is not None
+    buffered = client.get(f"/api/event-performance?org_id={ORG_ID}").get_json()['events']
+    assert sorted(rows, key=lambda row: row['id']) == sorted(buffered, key=lambda row: row['id'])
+    assert len(rows) == sum(1 for event in stub.events if event['status'] != 'draft')
+
+
+def test_filters_apply_to_a_warm_stream(make_dashboard, stub):
+    dashboard = make_dashboard()
+    dashboard.event_sync.sync(ORG_ID)
+    start_date = stub.events[60]['start']['local'][:10]
+    end_date = stub.events[110]['start']['local'][:10]
+
+    rows, summary = read_stream(dashboard.app.test_client(), start_date=start_date, end_date=end_date,
+                                status='live')
+    check_summary(rows, summary)
+    assert rows and all(row['status'] == 'live' and start_date <= row['start'][:10] <= end_date for row in rows)
+
+
+def test_stream_rejects_a_bad_date(make_dashboard):
+    client = make_dashboard().app.test_client()
+    response = client.get('/api/event-performance/stream', query_string={'org_id': ORG_ID, 'end_date': 'soon'})
+    assert response.status_code == 400
@@ -0,0 +1,165 @@
+import threading
+import time
+from datetime import date, timedelta
+
+import pytest
+
+from rate_limiter import RateBudgetExhausted, RateLimiter
+from store import AttendeeRows, EventStore
+from stub_eventbrite import ORG_ID, PAGE_SIZE
+import sync
+from sync import EVENT_LIST_PARAMS, EventSync
+
+
+def make_sync(store, client):
+    event_sync = EventSync(store, client, workers=1)
+    event_sync.resumed_in_background = []
+    event_sync.sync_in_background = event_sync.resumed_in_background.append
+    return event_sync
+
+
+def attendee_counts(store):
+    return {event_id: metrics[0] for event_id, metrics in store.event_metrics(ORG_ID).items()}
+
+
+def test_full_sync_fills_the_store(stub, store, make_client):
+    event_sync = make_sync(store, make_client())
+    assert event_sync.sync(ORG_ID) == 0
+
+    status = event_sync.status(ORG_ID)
+    assert status['complete'] and status['missing_events'] == []
+    assert len(store.get_events(ORG_ID)) == len(stub.events)
+    assert store.sync_checkpoint(ORG_ID) is None
+
+
+def test_sync_rides_out_429s(stub, store, make_client):
+    stub.throttle_every = 4
+    stub.retry_after = 0
+    client = make_client()
+    assert make_sync(store, client).sync(ORG_ID) == 0
+    assert client.rate_limiter.throttled > 0
+    assert make_sync(store, client).status(ORG_ID)['complete']
+
+
+@pytest.mark.parametrize('budget', [2, 40])  # Cut short in the event list, then in the attendees
+def test_interrupted_sync_resumes_from_checkpoint(stub, store, make_client, tmp_path, budget):
+    client = make_client(capacity=budget, max_wait=0.01)
+    event_sync = make_sync(store, client)
+    with pytest.raises(RateBudgetExhausted):
+        event_sync.sync(ORG_ID)
+
+    assert event_sync.resumed_in_background == [ORG_ID]
+    checkpoint = store.sync_checkpoint(ORG_ID)
+    assert checkpoint is not None
+    assert store.org_synced_at(ORG_ID) is None
+    assert not event_sync.status(ORG_ID)['complete']
+    done = {
+        event['id'] for event in store.get_events(ORG_ID)
+        if event['attendees_synced_at'] and event['attendees_synced_at'] >= checkpoint['started_at']
+    }
+    assert checkpoint['list_complete'] == (budget > 2) and bool(done) == (budget > 2)
+
+    # The budget comes back; the next run picks up where this one stopped
+    client.rate_limiter = RateLimiter(capacity=10 ** 6)
+    before = stub.stats()['calls']
+    assert event_sync.sync(ORG_ID) == 0
+    calls = stub.stats()['calls']
+
+    list_pages = -(-len(stub.events) // PAGE_SIZE)
+    assert calls.get('events', 0) - before.get('events', 0) == (list_pages - budget if budget < list_pages else 0)
+    published = [event for event in store.get_events(ORG_ID) if event['status'] != 'draft']
+    assert calls['attendees'] - before.get('attendees', 0) == len(published) - len(done)
+    assert store.sync_checkpoint(ORG_ID) is None
+    assert event_sync.status(ORG_ID)['complete']
+
+    fresh = EventStore(str(tmp_path / 'fresh.db'))
+    make_sync(fresh, make_client()).sync(ORG_ID)
+    assert attendee_counts(store) == attendee_counts(fresh)
+
+
+def test_attendee_stream_is_reduced_to_one_row_per_attendee(store):
+    def attendee(attendee_id, email, **fields):
+        return {'id': attendee_id, 'profile': {'email': email}, 'ticket_class_name': 'VIP', **fields}
+
+    store.replace_attendees('1', [attendee('a', 'a@example.com'), attendee('b', 'b@example.com')])
+    changes = AttendeeRows('1', replace=False).extend([
+        attendee('a', 'old@example.com'),
+        attendee('b', 'b@example.com', cancelled=True),
+        attendee('c', 'c@example.com'),
+        attendee('a', 'new@example.com', checked_in=True)
+    ])
+
+    assert list(changes.latest) == ['a', 'b', 'c']
+    assert changes.latest['b'] is None
+    row, ticket_class_name = changes.latest['a']
+    assert isinstance(row, tuple) and row[3] == 'new@example.com' and ticket_class_name == 'VIP'
+
+    store.write_attendees(changes)
+    assert [(a['id'], a['email'], a['checked_in']) for a in store.get_attendees('1')] == [
+        ('a', 'new@example.com', 1), ('c', 'c@example.com', 0)
+    ]
+
+
+def test_window_is_served_while_a_full_sync_runs(stub, store, make_client):
+    stub.latency = 0.05
+    event_sync = make_sync(store, make_client())
+    full = threading.Thread(target=event_sync.sync, args=(ORG_ID,))
+    full.start()
+    while not event_sync.org_lock(ORG_ID).locked():
+        time.sleep(0.01)
+
+    start_from = stub.events[-10]['start']['local'][:10]
+    start_before = (date.fromisoformat(start_from) + timedelta(days=30)).isoformat()
+    assert event_sync.sync_range(ORG_ID, start_from, start_before) == 0
+    assert full.is_alive()  # The window didn't wait for the history download
+
+    window = store.get_events(ORG_ID, start_from, start_before)
+    assert window and all(event['attendees_synced_at'] for event in window if event['status'] != 'draft')
+    assert event_sync.range_is_fresh(ORG_ID, start_from, start_before)
+
+    stub.latency = 0
+    full.join()
+    assert event_sync.status(ORG_ID)['complete']
+
+
+def window_of(stub, first, last):
+    """(start_from, start_before) dates around stub events first..last"""
+    start_from = stub.events[first]['start']['local'][:10]
+    start_before = stub.events[last]['start']['local'][:10]
+    return start_from, start_before
+
+
+@pytest.mark.parametrize('upstream_filters', [True, False])
+def test_range_sync_fetches_only_the_window(stub, store, make_client, monkeypatch, upstream_filters):
+    if not upstream_filters:
+        # Upstream ignoring the range still stops paging once events start before the window
+        monkeypatch.setattr(sync, 'range_params', lambda start_from, start_before=None: EVENT_LIST_PARAMS)
+    start_from, start_before = window_of(stub, 100, 110)
+    event_sync = make_sync(store, make_client())
+    before = stub.stats()['calls']
+    assert event_sync.sync_range(ORG_ID, start_from, start_before) == 0
+    calls = stub.stats()['calls']
+
+    stored = store.get_events(ORG_ID)
+    assert stored and all(start_from <= event['start_local'] < start_before for event in stored)
+    window = [event for event in stored if event['status'] != 'draft']
+    assert all(event['attendees_synced_at'] for event in window)
+    assert calls['attendees'] - before.get('attendees', 0) == len(window)
+    list_pages = -(-len(stub.events) // PAGE_SIZE)
+    assert calls['events'] - before.get('events', 0) < list_pages
+    assert store.org_synced_at(ORG_ID) is None and event_sync.range_is_fresh(ORG_ID, start_from, start_before)
+
+
+def test_store_filters_events_by_start_and_status(stub, store, make_client):
+    make_sync(store, make_client()).sync(ORG_ID)
+    start_from, start_before = window_of(stub, 20, 100)
+
+    events = store.get_events(ORG_ID, start_from, start_before, statuses=['live', 'draft'])
+    expected = [
+        event['id'] for event in stub.events
+        if start_from <= event['start']['local'] < start_before and event['status'] in ('live', 'draft')
+    ]
+    assert [event['id'] for event in events] == expected[::-1] != []
+    ascending = store.get_events(ORG_ID, start_from, order='ASC', statuses=['completed'])
+    assert [event['start_local'] for event in ascending] == sorted(event['start_local'] for event in ascending)
+    assert {event['status'] for event in ascending} == {'completed'}
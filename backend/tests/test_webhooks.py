@@ -0,0 +1,91 @@
+from scheduler import REFRESH_TIERS
+from stub_eventbrite import ORG_ID
+
+WEBHOOK_URL = '/api/webhooks/eventbrite'
+
+
+def order_placed(order_id):
+    return {
+        'config': {'action': 'order.placed', 'endpoint_url': 'https://dashboard.example.com' + WEBHOOK_URL},
+        'api_url': f"https://www.eventbriteapi.com/v3/orders/{order_id}/"
+    }
+
+
+def test_webhooks_are_not_found_unless_enabled(make_dashboard):
+    client = make_dashboard(WEBHOOKS_ENABLED='false', WEBHOOK_SECRET='s3cret').app.test_client()
+    response = client.post(f"{WEBHOOK_URL}?secret=s3cret", json={'config': {'action': 'test'}})
+    assert response.status_code == 404
+
+
+def test_webhooks_without_a_configured_secret_are_refused(make_dashboard):
+    dashboard = make_dashboard(WEBHOOKS_ENABLED='true', WEBHOOK_SECRET='')
+    client = dashboard.app.test_client()
+    for url in (WEBHOOK_URL, f"{WEBHOOK_URL}?secret="):
+        assert client.post(url, json={'config': {'action': 'test'}}).status_code == 403
+    assert dashboard.prefetcher.tiers == REFRESH_TIERS  # Keeps polling at full rate
+
+
+def test_missing_or_wrong_secret_is_refused(make_dashboard, stub):
+    client = make_dashboard(WEBHOOKS_ENABLED='true', WEBHOOK_SECRET='s3cret').app.test_client()
+    before = stub.stats()['total']
+    for url in (WEBHOOK_URL, f"{WEBHOOK_URL}?secret=wrong", f"{WEBHOOK_URL}?secret=s3cre"):
+        response = client.post(url, json=order_placed('1'))
+        assert response.status_code == 403
+        assert response.get_json() == {'error': 'Invalid webhook secret'}
+    assert stub.stats()['total'] == before
+
+
+def test_order_placed_resyncs_its_event(make_dashboard, stub):
+    dashboard = make_dashboard(WEBHOOKS_ENABLED='true', WEBHOOK_SECRET='s3cret')
+    dashboard.event_sync.sync(ORG_ID)
+    event_id = dashboard.store.get_events(ORG_ID)[0]['id']
+    attendees = len(dashboard.store.get_attendees(event_id))
+
+    order_id = stub.place_order(event_id)
+    response = dashboard.app.test_client().post(f"{WEBHOOK_URL}?secret=s3cret", json=order_placed(order_id))
+
+    assert response.status_code == 202
+    assert response.get_json() == {'action': 'order.placed', 'queued': True}
+    dashboard.webhook_receiver.join()
+    assert len(dashboard.store.get_attendees(event_id)) == attendees + 1
+    assert dashboard.webhook_receiver.stats() == {'received': {'order.placed': 1}, 'failed': {}, 'queued': 0}
+
+
+def test_delivery_during_a_sync_is_answered_without_waiting(make_dashboard, stub):
+    dashboard = make_dashboard(WEBHOOKS_ENABLED='true', WEBHOOK_SECRET='s3cret')
+    dashboard.event_sync.sync(ORG_ID)
+    event_id = dashboard.store.get_events(ORG_ID)[0]['id']
+    attendees = len(dashboard.store.get_attendees(event_id))
+    client = dashboard.app.test_client()
+
+    with dashboard.event_sync.org_lock(ORG_ID):  # As a running full sync would
+        response = client.post(f"{WEBHOOK_URL}?secret=s3cret", json=order_placed(stub.place_order(event_id)))
+        assert response.status_code == 202
+        assert len(dashboard.store.get_attendees(event_id)) == attendees
+
+    dashboard.webhook_receiver.join()
+    assert len(dashboard.store.get_attendees(event_id)) == attendees + 1
+
+
+def test_unusable_notifications_are_refused_before_queueing(make_dashboard):
+    dashboard = make_dashboard(WEBHOOKS_ENABLED='true', WEBHOOK_SECRET='s3cret')
+    client = dashboard.app.test_client()
+    url = f"{WEBHOOK_URL}?secret=s3cret"
+    assert client.post(url, json={'config': {'action': 'order.exploded'}}).status_code == 400
+    assert client.post(url, json={'config': {'action': 'order.placed'}, 'api_url': 'https://evil.example.com/'}
+                       ).status_code == 400
+    assert dashboard.webhook_receiver.stats()['queued'] == 0
+
+
+def test_webhook_counts_are_exported_as_metrics(make_dashboard, stub):
+    dashboard = make_dashboard(WEBHOOKS_ENABLED='true', WEBHOOK_SECRET='s3cret')
+    client = dashboard.app.test_client()
+    assert client.post(f"{WEBHOOK_URL}?secret=s3cret", json={'config': {'action': 'test'}}).status_code == 202
+    # An order that doesn't exist upstream fails in the worker
+    assert client.post(f"{WEBHOOK_URL}?secret=s3cret", json=order_placed('404')).status_code == 202
+    dashboard.webhook_receiver.join()
+
+    text = client.get('/api/metrics').get_data(as_text=True)
+    assert 'dashboard_webhooks_total{action="test",result="applied"} 1' in text
+    assert 'dashboard_webhooks_total{action="order.placed",result="failed"} 1' in text
+    assert 'dashboard_webhooks_queued 0' in text
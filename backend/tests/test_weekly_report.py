@@ -0,0 +1,37 @@
+from datetime import date
+
+from metrics import EventMetrics
+from weekly_report import generate_weekly_report_from_store, summarize_week
+
+
+def make_event(event_id, start_local, status='live'):
+    return {'id': event_id, 'name': f"Show {event_id}", 'start_local': start_local, 'status': status}
+
+
+def test_weekly_report_buckets_events_by_monday():
+    events = [
+        make_event('1', '2026-03-02T20:00:00'),  # Monday
+        make_event('2', '2026-03-08T20:00:00'),  # Sunday, same week
+        make_event('3', '2026-03-09T20:00:00'),
+        make_event('4', '2026-03-04T20:00:00', status='draft'),
+        make_event('5', '2026-03-05T20:00:00')  # Never synced
+    ]
+    metrics = {'1': EventMetrics(3, 1, 4500), '2': EventMetrics(2, 2, 1999), '3': EventMetrics(1, 0, 0),
+               '4': EventMetrics(9, 0, 9000)}
+
+    weekly = generate_weekly_report_from_store(events, metrics)
+    assert sorted(weekly) == [date(2026, 3, 2), date(2026, 3, 9)]
+
+    report = summarize_week(date(2026, 3, 2), weekly[date(2026, 3, 2)])
+    assert report['week_end'] == '2026-03-08'
+    assert [sale['event_name'] for sale in report['events']] == ['Show 1', 'Show 2']
+    assert report['total_tickets'] == 5
+    assert report['total_revenue'] == 64.99
+    assert report['event_count'] == 2
+
+
+def test_empty_week():
+    assert summarize_week(date(2026, 3, 16), []) == {
+        'week_start': '2026-03-16', 'week_end': '2026-03-22', 'events': [],
+        'total_tickets': 0, 'total_revenue': 0, 'event_count': 0
+    }
@@ -0,0 +1,61 @@
+"""
+Per-org data versions for conditional GETs
+
+Registered as an EventStore listener, so every write that changes an org's
+events or attendees bumps that org's version and last-modified time. The
+dashboard routes derive their ETag and Last-Modified from these, letting
+clients revalidate a cached response without it being rebuilt or resent.
+"""
+import hashlib
+import os
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+
+
+class DataVersions:
+    """Version counter and last change time for each org's store data"""
+
+    def __init__(self, store):
+        self.store = store
+        # Versions restart with the process, so tags carry a per-process token
+        self._boot = os.urandom(4).hex()
+        self._started = datetime.now(timezone.utc).replace(microsecond=0)
+        self._versions = {}  # org_id -> (version, last modified)
+        self._event_orgs = {}  # event_id -> (org_id, attendees synced before)
+        self._lock = threading.Lock()
+        store.add_listener(self)
+
+    def _bump(self, org_id):
+        with self._lock:
+            version, _ = self._versions.get(org_id, (0, None))
+            self._versions[org_id] = (version + 1, datetime.now(timezone.utc).replace(microsecond=0))
+
+    def events_changed(self, org_id, event_ids):
+        self._bump(org_id)
+
+    def attendees_changed(self, event_id, removed, added):
+        known = self._event_orgs.get(event_id)
+        if known is None:
+            event = self.store.get_event(event_id)
+            if event is None:
+                return
+            known = (event['org_id'], event['attendees_synced_at'] is not None)
+        org_id, synced = known
+        self._event_orgs[event_id] = (org_id, True)
+        # A first sync changes the org even with no attendees; a resync that
+        # wrote back the same rows doesn't
+        if not synced or Counter(map(tuple, removed)) != Counter(map(tuple, added)):
+            self._bump(org_id)
+
+    def version(self, org_id):
+        """(version, last modified UTC datetime) of an org's data"""
+        with self._lock:
+            version, modified = self._versions.get(org_id, (0, None))
+        return version, modified or self._started
+
+    def etag(self, org_id, *parts):
+        """Strong ETag for a response built from an org's data and the given request parts"""
+        version, _ = self.version(org_id)
+        digest = hashlib.sha1(repr(parts).encode()).hexdigest()[:12]
+        return f"{self._boot}-{org_id}-{version}-{digest}"
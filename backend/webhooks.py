@@ -0,0 +1,156 @@
+"""
+Eventbrite webhook ingestion
+
+Eventbrite POSTs a small notification for each change: the action and the
+API URL of the changed object, never the object itself. Each one becomes
+the narrowest store update that covers it. Orders and attendees re-sync
+just the affected event's attendees (changed_since, usually one page), and
+event changes refetch that one event. The store's listeners then patch the
+event's metrics, insights rollups and data version, and its live attendee
+pages are dropped from the response cache. Upstream traffic follows sales
+instead of the number of events polled.
+
+Notifications are checked and queued by the HTTP request, then applied by
+a worker thread, so Eventbrite gets its answer before any upstream call.
+Applying one can wait on a running sync of the org, far longer than
+Eventbrite waits for a delivery before sending it again.
+"""
+import queue
+import re
+import threading
+from collections import Counter
+from urllib.parse import urlparse
+
+from eventbrite_client import UpstreamFetchError
+
+ORDER_ACTIONS = ('order.placed', 'order.updated', 'order.refunded')
+ATTENDEE_ACTIONS = ('attendee.updated', 'attendee.checked_in', 'attendee.checked_out')
+EVENT_ACTIONS = ('event.created', 'event.published', 'event.updated', 'event.unpublished')
+TEST_ACTION = 'test'  # Sent when a webhook is created in Eventbrite
+SUPPORTED_ACTIONS = ORDER_ACTIONS + ATTENDEE_ACTIONS + EVENT_ACTIONS + (TEST_ACTION,)
+
+ATTENDEE_PATH = re.compile(r'^/events/([^/]+)/attendees/[^/]+/?$')
+
+
+class WebhookError(Exception):
+    """Raised for a webhook notification that can't be applied"""
+
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def resource_path(api_url):
+    """
+    The API path of a notification's api_url, like /orders/123/
+
+    Only the path is kept and it is fetched from the client's own base URL,
+    so a payload can't point the server at another host.
+    """
+    _, marker, rest = urlparse(api_url or '').path.partition('/v3/')
+    if not marker or not rest:
+        raise WebhookError('api_url is not an Eventbrite API URL')
+    return '/' + rest
+
+
+class WebhookReceiver:
+    """Applies Eventbrite webhook notifications to the event store"""
+
+    def __init__(self, client, event_sync, cache=None):
+        self.client = client
+        self.event_sync = event_sync
+        self.store = event_sync.store
+        self.cache = cache
+        self.received = Counter()  # action -> notifications applied
+        self.failed = Counter()  # action -> notifications that couldn't be applied
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def accept(self, payload):
+        """
+        Check a notification and queue it for the worker, returns its action
+
+        Raises WebhookError for one that could never be applied. One that
+        fails later (upstream down, rate budget spent) is counted in failed;
+        the next polling pass catches its event up.
+        """
+        action = (payload.get('config') or {}).get('action')
+        if action not in SUPPORTED_ACTIONS:
+            raise WebhookError(f"Unsupported webhook action: {action}")
+        if action != TEST_ACTION:
+            resource_path(payload.get('api_url'))
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='webhooks', daemon=True)
+                self._thread.start()
+        self._queue.put(payload)
+        return action
+
+    def join(self):
+        """Wait until every queued notification has been applied (or failed)"""
+        self._queue.join()
+
+    def _run(self):
+        while True:
+            payload = self._queue.get()
+            action = (payload.get('config') or {}).get('action')
+            try:
+                self.handle(payload)
+            except Exception as e:
+                self.failed[action] += 1
+                print(f"Webhook {action} failed: {e}")
+            finally:
+                self._queue.task_done()
+
+    def handle(self, payload):
+        """Apply one notification, returns {'action', 'event_id', 'synced'}"""
+        action = (payload.get('config') or {}).get('action')
+        if action == TEST_ACTION:
+            self.received[action] += 1
+            return {'action': action, 'event_id': None, 'synced': False}
+
+        path = resource_path(payload.get('api_url'))
+        if action in ORDER_ACTIONS:
+            event_id = self._fetch(path).get('event_id')
+            synced = self._sync_attendees(event_id)
+        elif action in ATTENDEE_ACTIONS:
+            match = ATTENDEE_PATH.match(path)
+            event_id = match.group(1) if match else self._fetch(path).get('event_id')
+            synced = self._sync_attendees(event_id)
+        elif action in EVENT_ACTIONS:
+            event_id = self._store_event(self._fetch(path))['id']
+            synced = True
+        else:
+            raise WebhookError(f"Unsupported webhook action: {action}")
+
+        self.received[action] += 1
+        return {'action': action, 'event_id': event_id, 'synced': synced}
+
+    def _fetch(self, path):
+        data = self.client.get_json(f"{self.client.base_url}{path}", use_cache=False)
+        if data is None:
+            raise UpstreamFetchError(f"Failed to fetch {path}")
+        return data
+
+    def _store_event(self, event):
+        org_id = event.get('organization_id')
+        if not org_id:
+            raise WebhookError(f"Event {event.get('id')} has no organization_id", 500)
+        self.store.upsert_events(org_id, [event])
+        return self.store.get_event(event['id'])
+
+    def _sync_attendees(self, event_id):
+        if not event_id:
+            raise WebhookError('Notification has no event')
+        event = self.store.get_event(event_id)
+        if event is None:
+            # Created since the store's last event list refresh
+            event = self._store_event(self._fetch(f"/events/{event_id}/"))
+        if self.cache is not None:
+            self.cache.invalidate(prefix=f"{self.client.base_url}/events/{event_id}/attendees/")
+        # Even a final event, a refund can arrive after the show
+        return self.event_sync.sync_event(event['org_id'], event_id, force=True)
+
+    def stats(self):
+        return {'received': dict(self.received), 'failed': dict(self.failed), 'queued': self._queue.qsize()}
@@ -14,46 +14,46 @@ def get_week_range(week_start):
     week_end = week_start + timedelta(days=6)
     return week_start, week_end
 
-def generate_weekly_report(all_events, attendees_by_event):
+def generate_weekly_report_from_store(events, event_metrics):
     """
-    Generate weekly sales report
-    
+    Generate weekly sales report from local store rows
+
+    One pass over the events, reading each event's precomputed metrics
+    instead of its attendee list.
+
     Args:
-        all_events: List of event objects with dates
-        attendees_by_event: Dict mapping event_id -> list of attendees
-    
+        events: List of store event dicts (start_local, name, status)
+        event_metrics: Dict mapping event_id -> metrics.EventMetrics
+
     Returns:
         Dict mapping week_start_date -> list of event sales for that week
     """
     weekly_data = defaultdict(list)
-    
-    for event in all_events:
-        event_id = event['id']
-        event_name = event['name']['text']
-        event_start = event['start']['local']
-        
-        # Parse event date
-        event_date = datetime.fromisoformat(event_start.replace('Z', '+00:00'))
-        week_start = get_week_start(event_date.date())
-        
-        # Get attendees for this event
-        attendees = attendees_by_event.get(event_id, [])
-        tickets_sold = len(attendees)
-        
-        # Calculate revenue
-        total_revenue = 0
-        for attendee in attendees:
-            costs = attendee.get('costs', {})
-            gross = costs.get('gross', {})
-            revenue_cents = gross.get('value', 0)
-            total_revenue += revenue_cents / 100.0
-        
-        weekly_data[week_start].append({
-            'event_name': event_name,
-            'event_date': event_date.strftime('%Y-%m-%d'),
-            'tickets_sold': tickets_sold,
-            'gross_revenue': round(total_revenue, 2)
+
+    for event in events:
+        metrics = event_metrics.get(event['id'])
+        if event['status'] == 'draft' or metrics is None:
+            continue
+
+        event_date = datetime.fromisoformat(event['start_local'])
+        weekly_data[get_week_start(event_date.date())].append({
+            'event_name': event['name'],
+            'event_date': event['start_local'],
+            'tickets_sold': metrics.attendees,
+            'gross_revenue': round(metrics.revenue, 2)
         })
-    
+
     return weekly_data
 
+def summarize_week(week_start, sales):
+    """Build one week's report (events by date plus totals) from its event sales"""
+    week_start, week_end = get_week_range(week_start)
+    sales = sorted(sales, key=lambda x: x['event_date'])
+    return {
+        'week_start': week_start.isoformat(),
+        'week_end': week_end.isoformat(),
+        'events': sales,
+        'total_tickets': sum(sale['tickets_sold'] for sale in sales),
+        'total_revenue': round(sum(sale['gross_revenue'] for sale in sales), 2),
+        'event_count': len(sales)
+    }
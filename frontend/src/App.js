@@ -16,6 +16,7 @@ function App() {
   const [selectedEvent, setSelectedEvent] = useState(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
+  const [errorSync, setErrorSync] = useState(null);
   const [activeView, setActiveView] = useState('overview');
   const [organizations, setOrganizations] = useState([]);
   const [selectedOrgId, setSelectedOrgId] = useState(null);
@@ -30,6 +31,12 @@ function App() {
     }
   }, [selectedOrgId]);
 
+  // A 503 for an exhausted rate budget carries the org's sync status
+  const showError = (err) => {
+    setError(err.response?.data?.error || err.message);
+    setErrorSync(err.response?.data?.sync || null);
+  };
+
   const loadOrganizations = async () => {
     setLoading(true);
     setError(null);
@@ -43,7 +50,7 @@ function App() {
         setSelectedOrgId(orgs[0].id);
       }
     } catch (err) {
-      setError(err.response?.data?.error || err.message);
+      showError(err);
       setLoading(false);
     }
   };
@@ -71,39 +78,45 @@ function App() {
       // Load from API if no cache
       await loadDataFromAPI();
     } catch (err) {
-      setError(err.response?.data?.error || err.message);
+      showError(err);
       setLoading(false);
     }
   };
   
+  // GET that revalidates the cached copy by ETag; a 304 keeps the cached data
+  const getRevalidated = async (cacheKey, url, config, select) => {
+    const cached = cache.getEntry(cacheKey);
+    const response = await axios.get(url, {
+      ...config,
+      headers: cached ? { 'If-None-Match': cached.etag } : {},
+      validateStatus: (status) => (status >= 200 && status < 300) || status === 304
+    });
+    const data = response.status === 304 && cached ? cached.data : select(response.data);
+    cache.set(cacheKey, data, response.headers.etag);
+    return data;
+  };
+
   const loadDataFromAPI = async () => {
     try {
       // Load insights and events in parallel with org_id parameter
       // Note: insights can take 2+ minutes with 179 events
-      const [insightsRes, eventsRes] = await Promise.all([
-        axios.get(`${API_BASE_URL}/api/insights`, { 
+      const [insightsData, eventsData] = await Promise.all([
+        getRevalidated(`nova_insights_${selectedOrgId}`, `${API_BASE_URL}/api/insights`, { 
           params: { org_id: selectedOrgId },
           timeout: 180000 // 3 minute timeout
-        }),
-        axios.get(`${API_BASE_URL}/api/events`, { 
+        }, (data) => data),
+        getRevalidated(`nova_events_${selectedOrgId}`, `${API_BASE_URL}/api/events`, { 
           params: { org_id: selectedOrgId },
           timeout: 60000 // 1 minute timeout
-        })
+        }, (data) => data.events)
       ]);
       
-      const insightsData = insightsRes.data;
-      const eventsData = eventsRes.data.events;
-      
       setInsights(insightsData);
       setEvents(eventsData);
       
-      // Cache the data
-      cache.set(`nova_insights_${selectedOrgId}`, insightsData);
-      cache.set(`nova_events_${selectedOrgId}`, eventsData);
-      
       setLoading(false);
     } catch (err) {
-      setError(err.response?.data?.error || err.message);
+      showError(err);
       setLoading(false);
     }
   };
@@ -123,7 +136,7 @@ function App() {
       });
       setActiveView('event-details');
     } catch (err) {
-      setError(err.response?.data?.error || err.message);
+      showError(err);
     }
   };
 
@@ -146,6 +159,13 @@ function App() {
         <div className="error">
           <h2>⚠️ {isRateLimit ? 'API Rate Limit Reached' : 'Error'}</h2>
           <p>{error}</p>
+          {errorSync && !errorSync.complete && (
+            <div className="sync-notice">
+              {errorSync.missing_events.length > 0
+                ? `Still syncing: ${errorSync.missing_events.length} events are left to download, and the sync carries on in the background.`
+                : 'Still syncing: the sync carries on in the background.'}
+            </div>
+          )}
           {isRateLimit ? (
             <p className="hint">
               The Eventbrite API has a rate limit. Please wait 2-3 minutes and try again. 
@@ -214,12 +234,20 @@ function App() {
       </header>
 
       <main className="app-main">
+        {insights?.sync && !insights.sync.complete && (
+          <div className="sync-notice">
+            {insights.sync.missing_events.length > 0
+              ? `Still syncing: ${insights.sync.missing_events.length} events aren't included in these numbers yet.`
+              : 'Still syncing: these numbers may not include the latest changes yet.'}
+          </div>
+        )}
+        
         {activeView === 'overview' && insights && (
           <Overview insights={insights} events={events} orgId={selectedOrgId} />
         )}
         
         {activeView === 'customers' && insights && (
-          <CustomerInsights insights={insights} />
+          <CustomerInsights insights={insights} orgId={selectedOrgId} />
         )}
         
         {activeView === 'events' && (
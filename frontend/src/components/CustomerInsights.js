@@ -1,10 +1,19 @@
-import React, { useState } from 'react';
+import React, { useState, useEffect } from 'react';
+import axios from 'axios';
 import { exportCustomersToCSV } from '../utils/csvExport';
 import './CustomerInsights.css';
 
-function CustomerInsights({ insights }) {
-  const [showAllCustomers, setShowAllCustomers] = useState(false);
+const API_BASE_URL = process.env.REACT_APP_API_URL || 'http://localhost:8080';
+const PAGE_SIZE = 20;
+
+function CustomerInsights({ insights, orgId }) {
   const [customerSearch, setCustomerSearch] = useState('');
+  const [customerSort, setCustomerSort] = useState('lifetime_value');
+  const [minEvents, setMinEvents] = useState(0);
+  const [customers, setCustomers] = useState([]);
+  const [totalCustomers, setTotalCustomers] = useState(0);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingCustomers, setLoadingCustomers] = useState(false);
   const [expandedCustomer, setExpandedCustomer] = useState(null);
   const {
     new_customers = 0,
@@ -17,18 +26,40 @@ function CustomerInsights({ insights }) {
     multi_show_buyers = 0,
     first_time_customers = 0,
     first_timer_retention_rate = 0,
-    unique_customers = 0,
-    customer_details = []
+    unique_customers = 0
   } = insights;
-  
-  // Filter customers for detailed view
-  const filteredCustomers = customer_details.filter(customer =>
-    customer.email.toLowerCase().includes(customerSearch.toLowerCase())
-  );
-  
-  const displayedCustomers = showAllCustomers 
-    ? filteredCustomers 
-    : filteredCustomers.slice(0, 20);
+
+  const loadCustomers = async (cursor) => {
+    setLoadingCustomers(true);
+    try {
+      const response = await axios.get(`${API_BASE_URL}/api/customers`, {
+        params: {
+          org_id: orgId,
+          sort: customerSort,
+          email: customerSearch,
+          min_events: minEvents,
+          limit: PAGE_SIZE,
+          cursor
+        },
+        timeout: 60000
+      });
+      const page = response.data;
+      setCustomers(prev => (cursor ? [...prev, ...page.customers] : page.customers));
+      setTotalCustomers(page.total);
+      setNextCursor(page.next_cursor);
+    } catch (err) {
+      console.error('Failed to load customers:', err);
+    } finally {
+      setLoadingCustomers(false);
+    }
+  };
+
+  // Reload the first page when the filters change, debounced for typing
+  useEffect(() => {
+    const timer = setTimeout(() => loadCustomers(null), 250);
+    return () => clearTimeout(timer);
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [orgId, customerSort, customerSearch, minEvents]);
 
   return (
     <div className="customer-insights">
@@ -170,15 +201,34 @@ function CustomerInsights({ insights }) {
       
       <div className="customer-history-card">
         <div className="customers-header">
-          <h3>Customer Event History ({customer_details.length} total)</h3>
+          <h3>Customer Event History ({totalCustomers} total)</h3>
           <div className="customer-controls">
             <input
               type="text"
-              placeholder="Search by email..."
+              placeholder="Search by email prefix..."
               value={customerSearch}
               onChange={(e) => setCustomerSearch(e.target.value)}
               className="customer-search-input"
             />
+            <select
+              value={customerSort}
+              onChange={(e) => setCustomerSort(e.target.value)}
+              className="customer-select"
+            >
+              <option value="lifetime_value">Lifetime Value</option>
+              <option value="total_events">Events Attended</option>
+              <option value="last_seen">Last Seen</option>
+            </select>
+            <select
+              value={minEvents}
+              onChange={(e) => setMinEvents(Number(e.target.value))}
+              className="customer-select"
+            >
+              <option value={0}>All Customers</option>
+              <option value={2}>2+ Events</option>
+              <option value={3}>3+ Events</option>
+              <option value={5}>5+ Events</option>
+            </select>
           </div>
         </div>
         
@@ -193,7 +243,7 @@ function CustomerInsights({ insights }) {
               </tr>
             </thead>
             <tbody>
-              {displayedCustomers.map((customer) => (
+              {customers.map((customer) => (
                 <React.Fragment key={customer.email}>
                   <tr 
                     onClick={() => {
@@ -251,12 +301,13 @@ function CustomerInsights({ insights }) {
           </table>
         </div>
         
-        {!showAllCustomers && filteredCustomers.length > 20 && (
+        {nextCursor && (
           <button 
-            onClick={() => setShowAllCustomers(true)}
+            onClick={() => loadCustomers(nextCursor)}
             className="show-more-button"
+            disabled={loadingCustomers}
           >
-            Show All {filteredCustomers.length} Customers
+            {loadingCustomers ? 'Loading...' : `Show More (${customers.length} of ${totalCustomers})`}
           </button>
         )}
       </div>
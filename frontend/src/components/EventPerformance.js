@@ -1,5 +1,4 @@
 import React, { useState, useEffect } from 'react';
-import axios from 'axios';
 import './EventPerformance.css';
 
 const API_BASE_URL = process.env.REACT_APP_API_URL || 'http://localhost:8080';
@@ -7,25 +6,55 @@ const API_BASE_URL = process.env.REACT_APP_API_URL || 'http://localhost:8080';
 function EventPerformance({ orgId }) {
   const [events, setEvents] = useState([]);
   const [loading, setLoading] = useState(false);
+  const [streaming, setStreaming] = useState(false);
   const [hasLoaded, setHasLoaded] = useState(false);
   const [sortBy, setSortBy] = useState('revenue');
   const [showCount, setShowCount] = useState(20);
 
+  // Rows stream in as NDJSON, one event per line, so the table fills while the rest load
   const loadPerformance = async () => {
     setLoading(true);
+    setStreaming(true);
     setHasLoaded(true);
+    setEvents([]);
     try {
-      const response = await axios.get(`${API_BASE_URL}/api/event-performance`, {
-        params: { org_id: orgId },
-        timeout: 120000 // 2 minute timeout for large datasets
-      });
-      setEvents(response.data.events);
+      const params = new URLSearchParams(orgId ? { org_id: orgId } : {});
+      const response = await fetch(`${API_BASE_URL}/api/event-performance/stream?${params}`);
+      if (!response.ok) {
+        throw new Error(`HTTP ${response.status}`);
+      }
+
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffered = '';
+      while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffered += decoder.decode(value, { stream: true });
+        const lines = buffered.split('\n');
+        buffered = lines.pop();
+
+        const rows = [];
+        lines.filter(line => line.trim()).forEach(line => {
+          const message = JSON.parse(line);
+          if (message.type === 'event') {
+            rows.push(message.event);
+          } else if (message.type === 'error') {
+            console.error('Performance stream error:', message.error);
+          }
+        });
+        if (rows.length > 0) {
+          setEvents(prev => [...prev, ...rows]);
+          setLoading(false);
+        }
+      }
     } catch (err) {
       console.error('Failed to load performance data:', err);
       alert('Failed to load performance data. You may have hit the API rate limit. Please wait 2-3 minutes and try again.');
       setEvents([]);
     } finally {
       setLoading(false);
+      setStreaming(false);
     }
   };
 
@@ -88,7 +117,7 @@ function EventPerformance({ orgId }) {
         <div className="loading">
           <div className="spinner"></div>
           <p>Loading performance data for all events...</p>
-          <p className="loading-detail">This may take 1-2 minutes. Please be patient.</p>
+          <p className="loading-detail">Rows appear as soon as each event is ready.</p>
         </div>
       </div>
     );
@@ -124,6 +153,10 @@ function EventPerformance({ orgId }) {
           <option value={50}>Top 50</option>
           <option value={events.length}>All Events</option>
         </select>
+        
+        {streaming && (
+          <span className="stream-status">Loading... {events.length} events so far</span>
+        )}
       </div>
 
       <div className="performance-table-container">
@@ -13,8 +13,15 @@ function LowCapacityAlert({ orgId }) {
     setLoading(true);
     setHasLoaded(true);
     try {
+      // Only upcoming live events are needed, so let the server filter them
+      const today = new Date();
+      const startDate = [
+        today.getFullYear(),
+        String(today.getMonth() + 1).padStart(2, '0'),
+        String(today.getDate()).padStart(2, '0')
+      ].join('-');
       const response = await axios.get(`${API_BASE_URL}/api/event-performance`, {
-        params: { org_id: orgId },
+        params: { org_id: orgId, start_date: startDate, status: 'live,started' },
         timeout: 120000
       });
       
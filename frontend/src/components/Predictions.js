@@ -1,15 +1,53 @@
 import React, { useMemo, useEffect, useState } from 'react';
 import axios from 'axios';
 import { LineChart, Line, BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, Legend, ResponsiveContainer } from 'recharts';
-import { predictNextMonths, analyzeBestDays, analyzeSeasonality } from '../utils/predictions';
+import { analyzeBestDays, analyzeSeasonality } from '../utils/predictions';
 import './Predictions.css';
 
 const API_BASE_URL = process.env.REACT_APP_API_URL || 'http://localhost:8080';
 
+const EMPTY_FORECAST = {
+  predictions: [],
+  attendee_trend: 'insufficient_data',
+  revenue_trend: 'insufficient_data',
+  recent_trend: 'insufficient_data',
+  avg_growth_rate: 0,
+  recent_growth_rate: 0
+};
+
+const monthLabel = (monthKey) => {
+  const [year, month] = monthKey.split('-').map(Number);
+  const monthName = new Date(year, month - 1).toLocaleString('en-US', { month: 'short' });
+  return `${monthName} '${String(year).slice(-2)}`;
+};
+
 function Predictions({ insights, events, orgId }) {
-  const { monthly_trends = [] } = insights;
+  const { monthly_trends = [], events_list = [], events_monthly_data = {} } = insights;
   const [performanceData, setPerformanceData] = useState([]);
   const [loadingPerf, setLoadingPerf] = useState(false);
+  const [selectedEvent, setSelectedEvent] = useState('');
+  const [forecastData, setForecastData] = useState(null);
+
+  // Forecasts are fitted and cached by the backend, only the selected series is fetched
+  useEffect(() => {
+    let cancelled = false;
+    axios.get(`${API_BASE_URL}/api/forecast`, {
+      params: {
+        org_id: orgId,
+        months_ahead: 3,
+        event_name: selectedEvent || undefined
+      },
+      timeout: 60000
+    })
+      .then(response => {
+        if (!cancelled) setForecastData(response.data);
+      })
+      .catch(err => {
+        console.error('Error fetching forecast:', err);
+        if (!cancelled) setForecastData(null);
+      });
+    return () => { cancelled = true; };
+  }, [orgId, selectedEvent]);
 
   // Don't auto-load performance data - it uses too many API calls
   // Instead, calculate best days from events list with basic attendance estimates
@@ -21,9 +59,8 @@ function Predictions({ insights, events, orgId }) {
     }
   }, [events]);
 
-  const forecast = useMemo(() => {
-    return predictNextMonths(monthly_trends, 3);
-  }, [monthly_trends]);
+  const overallForecast = forecastData?.overall || EMPTY_FORECAST;
+  const chartForecast = (selectedEvent && forecastData?.events?.[selectedEvent]) || overallForecast;
 
   const bestDays = useMemo(() => {
     // Use events data to show frequency by day
@@ -37,19 +74,21 @@ function Predictions({ insights, events, orgId }) {
 
   // Combine historical and predicted data
   const combinedData = useMemo(() => {
-    const historical = monthly_trends.map(item => ({
+    const history = selectedEvent ? (events_monthly_data[selectedEvent] || []) : monthly_trends;
+    const historical = history.map(item => ({
       ...item,
       monthLabel: item.monthLabel || item.month,
       type: 'historical'
     }));
     
-    const predicted = forecast.predictions.map(item => ({
+    const predicted = chartForecast.predictions.map(item => ({
       ...item,
+      monthLabel: monthLabel(item.month),
       type: 'predicted'
     }));
     
     return [...historical.slice(-6), ...predicted]; // Last 6 months + predictions
-  }, [monthly_trends, forecast]);
+  }, [monthly_trends, events_monthly_data, selectedEvent, chartForecast]);
 
   const getTrendEmoji = (trend) => {
     switch(trend) {
@@ -72,38 +111,50 @@ function Predictions({ insights, events, orgId }) {
         <div className="prediction-card">
           <h3>Overall Attendance Trend</h3>
           <div className="trend-indicator">
-            <span className="trend-emoji">{getTrendEmoji(forecast.attendeeTrend)}</span>
-            <span className="trend-label">{forecast.attendeeTrend}</span>
+            <span className="trend-emoji">{getTrendEmoji(overallForecast.attendee_trend)}</span>
+            <span className="trend-label">{overallForecast.attendee_trend}</span>
           </div>
           <p className="trend-detail">
-            {forecast.avgGrowthRate > 0 ? '+' : ''}
-            {forecast.avgGrowthRate.toFixed(1)} attendees/month (all-time avg)
+            {overallForecast.avg_growth_rate > 0 ? '+' : ''}
+            {overallForecast.avg_growth_rate.toFixed(1)} attendees/month (all-time avg)
           </p>
         </div>
         
         <div className="prediction-card">
           <h3>Recent Trend (Last 6 Months)</h3>
           <div className="trend-indicator">
-            <span className="trend-emoji">{getTrendEmoji(forecast.recentTrend)}</span>
-            <span className="trend-label">{forecast.recentTrend}</span>
+            <span className="trend-emoji">{getTrendEmoji(overallForecast.recent_trend)}</span>
+            <span className="trend-label">{overallForecast.recent_trend}</span>
           </div>
           <p className="trend-detail">
-            {forecast.recentGrowthRate > 0 ? '+' : ''}
-            {forecast.recentGrowthRate.toFixed(1)} attendees/month (recent)
+            {overallForecast.recent_growth_rate > 0 ? '+' : ''}
+            {overallForecast.recent_growth_rate.toFixed(1)} attendees/month (recent)
           </p>
         </div>
         
         <div className="prediction-card">
           <h3>Revenue Trend</h3>
           <div className="trend-indicator">
-            <span className="trend-emoji">{getTrendEmoji(forecast.revenueTrend)}</span>
-            <span className="trend-label">{forecast.revenueTrend}</span>
+            <span className="trend-emoji">{getTrendEmoji(overallForecast.revenue_trend)}</span>
+            <span className="trend-label">{overallForecast.revenue_trend}</span>
           </div>
         </div>
       </div>
 
       <div className="forecast-chart-card">
-        <h3>3-Month Attendance Forecast</h3>
+        <div className="forecast-header">
+          <h3>3-Month Attendance Forecast</h3>
+          <select
+            value={selectedEvent}
+            onChange={(e) => setSelectedEvent(e.target.value)}
+            className="forecast-select"
+          >
+            <option value="">All Events</option>
+            {events_list.map(event => (
+              <option key={event.id} value={event.name}>{event.name}</option>
+            ))}
+          </select>
+        </div>
         <ResponsiveContainer width="100%" height={300}>
           <LineChart data={combinedData}>
             <CartesianGrid strokeDasharray="3 3" stroke="#333" />
@@ -1,25 +1,47 @@
-import React, { useState } from 'react';
+import React, { useState, useEffect } from 'react';
 import axios from 'axios';
 import './WeeklySales.css';
 
 const API_BASE_URL = process.env.REACT_APP_API_URL || 'http://localhost:8080';
 
+const WEEKS_PER_REQUEST = 13; // Browse back a quarter per request
+
 function WeeklySales({ orgId }) {
   const [weekOffset, setWeekOffset] = useState(0);
   const [weekData, setWeekData] = useState(null);
   const [loading, setLoading] = useState(false);
+  const [loadedWeeks, setLoadedWeeks] = useState({}); // week offset -> report
+
+  // Reports are per org
+  useEffect(() => {
+    setLoadedWeeks({});
+    setWeekData(null);
+  }, [orgId]);
 
   const loadWeeklySales = async (offset) => {
+    if (loadedWeeks[offset]) {
+      setWeekData(loadedWeeks[offset]);
+      return;
+    }
+
     setLoading(true);
     try {
-      const response = await axios.get(`${API_BASE_URL}/api/weekly-sales`, {
+      // Fetch this week and the ones before it in one request
+      const response = await axios.get(`${API_BASE_URL}/api/weekly-sales/range`, {
         params: { 
           org_id: orgId,
-          week_offset: offset
+          week_offset: offset,
+          weeks: WEEKS_PER_REQUEST
         },
         timeout: 60000
       });
-      setWeekData(response.data);
+      const weeks = response.data.weeks;
+      const fetched = {};
+      weeks.forEach((week, index) => {
+        fetched[offset - (weeks.length - 1 - index)] = week;
+      });
+      setLoadedWeeks(prev => ({ ...prev, ...fetched }));
+      setWeekData(fetched[offset]);
     } catch (err) {
       alert('Failed to load weekly sales. Please try again.');
       console.error(err);
@@ -1,14 +1,20 @@
 /**
  * Simple caching utility using localStorage
+ *
+ * Entries keep the ETag the API sent, so once they are older than
+ * CACHE_DURATION they can still be revalidated (If-None-Match) instead of
+ * being downloaded again.
  */
 
 const CACHE_DURATION = 5 * 60 * 1000; // 5 minutes
+const REVALIDATE_DURATION = 7 * 24 * 60 * 60 * 1000; // Keep entries with an ETag for a week
 
 export const cache = {
-  set: (key, data) => {
+  set: (key, data, etag) => {
     try {
       const item = {
         data,
+        etag: etag || null,
         timestamp: Date.now()
       };
       localStorage.setItem(key, JSON.stringify(item));
@@ -27,7 +33,9 @@ export const cache = {
 
       // Check if cache is expired
       if (age > CACHE_DURATION) {
-        localStorage.removeItem(key);
+        if (!parsed.etag || age > REVALIDATE_DURATION) {
+          localStorage.removeItem(key);
+        }
         return null;
       }
 
@@ -38,6 +46,21 @@ export const cache = {
     }
   },
 
+  // Cached data and its ETag, expired or not, for a conditional request
+  getEntry: (key) => {
+    try {
+      const item = localStorage.getItem(key);
+      if (!item) return null;
+
+      const parsed = JSON.parse(item);
+      if (!parsed.etag || Date.now() - parsed.timestamp > REVALIDATE_DURATION) return null;
+      return { data: parsed.data, etag: parsed.etag };
+    } catch (e) {
+      console.warn('Failed to retrieve cached data:', e);
+      return null;
+    }
+  },
+
   clear: (key) => {
     try {
       if (key) {
@@ -1,107 +1,9 @@
 /**
- * Simple predictive analytics and forecasting utilities
+ * Simple predictive analytics utilities
+ *
+ * Attendance and revenue forecasts come from the backend (/api/forecast).
  */
 
-// Linear regression for trend prediction
-const linearRegression = (data) => {
-  const n = data.length;
-  if (n < 2) return { slope: 0, intercept: 0 };
-
-  let sumX = 0, sumY = 0, sumXY = 0, sumX2 = 0;
-
-  data.forEach((point, index) => {
-    sumX += index;
-    sumY += point.value;
-    sumXY += index * point.value;
-    sumX2 += index * index;
-  });
-
-  const slope = (n * sumXY - sumX * sumY) / (n * sumX2 - sumX * sumX);
-  const intercept = (sumY - slope * sumX) / n;
-
-  return { slope, intercept };
-};
-
-// Predict next N months
-export const predictNextMonths = (monthlyTrends, monthsAhead = 3) => {
-  if (!monthlyTrends || monthlyTrends.length < 3) {
-    return { predictions: [], trend: 'insufficient_data' };
-  }
-
-  // Prepare data for regression
-  const attendeeData = monthlyTrends.map((item, index) => ({
-    value: item.attendees || 0
-  }));
-
-  const revenueData = monthlyTrends.map((item, index) => ({
-    value: item.revenue || 0
-  }));
-
-  // Calculate trends
-  const attendeeRegression = linearRegression(attendeeData);
-  const revenueRegression = linearRegression(revenueData);
-
-  // Determine trend direction (more sensitive thresholds)
-  const attendeeTrend = attendeeRegression.slope > 2 ? 'growing' : 
-                        attendeeRegression.slope < -2 ? 'declining' : 'stable';
-  const revenueTrend = revenueRegression.slope > 20 ? 'growing' : 
-                       revenueRegression.slope < -20 ? 'declining' : 'stable';
-  
-  // Also calculate recent trend (last 6 months only for more current picture)
-  const recentData = monthlyTrends.slice(-6);
-  const recentAttendeeData = recentData.map((item, index) => ({
-    value: item.attendees || 0
-  }));
-  
-  const recentRegression = linearRegression(recentAttendeeData);
-  const recentTrend = recentRegression.slope > 2 ? 'growing' : 
-                      recentRegression.slope < -2 ? 'declining' : 'stable';
-
-  // Generate predictions for next months
-  const predictions = [];
-  const lastMonth = monthlyTrends[monthlyTrends.length - 1].month;
-  const [year, month] = lastMonth.split('-').map(Number);
-
-  for (let i = 1; i <= monthsAhead; i++) {
-    const nextIndex = monthlyTrends.length + i - 1;
-    
-    const predictedAttendees = Math.max(0, Math.round(
-      attendeeRegression.slope * nextIndex + attendeeRegression.intercept
-    ));
-    
-    const predictedRevenue = Math.max(0, Math.round(
-      revenueRegression.slope * nextIndex + revenueRegression.intercept
-    ));
-
-    // Calculate next month
-    let nextMonth = month + i;
-    let nextYear = year;
-    while (nextMonth > 12) {
-      nextMonth -= 12;
-      nextYear++;
-    }
-
-    const monthKey = `${nextYear}-${String(nextMonth).padStart(2, '0')}`;
-    const monthName = new Date(nextYear, nextMonth - 1).toLocaleString('en-US', { month: 'short' });
-    
-    predictions.push({
-      month: monthKey,
-      monthLabel: `${monthName} '${String(nextYear).slice(-2)}`,
-      attendees: predictedAttendees,
-      revenue: predictedRevenue
-    });
-  }
-
-  return {
-    predictions,
-    attendeeTrend,
-    revenueTrend,
-    recentTrend,
-    avgGrowthRate: attendeeRegression.slope,
-    recentGrowthRate: recentRegression.slope
-  };
-};
-
 // Calculate best performing day of week
 export const analyzeBestDays = (events) => {
   if (!events || events.length === 0) return [];